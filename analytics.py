@@ -0,0 +1,493 @@
+# ============================================================================
+# File: analytics.py
+"""Recruiter analytics over the report corpus.
+
+Report fields are copied from the report index into columnar NumPy arrays
+once per process, and only rows (re)indexed since the last refresh are read
+after that. Score distributions, hire rate by position, tech stack frequency
+and time-to-complete trends are computed with masks and bincounts over
+those arrays, not by walking JSON reports per request.
+
+Usage:
+    python analytics.py [--since 2025-11-01] [--until 2025-12-01]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import AppConfig
+from scoring import DEPTH_LEVELS, RECOMMENDATIONS
+
+
+HIRE_RECOMMENDATIONS = {"Strong Hire", "Hire"}
+_RECOMMENDATION_CODES = {value: code for code, value in enumerate(RECOMMENDATIONS)}
+_DEPTH_CODES = {value: code for code, value in enumerate(DEPTH_LEVELS)}
+_INDEX_COLUMNS = ["generated_at", "score", "recommendation", "depth_level", "desired_positions", "duration_seconds"]
+_PERIOD_SECONDS = {"day": 86400, "week": 7 * 86400}
+_EPOCH_MONDAY = 4 * 86400  # 1970-01-01 was a Thursday
+
+
+class _Vocabulary:
+    """Stable integer codes for repeated strings (positions, technologies)."""
+
+    def __init__(self, values: Optional[List[str]] = None):
+        self.values: List[str] = list(values or [])
+        self._codes: Dict[str, int] = {value: code for code, value in enumerate(self.values)}
+
+    def code(self, value: Optional[str]) -> int:
+        if not value:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _first_position(positions: Optional[str]) -> str:
+    return (positions or "").split(";")[0].strip().lower()
+
+
+@dataclass(frozen=True, eq=False)
+class ColumnSnapshot:
+    """
+    Aligned column arrays of the report index at one point in time.
+
+    One array per field, aligned by row: ``ids``, ``generated_at``
+    (datetime64[s]), ``score`` (NaN if unknown), ``recommendation`` and
+    ``depth`` (codes into RECOMMENDATIONS / DEPTH_LEVELS, -1 if unknown),
+    ``position`` (code into ``positions``) and ``duration`` in seconds.
+    Tech stack terms are stored as parallel ``term_rows`` / ``term_codes``
+    arrays (row position, code into ``technologies``).
+
+    Snapshots are never modified; a refresh builds a new one.
+    """
+    ids: np.ndarray
+    generated_at: np.ndarray
+    score: np.ndarray
+    recommendation: np.ndarray
+    depth: np.ndarray
+    position: np.ndarray
+    duration: np.ndarray
+    term_rows: np.ndarray
+    term_codes: np.ndarray
+    positions: Tuple[str, ...] = ()
+    technologies: Tuple[str, ...] = ()
+
+    @classmethod
+    def empty(cls) -> "ColumnSnapshot":
+        return cls(
+            ids=np.empty(0, dtype=np.int64),
+            generated_at=np.empty(0, dtype="datetime64[s]"),
+            score=np.empty(0, dtype=np.float32),
+            recommendation=np.empty(0, dtype=np.int8),
+            depth=np.empty(0, dtype=np.int8),
+            position=np.empty(0, dtype=np.int32),
+            duration=np.empty(0, dtype=np.float32),
+            term_rows=np.empty(0, dtype=np.int32),
+            term_codes=np.empty(0, dtype=np.int32)
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def mask(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> np.ndarray:
+        """Boolean row mask for a generated_at range (rows without a date only match an open range)."""
+        selected = np.ones(len(self.ids), dtype=bool)
+        if since is not None:
+            selected &= self.generated_at >= np.datetime64(since, "s")
+        if until is not None:
+            selected &= self.generated_at < np.datetime64(until, "s")
+        return selected
+
+
+class ReportColumns:
+    """
+    Columnar copy of the report index, refreshed incrementally.
+
+    Readers call snapshot() once and compute from that; refresh() builds a
+    complete new ColumnSnapshot and swaps it in with a single assignment,
+    so a reader never sees columns from two different refreshes.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.positions = _Vocabulary()
+        self.technologies = _Vocabulary()
+        self._lock = threading.Lock()
+        self._data = ColumnSnapshot.empty()
+        self._watermark = 0.0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def snapshot(self) -> ColumnSnapshot:
+        """Current columns (not affected by later refreshes)."""
+        return self._data
+
+    _ARRAYS = ["ids", "generated_at", "score", "recommendation", "depth", "position",
+               "duration", "term_rows", "term_codes"]
+    _ROW_COLUMNS = ["generated_at", "score", "recommendation", "depth", "position", "duration"]
+
+    def save(self, path: str):
+        """Write a snapshot so the next process only reads newer index rows."""
+        folder = os.path.dirname(path) or "."
+        os.makedirs(folder, exist_ok=True)
+        with self._lock:
+            data = self._data
+            arrays = {name: getattr(data, name) for name in self._ARRAYS}
+            arrays["generated_at"] = arrays["generated_at"].astype(np.int64)
+            arrays["positions"] = np.array(data.positions, dtype=str)
+            arrays["technologies"] = np.array(data.technologies, dtype=str)
+            arrays["watermark"] = np.array(self._watermark)
+            fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+
+    def load(self, path: str) -> bool:
+        """Restore a snapshot written by save(); False if there is none or it is unreadable."""
+        try:
+            with np.load(path, allow_pickle=False) as snapshot:
+                arrays = {name: snapshot[name] for name in snapshot.files}
+        except (OSError, ValueError):
+            return False
+        if not all(name in arrays for name in self._ARRAYS):
+            return False
+        with self._lock:
+            self.positions = _Vocabulary(arrays["positions"].tolist())
+            self.technologies = _Vocabulary(arrays["technologies"].tolist())
+            self._watermark = float(arrays["watermark"])
+            columns = {name: arrays[name] for name in self._ARRAYS}
+            columns["generated_at"] = columns["generated_at"].astype("datetime64[s]")
+            self._data = ColumnSnapshot(positions=tuple(self.positions.values),
+                                        technologies=tuple(self.technologies.values), **columns)
+        return True
+
+    def refresh(self) -> Dict[str, Any]:
+        """
+        Pull rows indexed since the last refresh.
+
+        Changed rows are overwritten and new rows appended; if rows were
+        deleted from the index, everything is reloaded.
+
+        :return: Counts of rows added and updated, and whether it was a full reload
+        """
+        with self._lock:
+            rows, terms, (count, id_sum) = self.index.changes(self._watermark, _INDEX_COLUMNS)
+            data, added, updated = self._apply(self._data, rows, terms)
+            full_reload = len(data) != count or int(data.ids.sum()) != id_sum
+            if full_reload:
+                self._watermark = 0.0
+                rows, terms, _ = self.index.changes(0.0, _INDEX_COLUMNS)
+                data, added, updated = self._apply(ColumnSnapshot.empty(), rows, terms)
+            self._data = data
+            return {"rows": len(data), "added": added, "updated": updated, "full_reload": full_reload}
+
+    def _apply(self, data: ColumnSnapshot, rows: List[tuple], terms: List[tuple]) -> tuple:
+        """Return (new snapshot, added, updated) with rows merged into data; data is left untouched."""
+        # Rows stamped exactly at the watermark are read again on every refresh
+        # (in case more landed in the same instant); skip the ones already held
+        known = set(data.ids[np.isin(data.ids, [row[0] for row in rows if row[1] <= self._watermark])].tolist())
+        if known:
+            rows = [row for row in rows if row[0] not in known]
+            terms = [term for term in terms if term[0] not in known]
+        if not rows:
+            return data, 0, 0
+        ids, indexed_at, generated_at, score, recommendation, depth, positions, duration = zip(*rows)
+        self._watermark = max(self._watermark, max(indexed_at))
+
+        ids = np.array(ids, dtype=np.int64)
+        incoming = {
+            "generated_at": np.array([value or "NaT" for value in generated_at], dtype="datetime64[s]"),
+            "score": np.array([np.nan if value is None else value for value in score], dtype=np.float32),
+            "recommendation": np.array([_RECOMMENDATION_CODES.get(value, -1) for value in recommendation],
+                                       dtype=np.int8),
+            "depth": np.array([_DEPTH_CODES.get(value, -1) for value in depth], dtype=np.int8),
+            "position": np.array([self.positions.code(_first_position(value)) for value in positions],
+                                 dtype=np.int32),
+            "duration": np.array([np.nan if value is None else value for value in duration], dtype=np.float32)
+        }
+
+        # ids are kept sorted, so existing rows are found by binary search
+        slots = np.searchsorted(data.ids, ids)
+        existing = (slots < len(data.ids)) & (data.ids[np.minimum(slots, len(data.ids) - 1)] == ids) \
+            if len(data.ids) else np.zeros(len(ids), dtype=bool)
+        new = ~existing
+
+        row_ids = data.ids
+        columns = {name: getattr(data, name) for name in self._ROW_COLUMNS}
+        term_rows, term_codes = data.term_rows, data.term_codes
+
+        old_slots = slots[existing]
+        if old_slots.size:
+            # Copy before overwriting; readers may still hold the old arrays
+            for name, values in incoming.items():
+                column = columns[name].copy()
+                column[old_slots] = values[existing]
+                columns[name] = column
+            # Terms of updated rows are replaced wholesale
+            keep = ~np.isin(term_rows, old_slots)
+            term_rows, term_codes = term_rows[keep], term_codes[keep]
+
+        if new.any():
+            order = np.argsort(np.concatenate([row_ids, ids[new]]), kind="stable")
+            row_ids = np.concatenate([row_ids, ids[new]])[order]
+            for name, values in incoming.items():
+                columns[name] = np.concatenate([columns[name], values[new]])[order]
+            # Row positions moved; remap term rows through the inverse permutation
+            inverse = np.empty_like(order)
+            inverse[order] = np.arange(len(order))
+            term_rows = inverse[term_rows].astype(np.int32)
+
+        if terms:
+            term_ids, term_names = zip(*terms)
+            new_rows = np.searchsorted(row_ids, np.array(term_ids, dtype=np.int64)).astype(np.int32)
+            new_codes = np.array([self.technologies.code(term) for term in term_names], dtype=np.int32)
+            term_rows = np.concatenate([term_rows, new_rows])
+            term_codes = np.concatenate([term_codes, new_codes])
+
+        snapshot = ColumnSnapshot(ids=row_ids, term_rows=term_rows, term_codes=term_codes,
+                                  positions=tuple(self.positions.values),
+                                  technologies=tuple(self.technologies.values), **columns)
+        return snapshot, int(new.sum()), int(existing.sum())
+
+
+# ----------------------------------------------------------------------
+# Aggregates
+# ----------------------------------------------------------------------
+
+def score_distribution(columns: ColumnSnapshot, mask: np.ndarray) -> Dict[str, Any]:
+    """Histogram of scores in 1-point bins from 0 to 10."""
+    scores = columns.score[mask]
+    scores = scores[~np.isnan(scores)]
+    counts, edges = np.histogram(scores, bins=10, range=(0, 10))
+    return {
+        "bins": [f"{int(lo)}-{int(hi)}" for lo, hi in zip(edges[:-1], edges[1:])],
+        "counts": counts.tolist(),
+        "scored": int(scores.size),
+        "mean": round(float(scores.mean()), 2) if scores.size else None,
+        "median": round(float(np.median(scores)), 2) if scores.size else None
+    }
+
+
+def recommendation_breakdown(columns: ColumnSnapshot, mask: np.ndarray) -> Dict[str, int]:
+    codes = columns.recommendation[mask]
+    counts = np.bincount(codes[codes >= 0], minlength=len(RECOMMENDATIONS))
+    return dict(zip(RECOMMENDATIONS, counts.tolist()))
+
+
+def hire_rate_by_position(columns: ColumnSnapshot, mask: np.ndarray,
+                          top: int = 15, min_reports: int = 1) -> List[Dict[str, Any]]:
+    """
+    Share of Hire / Strong Hire recommendations per desired position
+    (first listed), for the most screened positions.
+    """
+    selected = mask & (columns.position >= 0) & (columns.recommendation >= 0)
+    positions = columns.position[selected]
+    if positions.size == 0:
+        return []
+    hire_codes = [RECOMMENDATIONS.index(r) for r in HIRE_RECOMMENDATIONS]
+    hired = np.isin(columns.recommendation[selected], hire_codes)
+
+    size = len(columns.positions)
+    totals = np.bincount(positions, minlength=size)
+    hires = np.bincount(positions, weights=hired, minlength=size)
+    ranked = [code for code in np.argsort(-totals, kind="stable")[:top] if totals[code] >= min_reports]
+    return [{
+        "position": columns.positions[code].title(),
+        "reports": int(totals[code]),
+        "hire_rate": round(float(hires[code] / totals[code]), 3)
+    } for code in ranked]
+
+
+def tech_frequency(columns: ColumnSnapshot, mask: np.ndarray, top: int = 20) -> List[Dict[str, Any]]:
+    """Most common tech stack terms and the share of selected reports listing each."""
+    term_mask = mask[columns.term_rows] if columns.term_rows.size else np.zeros(0, dtype=bool)
+    counts = np.bincount(columns.term_codes[term_mask], minlength=len(columns.technologies))
+    total = int(mask.sum())
+    ranked = [code for code in np.argsort(-counts, kind="stable")[:top] if counts[code]]
+    return [{
+        "technology": columns.technologies[code],
+        "reports": int(counts[code]),
+        "share": round(float(counts[code] / total), 3) if total else 0.0
+    } for code in ranked]
+
+
+def completion_trend(columns: ColumnSnapshot, mask: np.ndarray, period: str = "week") -> List[Dict[str, Any]]:
+    """
+    Reports and mean time-to-complete per day or week (weeks start on Monday).
+
+    Time-to-complete is only known for reports with LLM telemetry.
+    """
+    selected = mask & ~np.isnat(columns.generated_at)
+    if not selected.any():
+        return []
+    seconds = columns.generated_at[selected].astype(np.int64)
+    step = _PERIOD_SECONDS[period]
+    offset = _EPOCH_MONDAY if period == "week" else 0
+    buckets = (seconds - offset) // step
+    first = int(buckets.min())
+    buckets = buckets - first
+
+    durations = columns.duration[selected]
+    timed = ~np.isnan(durations)
+    reports = np.bincount(buckets)
+    timed_reports = np.bincount(buckets[timed], minlength=reports.size)
+    total_duration = np.bincount(buckets[timed], weights=durations[timed], minlength=reports.size)
+
+    trend = []
+    for bucket in np.flatnonzero(reports):
+        start = np.datetime64((first + int(bucket)) * step + offset, "s")
+        trend.append({
+            "period_start": str(start.astype("datetime64[D]")),
+            "reports": int(reports[bucket]),
+            "mean_minutes": round(float(total_duration[bucket] / timed_reports[bucket] / 60), 1)
+            if timed_reports[bucket] else None
+        })
+    return trend
+
+
+def summarize(columns: ColumnSnapshot, since: Optional[datetime] = None,
+              until: Optional[datetime] = None, period: str = "week") -> Dict[str, Any]:
+    """All dashboard aggregates for a date range of one snapshot (ReportColumns.snapshot())."""
+    mask = columns.mask(since, until)
+    return {
+        "reports": int(mask.sum()),
+        "scores": score_distribution(columns, mask),
+        "recommendations": recommendation_breakdown(columns, mask),
+        "hire_rate_by_position": hire_rate_by_position(columns, mask),
+        "tech_frequency": tech_frequency(columns, mask),
+        "completion_trend": completion_trend(columns, mask, period)
+    }
+
+
+_columns: Optional[ReportColumns] = None
+_columns_lock = threading.Lock()
+
+
+def get_report_columns() -> ReportColumns:
+    """
+    Return the process-wide columnar cache, refreshed from the report index.
+
+    The first call in a process starts from the on-disk snapshot
+    (AppConfig.ANALYTICS_CACHE_PATH) when there is one; the snapshot is
+    rewritten whenever a refresh picked up changes.
+    """
+    global _columns
+    from report_index import get_report_index
+
+    path = AppConfig().ANALYTICS_CACHE_PATH
+    with _columns_lock:
+        if _columns is None:
+            _columns = ReportColumns(get_report_index())
+            _columns.load(path)
+    refreshed = _columns.refresh()
+    if refreshed["added"] or refreshed["updated"] or refreshed["full_reload"]:
+        _columns.save(path)
+    return _columns
+
+
+# ----------------------------------------------------------------------
+# Streamlit page
+# ----------------------------------------------------------------------
+
+def render_analytics_page():
+    """Recruiter analytics dashboard (Streamlit)."""
+    import streamlit as st
+
+    st.title("📊 Recruiter Analytics")
+
+    start = time.perf_counter()
+    columns = get_report_columns().snapshot()
+    if not len(columns):
+        st.info("No reports indexed yet. Run `python report_index.py rebuild` to index existing reports.")
+        return
+
+    dates = columns.generated_at[~np.isnat(columns.generated_at)]
+    col1, col2, col3 = st.columns(3)
+    first_day = dates.min().astype(datetime).date() if dates.size else None
+    last_day = dates.max().astype(datetime).date() if dates.size else None
+    since = col1.date_input("From", value=first_day)
+    until = col2.date_input("To", value=last_day)
+    period = col3.selectbox("Trend period", ["week", "day"])
+
+    summary = summarize(
+        columns,
+        datetime.combine(since, datetime.min.time()) if since else None,
+        datetime.combine(until, datetime.max.time()) if until else None,
+        period
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    scores, recommendations = summary["scores"], summary["recommendations"]
+    decided = sum(recommendations.values())
+    hires = sum(recommendations[r] for r in HIRE_RECOMMENDATIONS)
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Reports", f"{summary['reports']:,}")
+    m2.metric("Mean score", f"{scores['mean']:.1f}/10" if scores["mean"] is not None else "—")
+    m3.metric("Median score", f"{scores['median']:.1f}/10" if scores["median"] is not None else "—")
+    m4.metric("Hire rate", f"{hires / decided:.0%}" if decided else "—")
+
+    left, right = st.columns(2)
+    with left:
+        st.subheader("Score distribution")
+        st.bar_chart({"score": scores["bins"], "reports": scores["counts"]}, x="score", y="reports")
+        st.subheader("Recommendations")
+        st.bar_chart({"recommendation": list(recommendations), "reports": list(recommendations.values())},
+                     x="recommendation", y="reports")
+    with right:
+        st.subheader("Hire rate by desired position")
+        st.dataframe(summary["hire_rate_by_position"], use_container_width=True, hide_index=True)
+        st.subheader("Tech stack frequency")
+        tech = summary["tech_frequency"]
+        if tech:
+            st.bar_chart({"technology": [t["technology"] for t in tech], "reports": [t["reports"] for t in tech]},
+                         x="technology", y="reports")
+
+    st.subheader("Time to complete (mean minutes)")
+    trend = summary["completion_trend"]
+    if any(t["mean_minutes"] is not None for t in trend):
+        st.line_chart({
+            "period": [t["period_start"] for t in trend],
+            "minutes": [t["mean_minutes"] for t in trend]
+        }, x="period", y="minutes")
+    else:
+        st.caption("No reports with session telemetry in this range.")
+    st.caption(f"{len(columns):,} reports cached · computed in {elapsed_ms:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print recruiter analytics over the report index.")
+    parser.add_argument("--since", help="ISO date/time, inclusive")
+    parser.add_argument("--until", help="ISO date/time, exclusive")
+    parser.add_argument("--period", choices=["week", "day"], default="week")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    columns = get_report_columns().snapshot()
+    loaded = time.perf_counter()
+    summary = summarize(
+        columns,
+        datetime.fromisoformat(args.since) if args.since else None,
+        datetime.fromisoformat(args.until) if args.until else None,
+        args.period
+    )
+    summary["timing_ms"] = {
+        "load": round((loaded - start) * 1000, 1),
+        "aggregate": round((time.perf_counter() - loaded) * 1000, 1)
+    }
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# ============================================================================
+# File: batch_ingest.py
+"""Headless batch ingestion of a directory of resume PDFs.
+
+Usage:
+    python batch_ingest.py resumes/ --output candidates.jsonl
+
+PDF parsing runs in a process pool, LLM extraction runs with bounded
+concurrency, and each finished candidate is appended to the JSONL output
+immediately. Rerunning the same command after a crash skips resumes that
+are already in the output file; they are recognized by hash before any
+parsing is scheduled.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Set, Tuple
+
+from config import AppConfig
+
+
+def load_processed(output_path: str) -> Set[str]:
+    """Return the PDF hashes already written to the output file."""
+    processed = set()
+    if not os.path.exists(output_path):
+        return processed
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                processed.add(json.loads(line)["pdf_sha256"])
+            except (ValueError, KeyError):
+                # Torn last line from a crash; that resume is redone
+                continue
+    return processed
+
+
+def hash_resume(pdf_path: str) -> str:
+    """Return the SHA-256 of a PDF file (the resume's identity in the output)."""
+    from resume_cache import hash_bytes
+
+    with open(pdf_path, 'rb') as f:
+        return hash_bytes(f.read())
+
+
+def parse_resume(pdf_path: str, pdf_hash: str) -> Tuple[str, str, str]:
+    """
+    Extract cleaned text from one PDF (runs in a worker process).
+
+    :param pdf_hash: hash_resume() of the file, used as the text cache key
+    :return: Tuple of (pdf_path, pdf_sha256, resume_text)
+    """
+    from resume_cache import cache_get, cache_put, text_key
+    from utils import extract_clean_resume_text
+
+    resume_text = cache_get("text", text_key(pdf_hash))
+    if resume_text is None:
+        # Already inside a worker process; don't fan out again per page
+        resume_text = extract_clean_resume_text(pdf_path, parallel=False)
+        cache_put("text", text_key(pdf_hash), resume_text)
+
+    return pdf_path, pdf_hash, resume_text
+
+
+def extract_candidate(pdf_path: str, pdf_hash: str, resume_text: str, llm) -> Dict:
+    """Run (or reuse cached) LLM extraction and build the output record."""
+    from llm_handler import extract_info_from_resume
+    from resume_cache import cache_get, cache_put, extraction_key, llm_model_name
+
+    info_key = extraction_key(pdf_hash, llm_model_name(llm))
+    extracted_info = cache_get("info", info_key)
+    llm_called = False
+
+    if not extracted_info:
+        extracted_info = extract_info_from_resume(resume_text, llm)
+        llm_called = True
+        if extracted_info:
+            cache_put("info", info_key, extracted_info)
+
+    return {
+        "source_file": os.path.basename(pdf_path),
+        "pdf_sha256": pdf_hash,
+        "processed_at": datetime.now().isoformat(),
+        "candidate_information": extracted_info,
+        "llm_called": llm_called
+    }
+
+
+def run_batch(input_dir: str, output_path: str, api_key: str,
+              parse_workers: int, llm_concurrency: int) -> Dict:
+    """
+    Ingest every PDF in input_dir and append records to output_path.
+
+    :return: Throughput statistics
+    """
+    from llm_handler import initialize_llm, get_rate_limit_stats, get_response_cache_stats
+
+    pdf_paths = sorted(
+        os.path.join(input_dir, name) for name in os.listdir(input_dir)
+        if name.lower().endswith(".pdf")
+    )
+    processed = load_processed(output_path)
+    llm = initialize_llm(api_key)
+
+    stats = {"total": len(pdf_paths), "skipped": 0, "written": 0, "failed": 0, "llm_calls": 0}
+    start = time.perf_counter()
+
+    # Hashing is cheap next to parsing: skip done (and duplicate) resumes
+    # here so they never reach the process pool
+    to_parse = []
+    for path in pdf_paths:
+        try:
+            pdf_hash = hash_resume(path)
+        except OSError as e:
+            stats["failed"] += 1
+            print(f"❌ {os.path.basename(path)}: read failed: {e}", file=sys.stderr)
+            continue
+        if pdf_hash in processed:
+            stats["skipped"] += 1
+            continue
+        processed.add(pdf_hash)
+        to_parse.append((path, pdf_hash))
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as parse_pool, \
+            ThreadPoolExecutor(max_workers=llm_concurrency) as llm_pool, \
+            open(output_path, 'a', encoding='utf-8') as out:
+
+        parse_futures = {parse_pool.submit(parse_resume, path, pdf_hash): path for path, pdf_hash in to_parse}
+        extract_futures = {}
+        pending = set(parse_futures)
+
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                if future in parse_futures:
+                    try:
+                        pdf_path, pdf_hash, resume_text = future.result()
+                    except Exception as e:
+                        stats["failed"] += 1
+                        print(f"❌ {os.path.basename(parse_futures[future])}: parse failed: {e}", file=sys.stderr)
+                        continue
+
+                    extract_future = llm_pool.submit(extract_candidate, pdf_path, pdf_hash, resume_text, llm)
+                    extract_futures[extract_future] = pdf_path
+                    pending.add(extract_future)
+                    continue
+
+                try:
+                    record = future.result()
+                except Exception as e:
+                    stats["failed"] += 1
+                    print(f"❌ {os.path.basename(extract_futures[future])}: {e}", file=sys.stderr)
+                    continue
+
+                stats["llm_calls"] += int(record.pop("llm_called"))
+                if not record["candidate_information"]:
+                    stats["failed"] += 1
+                    print(f"❌ {record['source_file']}: no information extracted", file=sys.stderr)
+                    continue
+
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                os.fsync(out.fileno())
+                stats["written"] += 1
+
+                done = stats["written"] + stats["failed"] + stats["skipped"]
+                print(f"[{done}/{stats['total']}] {record['source_file']}", file=sys.stderr)
+
+    # Extractions answered by the response cache never reached the API
+    cache_hits = get_response_cache_stats()["by_stage"].get("resume_extraction", {}).get("hits", 0)
+    stats["llm_response_cache_hits"] = cache_hits
+    stats["llm_calls"] -= cache_hits
+
+    elapsed_min = max(time.perf_counter() - start, 1e-9) / 60
+    stats["elapsed_seconds"] = round(elapsed_min * 60, 2)
+    stats["resumes_per_minute"] = round(stats["written"] / elapsed_min, 2)
+    stats["llm_calls_per_minute"] = round(stats["llm_calls"] / elapsed_min, 2)
+    extraction = get_rate_limit_stats()["classes"]["extraction"]
+    stats["rate_limit_throttled"] = extraction["throttled"]
+    stats["rate_limit_wait_p95_seconds"] = round(extraction["wait_p95"], 2)
+    return stats
+
+
+def main():
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="Batch-ingest a directory of resume PDFs into JSONL.")
+    parser.add_argument("input_dir", help="Directory containing resume PDFs")
+    parser.add_argument("--output", default="candidates.jsonl", help="JSONL output file (appended to)")
+    parser.add_argument("--api-key", default=os.environ.get("GROQ_API_KEY"), help="Groq API key (default: $GROQ_API_KEY)")
+    parser.add_argument("--parse-workers", type=int, default=config.BATCH_PARSE_WORKERS)
+    parser.add_argument("--llm-concurrency", type=int, default=config.BATCH_LLM_CONCURRENCY)
+    parser.add_argument("--no-llm-cache", action="store_true", help="Bypass the LLM response cache")
+    args = parser.parse_args()
+
+    if args.no_llm_cache:
+        from response_cache import set_bypass
+        set_bypass(True)
+
+    if not args.api_key and not config.FAKE_LLM:
+        parser.error("a Groq API key is required (--api-key or GROQ_API_KEY)")
+
+    stats = run_batch(args.input_dir, args.output, args.api_key or "", args.parse_workers, args.llm_concurrency)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
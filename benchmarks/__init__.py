@@ -0,0 +1 @@
+"""Offline benchmarks for TalentScout (run with ``python -m benchmarks.<name>``)."""
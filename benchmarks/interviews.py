@@ -0,0 +1,184 @@
+# ============================================================================
+# File: benchmarks/interviews.py
+"""End-to-end interview throughput benchmark on the fake LLM.
+
+Usage:
+    python -m benchmarks.interviews [--sessions N] [--concurrency C]
+                                    [--mode chat|resume|both]
+                                    [--latency S] [--tokens-per-second R]
+
+Runs full interviews (greeting, Phase 1, five technical questions,
+analysis and reports) and reports sessions/second, per-stage latency
+percentiles and retained memory per session. No Groq key is needed.
+"""
+
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+# AppConfig reads these when config is first imported, so they must be set
+# before the project imports below.
+# Keep benchmark reports out of the real Reports/ folder
+if "TALENTSCOUT_REPORTS_FOLDER" not in os.environ:
+    os.environ["TALENTSCOUT_REPORTS_FOLDER"] = tempfile.mkdtemp(prefix="talentscout-bench-")
+# ...and their index rows out of the real search index
+os.environ.setdefault("TALENTSCOUT_REPORT_INDEX",
+                      os.path.join(os.environ["TALENTSCOUT_REPORTS_FOLDER"], "report_index.sqlite3"))
+# The fake model has no account limits to respect
+os.environ.setdefault("TALENTSCOUT_LLM_RPM", "0")
+os.environ.setdefault("TALENTSCOUT_LLM_TPM", "0")
+
+from config import AppConfig
+from fake_llm import CANDIDATE_RECORD, initialize_fake_llm
+from interview import InterviewSession
+from llm_handler import extract_info_from_resume, generate_candidate_analysis
+from prompts import get_resume_greeting
+from report_generator import generate_reports
+from response_cache import set_bypass
+from utils import extract_clean_resume_text, format_candidate_info_natural
+
+
+PHASE1_ANSWERS = [
+    CANDIDATE_RECORD["full_name"],
+    CANDIDATE_RECORD["email"],
+    CANDIDATE_RECORD["phone_number"],
+    str(CANDIDATE_RECORD["years_of_experience"]),
+    ", ".join(CANDIDATE_RECORD["desired_positions"]),
+    CANDIDATE_RECORD["current_location"],
+    CANDIDATE_RECORD["tech_stack"],
+]
+
+MAX_TURNS = 40
+
+TECHNICAL_ANSWER = ("I'd start by measuring: enable query logging and tracing, find the slowest "
+                    "spans, check the query plan, then fix the biggest contributor first and "
+                    "verify under the same load.")
+
+
+def build_sample_resume() -> bytes:
+    """Render a one-page resume PDF for the resume-mode benchmark."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+    styles = getSampleStyleSheet()
+    lines = [
+        CANDIDATE_RECORD["full_name"],
+        f"{CANDIDATE_RECORD['email']} | {CANDIDATE_RECORD['phone_number']} | {CANDIDATE_RECORD['current_location']}",
+        "Skills", CANDIDATE_RECORD["tech_stack"],
+        "Experience", "Senior Backend Engineer, Acme (2019-present). " * 6,
+        "Education", "B.Sc. Computer Science",
+    ]
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build([Paragraph(line, styles["Normal"]) for line in lines])
+    return buffer.getvalue()
+
+
+def run_interview(mode: str, llm, resume_pdf: bytes, timings: Dict[str, List[float]]) -> InterviewSession:
+    """Run one scripted interview; returns the session kept alive for memory accounting."""
+    def timed(stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        timings[stage].append(time.perf_counter() - start)
+        return result
+
+    interview = InterviewSession(llm)
+
+    def turn(stream) -> str:
+        reply = timed("chat_turn", lambda: "".join(stream))
+        timings["chat_ttft"].append(interview.ttft_history[-1] if interview.ttft_history else None)
+        return reply
+
+    if mode == "resume":
+        # Parse and extract directly so the resume cache does not hide the work
+        interview.start_resume()
+        resume_text = timed("resume_parse", extract_clean_resume_text, resume_pdf, parallel=False)
+        extracted = timed("resume_extraction", extract_info_from_resume, resume_text, llm,
+                          callbacks=interview.callbacks)
+        interview.candidate_info.update(extracted)
+        interview.messages.append({"role": "assistant",
+                                   "content": get_resume_greeting(format_candidate_info_natural(extracted))})
+        interview.resume_processed = True
+        turn(interview.stream_resume_verification())
+        answers = []
+    else:
+        interview.start_chat()
+        answers = list(PHASE1_ANSWERS)
+
+    for _ in range(MAX_TURNS):
+        if interview.assessment_complete:
+            break
+        turn(interview.stream_turn(answers.pop(0) if answers else TECHNICAL_ANSWER))
+    else:
+        raise RuntimeError(f"Interview did not complete within {MAX_TURNS} turns")
+
+    if not interview.candidate_info:
+        interview.candidate_info.update(CANDIDATE_RECORD)
+    analysis, scoring = timed("analysis", generate_candidate_analysis, dict(interview.candidate_info),
+                              interview.qa_pairs, llm, interview.callbacks)
+    timed("reports", generate_reports, interview.candidate_info, interview.qa_pairs, analysis,
+          interview.telemetry.summary(), scoring)
+    interview.report_artifacts = {"analysis": analysis, "scoring": scoring}
+
+    return interview
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end interview benchmark on the fake LLM.")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mode", choices=["chat", "resume", "both"], default="both")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake first-token latency (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=2000.0)
+    args = parser.parse_args()
+
+    # Measure real calls, not replies cached by an earlier run
+    set_bypass(True)
+
+    llm = initialize_fake_llm(latency=args.latency, tokens_per_second=args.tokens_per_second)
+    resume_pdf = build_sample_resume()
+    modes = ["chat", "resume"] if args.mode == "both" else [args.mode]
+    jobs = [modes[i % len(modes)] for i in range(args.sessions)]
+    timings: Dict[str, List[float]] = defaultdict(list)
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        sessions = list(pool.map(lambda mode: run_interview(mode, llm, resume_pdf, timings), jobs))
+
+    elapsed = time.perf_counter() - start
+    retained = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename"))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"sessions: {len(sessions)} ({', '.join(f'{jobs.count(m)} {m}' for m in modes)}), "
+          f"concurrency {args.concurrency}, reports in {AppConfig().REPORTS_FOLDER}")
+    print(f"throughput: {len(sessions) / elapsed:.2f} sessions/s ({elapsed:.1f}s total)")
+    print(f"memory: {retained / len(sessions) / 1024:.1f} KiB retained/session, peak {peak / 1024 / 1024:.1f} MiB")
+    print()
+    print(f"{'stage':20} {'n':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for stage, values in sorted(timings.items()):
+        values = [v for v in values if v is not None]
+        if not values:
+            continue
+        print(f"{stage:20} {len(values):>6} "
+              f"{percentile(values, 50) * 1000:>9.1f} {percentile(values, 90) * 1000:>9.1f} "
+              f"{percentile(values, 99) * 1000:>9.1f} {statistics.mean(values) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# ============================================================================
+# File: benchmarks/memory_tokens.py
+"""Compare prompt tokens per turn: unbounded history vs RollingSummaryHistory.
+
+Usage:
+    python -m benchmarks.memory_tokens [--turns N] [--summarizer none|fake]
+
+Replays a scripted interview. By default there is no LLM (the rolling
+summary uses its extractive fallback); with ``--summarizer fake`` the
+scripted fake model writes the summaries, and its calls and tokens are
+counted against the savings. Summaries run inline so numbers are
+comparable across runs.
+"""
+
+import argparse
+import os
+
+# The fake summarizer has no account limits to respect
+os.environ.setdefault("TALENTSCOUT_LLM_RPM", "0")
+os.environ.setdefault("TALENTSCOUT_LLM_TPM", "0")
+
+from langchain_core.chat_history import InMemoryChatMessageHistory
+from langchain_core.messages import AIMessage, HumanMessage
+
+from memory import RollingSummaryHistory, prompt_token_usage
+
+
+PHASE1 = [
+    ("Jane Doe", "Thanks, Jane! What's the best email address to reach you?"),
+    ("jane.doe@example.com", "Got it. What's your phone number?"),
+    ("+1 555 0100", "How many years of professional experience do you have?"),
+    ("6", "Which position(s) are you interested in?"),
+    ("Backend Engineer", "Where are you currently located?"),
+    ("Berlin", "What technologies do you work with? Please list your programming languages, frameworks, databases, and tools."),
+]
+
+ANSWER = ("I would start by profiling the hot path, then add an index on the filtered "
+          "columns, batch the writes, and put a cache in front of the read path with a "
+          "short TTL so stale reads stay bounded. ") * 3
+
+QUESTION = ("Thank you, that's a thoughtful answer covering profiling and indexing. "
+            "Question {n}: Suppose a Django endpoint backed by PostgreSQL has p99 latency of "
+            "two seconds under load. Walk me through how you would diagnose and fix it, "
+            "including which tools you'd use and what trade-offs you'd consider?")
+
+
+def scripted_turns(turns: int):
+    """Yield (human, assistant) pairs for a full interview."""
+    yield "Hi", "Hello! I'm TalentScout. What's your full name?"
+    for human, assistant in PHASE1:
+        yield human, assistant
+    yield "Python, Django, PostgreSQL, Redis, Docker, AWS", QUESTION.format(n=1)
+    for n in range(2, turns + 1):
+        yield ANSWER, QUESTION.format(n=n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt tokens per turn, before and after bounded memory.")
+    parser.add_argument("--turns", type=int, default=10, help="Technical questions to simulate")
+    parser.add_argument("--summarizer", choices=["none", "fake"], default="none",
+                        help="Write summaries with the fake LLM instead of the extractive fallback")
+    args = parser.parse_args()
+
+    summarizer = None
+    if args.summarizer == "fake":
+        from fake_llm import initialize_fake_llm
+        summarizer = initialize_fake_llm(latency=0, tokens_per_second=1e9)
+
+    unbounded = InMemoryChatMessageHistory()
+    bounded = RollingSummaryHistory(summarizer=summarizer, background=False)
+    bounded.pinned_info = {"full_name": "Jane Doe", "tech_stack": "Python, Django, PostgreSQL, Redis, Docker, AWS"}
+
+    totals = [0, 0]
+    print(f"{'turn':>4} {'unbounded':>10} {'bounded':>10} {'saved':>7}")
+    for turn, (human, assistant) in enumerate(scripted_turns(args.turns), 1):
+        before = prompt_token_usage(unbounded, human)["sent"]
+        after = prompt_token_usage(bounded, human)["sent"]
+        totals[0] += before
+        totals[1] += after
+        print(f"{turn:>4} {before:>10,} {after:>10,} {1 - after / before:>6.0%}")
+
+        for history in (unbounded, bounded):
+            history.add_messages([HumanMessage(content=human), AIMessage(content=assistant)])
+
+    print(f"{'all':>4} {totals[0]:>10,} {totals[1]:>10,} {1 - totals[1] / totals[0]:>6.0%}")
+    if summarizer is not None:
+        with_summaries = totals[1] + bounded.summary_tokens
+        print(f"summarizer: {bounded.summary_calls} calls, {bounded.summary_tokens:,} tokens; "
+              f"bounded + summarizer {with_summaries:,} ({1 - with_summaries / totals[0]:.0%} saved)")
+
+
+if __name__ == "__main__":
+    main()
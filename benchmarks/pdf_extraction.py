@@ -0,0 +1,63 @@
+# ============================================================================
+# File: benchmarks/pdf_extraction.py
+"""Compare PDF text extraction backends on a corpus of sample resumes.
+
+Usage:
+    python -m benchmarks.pdf_extraction [corpus_dir] [--repeat N]
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import time
+
+from utils import PDF_BACKENDS, clean_resume_text, extract_clean_resume_text, extract_pdf_pages
+
+
+def time_call(fn, repeat: int) -> float:
+    """Return the median wall time of fn() in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction backends.")
+    parser.add_argument("corpus_dir", nargs="?", default="Reports",
+                        help="Directory of sample PDFs, searched recursively (the report store is sharded)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per file (median is reported)")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.corpus_dir, "**", "*.pdf"), recursive=True))
+    if not paths:
+        parser.error(f"no PDFs found in {args.corpus_dir}")
+
+    corpus = {os.path.basename(path): open(path, 'rb').read() for path in paths}
+    totals = {name: 0.0 for name in list(PDF_BACKENDS) + ["auto"]}
+
+    print(f"{'file':40} " + " ".join(f"{name:>12}" for name in totals) + f" {'chars':>8}")
+    for filename, pdf_bytes in corpus.items():
+        row = {}
+        for backend in PDF_BACKENDS:
+            row[backend] = time_call(lambda: extract_pdf_pages(pdf_bytes, backend), args.repeat)
+        row["auto"] = time_call(lambda: extract_clean_resume_text(pdf_bytes, backend="auto"), args.repeat)
+
+        chars = len(clean_resume_text("\n".join(extract_pdf_pages(pdf_bytes, "pypdfium2"))))
+        for name, seconds in row.items():
+            totals[name] += seconds
+        print(f"{filename[:40]:40} " + " ".join(f"{row[name] * 1000:>10.1f}ms" for name in totals) + f" {chars:>8}")
+
+    print("-" * (41 + 13 * len(totals) + 9))
+    print(f"{'total':40} " + " ".join(f"{totals[name] * 1000:>10.1f}ms" for name in totals))
+    baseline = totals["pdfplumber"]
+    for name, seconds in totals.items():
+        if seconds:
+            print(f"{name}: {baseline / seconds:.1f}x vs pdfplumber")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 # File: config.py
 """Configuration settings for TalentScout application."""
 
-import streamlit as st
+import os
+import uuid
+
 from dataclasses import dataclass
 from typing import Dict, Any
 
@@ -11,7 +13,95 @@ class AppConfig:
     MODEL_NAME: str = "llama-3.3-70b-versatile"
     TEMPERATURE: float = 0
     MAX_RETRIES: int = 2
-    REPORTS_FOLDER: str = "Reports"
+    # Report storage root (set with TALENTSCOUT_REPORTS_FOLDER)
+    REPORTS_FOLDER: str = os.environ.get("TALENTSCOUT_REPORTS_FOLDER", "Reports")
+    # Write finished reports to REPORTS_FOLDER in the background
+    REPORT_AUTO_PERSIST: bool = True
+    # Report storage backend: "local" (sharded tree under REPORTS_FOLDER) or
+    # "object" (object-store stand-in); set with TALENTSCOUT_REPORT_STORE
+    REPORT_STORE_BACKEND: str = os.environ.get("TALENTSCOUT_REPORT_STORE", "local")
+    REPORT_STORE_GZIP_JSON: bool = False
+    # SQLite search index over persisted reports (report_index.py);
+    # set the path with TALENTSCOUT_REPORT_INDEX
+    REPORT_INDEX_ENABLED: bool = True
+    REPORT_INDEX_PATH: str = os.environ.get("TALENTSCOUT_REPORT_INDEX", ".cache/report_index.sqlite3")
+    # Columnar snapshot of the report index for the analytics page (analytics.py)
+    ANALYTICS_CACHE_PATH: str = ".cache/analytics.npz"
+    
+    # Process-wide LLM client cache (shared across reruns and sessions)
+    LLM_CACHE_MAX_ENTRIES: int = 32
+    LLM_CACHE_TTL_SECONDS: int = 1800
+    
+    # Process-wide LLM rate limits shared by all sessions (0 disables a limit)
+    LLM_REQUESTS_PER_MINUTE: int = int(os.environ.get("TALENTSCOUT_LLM_RPM", "30"))
+    LLM_TOKENS_PER_MINUTE: int = int(os.environ.get("TALENTSCOUT_LLM_TPM", "12000"))
+    LLM_EXPECTED_OUTPUT_TOKENS: int = 400
+    
+    # Exact-match cache for deterministic (temperature 0) LLM calls
+    # (set TALENTSCOUT_LLM_CACHE=0 to bypass)
+    LLM_RESPONSE_CACHE_ENABLED: bool = os.environ.get("TALENTSCOUT_LLM_CACHE", "1") == "1"
+    LLM_RESPONSE_CACHE_PATH: str = ".cache/llm_responses.sqlite3"
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    LLM_RESPONSE_CACHE_STAGES = ["resume_extraction", "analysis"]
+    
+    # Background job queue (analysis and report generation)
+    JOB_IO_WORKERS: int = 4
+    JOB_CPU_WORKERS: int = 2
+    JOB_RETENTION_SECONDS: int = 3600
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    
+    # Resume parsing/extraction cache (keyed by PDF content hash)
+    RESUME_CACHE_FOLDER: str = ".cache/resumes"
+    RESUME_CACHE_MAX_BYTES: int = 50 * 1024 * 1024
+    
+    # PDF text extraction ("auto" = pypdfium2 with pdfplumber fallback)
+    PDF_BACKEND: str = "auto"
+    PDF_MIN_CHARS_PER_PAGE: int = 100
+    PDF_PARALLEL_PAGE_THRESHOLD: int = 8
+    PDF_PARSE_WORKERS: int = 4
+    
+    # Resume text budget for the extraction prompt (0 disables)
+    RESUME_TOKEN_BUDGET: int = 2000
+    RESUME_READ_AHEAD_FACTOR: int = 2
+    CHARS_PER_TOKEN: int = 4
+    
+    # Conversation memory: the history is sent verbatim until it exceeds
+    # MEMORY_TOKEN_BUDGET, then all but the last MEMORY_RECENT_TURNS turns
+    # are summarized in one batch
+    MEMORY_RECENT_TURNS: int = 4
+    MEMORY_TOKEN_BUDGET: int = 1500
+    
+    # Span tracing (set TALENTSCOUT_TRACING=1 to enable)
+    TRACING_ENABLED: bool = os.environ.get("TALENTSCOUT_TRACING") == "1"
+    TRACE_FILE: str = "traces/spans.jsonl"
+    
+    # Scripted fake LLM instead of Groq (set TALENTSCOUT_FAKE_LLM=1)
+    FAKE_LLM: bool = os.environ.get("TALENTSCOUT_FAKE_LLM") == "1"
+    FAKE_LLM_LATENCY: float = 0.2
+    FAKE_LLM_TOKENS_PER_SECOND: float = 250.0
+    
+    # Precomputed Phase 2 questions (question_bank.py)
+    QUESTION_BANK_ENABLED: bool = True
+    QUESTION_BANK_PATH: str = "data/question_bank.json"
+    QUESTION_BANK_QUESTIONS: int = 5
+    
+    # Bulk PDF regeneration from stored JSON reports (regenerate_pdfs.py)
+    PDF_REGEN_WORKERS: int = 4
+    
+    # Batch resume ingestion (batch_ingest.py)
+    BATCH_PARSE_WORKERS: int = 4
+    BATCH_LLM_CONCURRENCY: int = 4
+    
+    # Async interview server (server.py)
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8080
+    SERVER_SESSION_TTL_SECONDS: int = 3600
+    SERVER_MAX_SESSIONS: int = 10000
+    SERVER_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    # Token for recruiter-only routes (report export and search) and the
+    # Streamlit analytics page; none of them is offered while it is unset
+    RECRUITER_TOKEN: str = os.environ.get("TALENTSCOUT_RECRUITER_TOKEN", "")
     
     # Required candidate information fields
     REQUIRED_FIELDS = [
@@ -27,19 +117,20 @@ class AppConfig:
 
 def initialize_session_state():
     """Initialize all session state variables."""
+    import streamlit as st
+    
+    # Interview state lives on the InterviewSession; the rest is UI state
     defaults = {
-        "messages": [],
-        "chat_history": None,
-        "candidate_info": {},
-        "mode_selected": False,
-        "input_mode": None,
-        "resume_processed": False,
-        "qa_pairs": [],
-        "assessment_complete": False,
+        "interview": None,
         "voice_enabled": False,
-        "question_phase": False
+        "report_job_id": None,
+        "report_persist_job_id": None,
+        "recruiter_unlocked": False
     }
     
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
+    
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
@@ -0,0 +1,262 @@
+# ============================================================================
+# File: export_reports.py
+"""Streaming export of stored reports as a ZIP archive or CSV/JSONL summary.
+
+Usage:
+    python export_reports.py --since 2025-11-01 --until 2025-12-01 --output november.zip
+    python export_reports.py --since 2025-11-01 --output november.csv
+    python export_reports.py --output - > all.zip
+
+A ZIP holds summary.csv and summary.jsonl (one flattened row per report)
+followed by the PDFs under reports/. Each report JSON is read once, only
+the year/month shards in the date range are listed, and archive entries are
+streamed in chunks, so memory holds no more than the matching report IDs.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from config import AppConfig
+from report_store import get_report_store
+from report_fields import SUMMARY_FIELDS, flatten_report
+
+
+COPY_CHUNK_BYTES = 64 * 1024
+# summary.jsonl is spooled while summary.csv is written; past this it goes to disk
+JSONL_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+def _local_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Aware datetimes as naive local time, the form reports store generated_at in."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    return _local_naive(datetime.fromisoformat(value)) if value else None
+
+
+def iter_reports(store, since: Optional[datetime] = None,
+                 until: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield matching reports one at a time, in store (shard) order.
+
+    Year/month shards outside the range are not listed at all.
+
+    :param store: ReportStore to read (report_store.get_report_store)
+    :param since: Include reports generated at or after this time
+    :param until: Include reports generated before this time
+    :return: Iterator of dicts with ``report_id``, ``json_key``, ``pdf_key`` and ``data``
+    """
+    # Compare like with like: a tz-aware bound against a naive stored time raises TypeError
+    since, until = _local_naive(since), _local_naive(until)
+    for report_id, json_key in store.iter_json_keys(since, until):
+        try:
+            data = json.loads(store.read_json_bytes(json_key))
+        except (OSError, ValueError):
+            continue
+
+        try:
+            generated_at = _parse_date((data.get("report_metadata") or {}).get("generated_at"))
+        except ValueError:
+            generated_at = None
+        if generated_at is not None:
+            if since is not None and generated_at < since:
+                continue
+            if until is not None and generated_at >= until:
+                continue
+
+        yield {
+            "report_id": report_id,
+            "json_key": json_key,
+            "pdf_key": store.pdf_key(report_id),
+            "data": data
+        }
+
+
+def write_summary_csv(out, reports: Iterator[Dict[str, Any]]) -> int:
+    """Write one CSV row per report to a text stream; returns the row count."""
+    writer = csv.DictWriter(out, fieldnames=SUMMARY_FIELDS)
+    writer.writeheader()
+    count = 0
+    for report in reports:
+        writer.writerow(flatten_report(report["report_id"], report["data"]))
+        count += 1
+    return count
+
+
+def write_summary_jsonl(out, reports: Iterator[Dict[str, Any]]) -> int:
+    """Write one JSON line per report to a text stream; returns the row count."""
+    count = 0
+    for report in reports:
+        out.write(json.dumps(flatten_report(report["report_id"], report["data"]), ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def write_export_zip(out, store, since: Optional[datetime] = None,
+                     until: Optional[datetime] = None, include_pdfs: bool = True) -> Dict[str, int]:
+    """
+    Stream an export archive to a binary file object (seekable or not).
+
+    Each matching report is read and flattened once: its row goes straight
+    into summary.csv and into a spooled summary.jsonl, and only its ID is
+    kept for the PDF pass.
+
+    :return: Counts of reports, PDFs written and PDFs missing
+    """
+    stats = {"reports": 0, "pdfs": 0, "missing_pdfs": 0}
+    report_ids = []
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive, \
+            tempfile.SpooledTemporaryFile(max_size=JSONL_SPOOL_BYTES, mode="w+b") as jsonl:
+        with archive.open("summary.csv", "w", force_zip64=True) as entry:
+            text = io.TextIOWrapper(entry, encoding="utf-8", newline="")
+            writer = csv.DictWriter(text, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            for report in iter_reports(store, since, until):
+                row = flatten_report(report["report_id"], report["data"])
+                writer.writerow(row)
+                jsonl.write((json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8"))
+                report_ids.append(report["report_id"])
+            text.flush()
+            text.detach()
+        stats["reports"] = len(report_ids)
+
+        jsonl.seek(0)
+        with archive.open("summary.jsonl", "w", force_zip64=True) as entry:
+            shutil.copyfileobj(jsonl, entry, COPY_CHUNK_BYTES)
+
+        if include_pdfs:
+            for report_id in report_ids:
+                pdf_key = store.pdf_key(report_id)
+                if not store.backend.exists(pdf_key):
+                    stats["missing_pdfs"] += 1
+                    continue
+                # PDFs are already compressed; store them as-is
+                info = zipfile.ZipInfo(f"reports/{report_id}.pdf",
+                                       time.localtime(store.backend.mtime(pdf_key))[:6])
+                info.compress_type = zipfile.ZIP_STORED
+                with store.backend.open(pdf_key) as src, archive.open(info, "w", force_zip64=True) as dst:
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_BYTES)
+                stats["pdfs"] += 1
+    return stats
+
+
+class ExportCancelled(Exception):
+    """The consumer of a streamed export stopped reading."""
+
+
+class _QueueWriter(io.RawIOBase):
+    """Unseekable write target handing ~COPY_CHUNK_BYTES chunks to a bounded queue."""
+
+    def __init__(self, chunks: "queue.Queue[Optional[bytes]]", cancelled: threading.Event):
+        self._chunks = chunks
+        self._cancelled = cancelled
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        if len(self._buffer) >= COPY_CHUNK_BYTES:
+            self.drain()
+        return len(data)
+
+    def drain(self):
+        if self._cancelled.is_set():
+            raise ExportCancelled()
+        if self._buffer:
+            self._chunks.put(bytes(self._buffer))
+            self._buffer.clear()
+
+
+def stream_export_zip(store, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None, include_pdfs: bool = True) -> Iterator[bytes]:
+    """
+    Yield an export archive as byte chunks, e.g. for an HTTP response.
+
+    The archive is written on a helper thread into a bounded queue, so a
+    slow consumer pauses the writer instead of growing a buffer. Closing
+    the generator early (e.g. a dropped client) stops the writer.
+    """
+    chunks: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=8)
+    cancelled = threading.Event()
+    errors = []
+
+    def produce():
+        writer = _QueueWriter(chunks, cancelled)
+        try:
+            write_export_zip(writer, store, since, until, include_pdfs)
+            writer.drain()
+        except ExportCancelled:
+            return
+        except Exception as e:
+            errors.append(e)
+        chunks.put(None)
+
+    producer = threading.Thread(target=produce, daemon=True, name="talentscout-export")
+    producer.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        cancelled.set()
+        # Unblock a writer waiting on a full queue so it sees the cancel
+        while producer.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+    if errors:
+        raise errors[0]
+
+
+def main():
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="Export stored reports as a ZIP or a CSV/JSONL summary.")
+    parser.add_argument("--reports-dir", default=config.REPORTS_FOLDER)
+    parser.add_argument("--since", help="ISO date/time, inclusive (e.g. 2025-11-01)")
+    parser.add_argument("--until", help="ISO date/time, exclusive")
+    parser.add_argument("--output", required=True,
+                        help="Output .zip, .csv or .jsonl file, or '-' for a ZIP on stdout")
+    parser.add_argument("--no-pdfs", action="store_true", help="Only include the summaries in the ZIP")
+    args = parser.parse_args()
+
+    since, until = _parse_date(args.since), _parse_date(args.until)
+    store = get_report_store(args.reports_dir)
+    reports = iter_reports(store, since, until)
+
+    if args.output.endswith(".csv"):
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            stats = {"reports": write_summary_csv(f, reports)}
+    elif args.output.endswith(".jsonl"):
+        with open(args.output, 'w', encoding='utf-8') as f:
+            stats = {"reports": write_summary_jsonl(f, reports)}
+    elif args.output == "-":
+        stats = write_export_zip(sys.stdout.buffer, store, since, until, not args.no_pdfs)
+    else:
+        with open(args.output, 'wb') as f:
+            stats = write_export_zip(f, store, since, until, not args.no_pdfs)
+
+    print(json.dumps(stats, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# ============================================================================
+# File: fake_llm.py
+"""Deterministic fake chat model for benchmarks and offline runs.
+
+FakeChatModel is a drop-in for the ChatGroq client returned by
+initialize_llm: it supports invoke/stream/ainvoke/astream, fires the usual
+callbacks (so telemetry and tracing work) and replies from a fixed script
+with configurable first-token latency and token rate.
+"""
+
+import asyncio
+import json
+import re
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+CANDIDATE_RECORD = {
+    "full_name": "Jane Doe",
+    "email": "jane.doe@example.com",
+    "phone_number": "+1 555 0100",
+    "years_of_experience": 6,
+    "desired_positions": ["Backend Engineer"],
+    "current_location": "Berlin, Germany",
+    "tech_stack": "Python, Django, PostgreSQL, Redis, Docker, AWS"
+}
+
+# The app sends the greeting (and the full-name question) itself
+PHASE1_REPLIES = [
+    "Thanks! What's the best email address to reach you?",
+    "Got it. What's your phone number?",
+    "How many years of professional experience do you have?",
+    "Which position(s) are you interested in?",
+    "Where are you currently located?",
+    "What technologies do you work with? Please list your programming languages, frameworks, databases, and tools.",
+]
+
+PHASE2_REPLIES = [
+    "Thank you for providing your information. Now, I'd like to assess your technical skills with a few questions.\n\n"
+    "Question 1: A Django endpoint backed by PostgreSQL has a p99 latency of two seconds under load. "
+    "How would you diagnose and fix it?",
+    "Thanks, profiling first is the right instinct. Question 2: How would you design a Redis caching layer "
+    "for a read-heavy API, and how would you handle invalidation?",
+    "Good point about TTLs. Question 3: How would you structure a Docker image for a Python service "
+    "to keep builds fast and images small?",
+    "Makes sense. Question 4: How would you run database migrations safely during a zero-downtime "
+    "deployment on AWS?",
+    "Thanks. Question 5: How would you make a background task pipeline idempotent and observable?",
+    "That completes our technical assessment. Thank you for your time! I'm now generating your detailed report.",
+]
+
+CHAT_SCRIPT = PHASE1_REPLIES + PHASE2_REPLIES
+
+ANALYSIS = """**1. Overall Technical Competency: 7/10**
+The candidate showed solid practical knowledge across their stated stack.
+
+**2. Strengths**
+- Profiles before optimizing and reasons about indexes and query plans
+- Understands cache invalidation trade-offs and TTL-based staleness
+
+**3. Areas for Improvement**
+- Zero-downtime migration answer lacked a rollback plan
+- Limited detail on observability tooling
+
+**4. Knowledge Depth Assessment: Intermediate**
+
+**5. Communication Skills**
+Clear, structured answers with concrete examples.
+
+**6. Recommendation: Hire**
+Strong fundamentals with room to grow in operational depth.
+
+**7. Suggested Next Steps**
+System design interview focusing on data migrations and monitoring.
+
+```json
+{"score": 7, "depth_level": "intermediate", "recommendation": "Hire",
+ "strengths": ["Profiles before optimizing and reasons about indexes and query plans",
+               "Understands cache invalidation trade-offs and TTL-based staleness"],
+ "weaknesses": ["Zero-downtime migration answer lacked a rollback plan",
+                "Limited detail on observability tooling"]}
+```"""
+
+SUMMARY = ("Candidate Jane Doe (jane.doe@example.com, +1 555 0100), 6 years, Backend Engineer, Berlin. "
+           "Tech stack: Python, Django, PostgreSQL, Redis, Docker, AWS. Technical questions in progress.")
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+def scripted_reply(messages: List[BaseMessage]) -> str:
+    """
+    Pick the reply for a prompt.
+
+    Chat replies continue the script after the last assistant message in the
+    prompt, so the choice does not depend on how much history was kept.
+    """
+    last = str(messages[-1].content) if messages else ""
+
+    if "Extract the following information from this resume" in last:
+        return json.dumps(CANDIDATE_RECORD)
+    if "Analyze this candidate's technical interview performance" in last:
+        return ANALYSIS
+    if "Update the running summary" in last:
+        return SUMMARY
+    if "I have extracted the following information from the candidate's resume" in last:
+        return PHASE2_REPLIES[0]
+
+    for message in reversed(messages[:-1]):
+        if isinstance(message, AIMessage) and message.content in CHAT_SCRIPT:
+            index = CHAT_SCRIPT.index(message.content)
+            return CHAT_SCRIPT[min(index + 1, len(CHAT_SCRIPT) - 1)]
+    return CHAT_SCRIPT[0]
+
+
+def initialize_fake_llm(latency: Optional[float] = None,
+                        tokens_per_second: Optional[float] = None) -> "FakeChatModel":
+    """Build a FakeChatModel using AppConfig defaults for unset parameters."""
+    from config import AppConfig
+
+    config = AppConfig()
+    return FakeChatModel(
+        model_name=f"fake-{config.MODEL_NAME}",
+        latency=config.FAKE_LLM_LATENCY if latency is None else latency,
+        tokens_per_second=config.FAKE_LLM_TOKENS_PER_SECOND if tokens_per_second is None else tokens_per_second
+    )
+
+
+class FakeChatModel(BaseChatModel):
+    """Scripted chat model with simulated latency and token rate."""
+
+    model_name: str = "fake-llm"
+    latency: float = 0.2
+    tokens_per_second: float = 250.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "talentscout-fake"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name}
+
+    def _usage(self, messages: List[BaseMessage], text: str) -> dict:
+        input_tokens = sum(len(_tokens(str(m.content))) for m in messages)
+        output_tokens = len(_tokens(text))
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens
+        }
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        text = scripted_reply(messages)
+        time.sleep(self.latency + len(_tokens(text)) / self.tokens_per_second)
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                         **kwargs: Any) -> ChatResult:
+        text = scripted_reply(messages)
+        await asyncio.sleep(self.latency + len(_tokens(text)) / self.tokens_per_second)
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        text = scripted_reply(messages)
+        time.sleep(self.latency)
+        for token in _tokens(text):
+            time.sleep(1 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=self._usage(messages, text)))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        text = scripted_reply(messages)
+        await asyncio.sleep(self.latency)
+        for token in _tokens(text):
+            await asyncio.sleep(1 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=self._usage(messages, text)))
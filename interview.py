@@ -0,0 +1,355 @@
+# ============================================================================
+# File: interview.py
+"""Headless interview engine: session state and flow without Streamlit.
+
+An InterviewSession holds everything one screening needs (transcript,
+collected fields, Q&A pairs, phase flags, memory and telemetry) and
+exposes the flow as methods. The Streamlit app, the async server and the
+benchmarks all drive the same object.
+"""
+
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from memory import RollingSummaryHistory, prompt_token_usage
+from telemetry import LLMTelemetry
+from tracing import span
+
+
+PHASE_MODE_SELECT = "mode_select"
+PHASE_RESUME_UPLOAD = "resume_upload"
+PHASE_RESUME_VERIFY = "resume_verify"
+PHASE_CHAT = "chat"
+PHASE_COMPLETE = "complete"
+
+
+def detect_assessment_complete(message: str) -> bool:
+    """Detect if the assessment has been completed based on LLM response."""
+    completion_phrases = [
+        "that completes our technical assessment",
+        "thank you for your time",
+        "generating your detailed report",
+        "concludes our technical assessment",
+        "finished with the technical questions",
+        "completed the assessment"
+    ]
+
+    message_lower = message.lower()
+    return any(phrase in message_lower for phrase in completion_phrases)
+
+
+def detect_question_in_message(message: str) -> bool:
+    """Detect if message contains a question."""
+    # Check for question mark
+    if '?' in message:
+        return True
+
+    # Check for question keywords
+    question_starters = ['what', 'how', 'why', 'when', 'where', 'can you', 'could you', 'would you', 'explain', 'describe', 'tell me']
+    message_lower = message.lower()
+
+    return any(message_lower.strip().startswith(starter) for starter in question_starters)
+
+
+# Phase 1 question keywords -> candidate field, checked in order (the name
+# question last, since other questions may address the candidate by name)
+PROFILE_QUESTION_FIELDS = [
+    (("email",), "email"),
+    (("phone",), "phone_number"),
+    (("years",), "years_of_experience"),
+    (("position", "role"), "desired_positions"),
+    (("located", "location"), "current_location"),
+    (("technolog", "tech stack"), "tech_stack"),
+    (("name",), "full_name"),
+]
+
+
+def detect_question_phase(message: str) -> bool:
+    """Detect the move from information gathering to technical questions."""
+    message_lower = message.lower()
+    return "technical" in message_lower and "question" in message_lower
+
+
+class InterviewSession:
+    """
+    State machine for one candidate screening.
+
+    Phases: mode_select -> (resume_upload -> resume_verify ->) chat -> complete.
+    """
+
+    def __init__(self, llm, session_id: Optional[str] = None):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.input_mode: Optional[str] = None
+        self.messages: List[Dict[str, str]] = []
+        self.candidate_info: Dict[str, Any] = {}
+        self.qa_pairs: List[Dict[str, str]] = []
+        self.resume_processed = False
+        self.question_phase = False
+        self.assessment_complete = False
+        self.report_artifacts: Optional[Dict[str, Any]] = None
+        self.ttft_history: List[float] = []
+        self.prompt_tokens_history: List[Dict[str, int]] = []
+        # Chat-mode Phase 1 answers, keyed by candidate field; pinned into
+        # memory and used to pick question bank entries
+        self.profile_answers: Dict[str, str] = {}
+        self.bank_questions: List[Dict[str, str]] = []
+
+        self.telemetry = LLMTelemetry()
+        self.chat_history = RollingSummaryHistory(summarizer=llm)
+        self.chat_history.callbacks = [self.telemetry]
+        self.llm = None
+        self.chain = None
+        self.bind_llm(llm)
+
+    @property
+    def phase(self) -> str:
+        """Current phase of the interview."""
+        if self.assessment_complete:
+            return PHASE_COMPLETE
+        if self.input_mode is None:
+            return PHASE_MODE_SELECT
+        if self.input_mode == "resume" and not self.resume_processed:
+            return PHASE_RESUME_UPLOAD
+        if self.needs_resume_verification:
+            return PHASE_RESUME_VERIFY
+        return PHASE_CHAT
+
+    @property
+    def needs_resume_verification(self) -> bool:
+        """True until the LLM has reviewed the extracted resume fields."""
+        return self.input_mode == "resume" and self.resume_processed and len(self.messages) == 1
+
+    @property
+    def callbacks(self) -> list:
+        return [self.telemetry]
+
+    def bind_llm(self, llm):
+        """Use llm for subsequent calls (e.g. a refreshed cached client)."""
+        from llm_handler import create_chain
+
+        if llm is self.llm:
+            return
+        self.llm = llm
+        self.chat_history.summarizer = llm
+        self.chain = create_chain(llm, self.chat_history)
+
+    # ------------------------------------------------------------------
+    # Mode selection and resume intake
+    # ------------------------------------------------------------------
+
+    def start_chat(self) -> str:
+        """Enter chat mode and return the greeting."""
+        from prompts import get_chat_greeting
+
+        self.input_mode = "chat"
+        greeting = get_chat_greeting()
+        self.messages.append({"role": "assistant", "content": greeting})
+        return greeting
+
+    def start_resume(self):
+        """Enter resume mode; process_resume() is expected next."""
+        self.input_mode = "resume"
+
+    def process_resume(self, pdf_bytes: bytes,
+                       on_field: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """
+        Extract candidate fields from a resume PDF.
+
+        :param on_field: Called with (key, value) as each field is extracted
+        :return: Dict with ``ok`` and ``cache_hit``
+        """
+        from prompts import get_resume_greeting
+        from resume_cache import process_resume
+        from utils import format_candidate_info_natural
+
+        with span("resume.process"):
+            _, extracted_info, cache_hit = process_resume(pdf_bytes, self.llm, on_field, callbacks=self.callbacks)
+
+        if not extracted_info:
+            return {"ok": False, "cache_hit": cache_hit}
+
+        self.candidate_info.clear()
+        self.candidate_info.update(extracted_info)
+        self._update_pinned_info()
+        greeting = get_resume_greeting(format_candidate_info_natural(extracted_info))
+        self.messages.append({"role": "assistant", "content": greeting})
+        self.resume_processed = True
+        self._pin_bank_questions()
+        return {"ok": True, "cache_hit": cache_hit}
+
+    def stream_resume_verification(self) -> Iterator[str]:
+        """Stream the LLM's review of the extracted resume fields."""
+        from prompts import get_resume_verification_prompt
+        from utils import format_candidate_info_natural
+
+        query = get_resume_verification_prompt(format_candidate_info_natural(self.candidate_info))
+        yield from self._stream_reply(query, check_complete=False)
+
+    # ------------------------------------------------------------------
+    # Conversation turns
+    # ------------------------------------------------------------------
+
+    def stream_turn(self, user_input: str) -> Iterator[str]:
+        """
+        Record the candidate's message and stream the assistant reply.
+
+        Q&A capture and phase transitions are applied once the stream ends.
+        """
+        self._record_user_turn(user_input)
+        yield from self._stream_reply(user_input)
+
+    async def astream_turn(self, user_input: str) -> AsyncIterator[str]:
+        """Async stream_turn(), for the asyncio server."""
+        self._record_user_turn(user_input)
+        async for token in self._astream_reply(user_input):
+            yield token
+
+    async def astream_resume_verification(self) -> AsyncIterator[str]:
+        """Async stream_resume_verification(), for the asyncio server."""
+        from prompts import get_resume_verification_prompt
+        from utils import format_candidate_info_natural
+
+        query = get_resume_verification_prompt(format_candidate_info_natural(self.candidate_info))
+        async for token in self._astream_reply(query, check_complete=False):
+            yield token
+
+    def send(self, user_input: str) -> str:
+        """Non-streaming stream_turn(); returns the full reply."""
+        return "".join(self.stream_turn(user_input))
+
+    def verify_resume(self) -> str:
+        """Non-streaming stream_resume_verification(); returns the full reply."""
+        return "".join(self.stream_resume_verification())
+
+    def last_assistant_message(self, before_last: bool = False) -> Optional[str]:
+        """Return the most recent assistant message (skipping the newest entry if before_last)."""
+        messages = self.messages[:-1] if before_last else self.messages
+        for msg in reversed(messages):
+            if msg["role"] == "assistant":
+                return msg["content"]
+        return None
+
+    def _record_user_turn(self, user_input: str):
+        self.messages.append({"role": "user", "content": user_input})
+
+        if not self.question_phase:
+            self._capture_profile_answer(user_input)
+
+        # Store Q&A if in question phase
+        if self.question_phase:
+            last_assistant_msg = self.last_assistant_message(before_last=True)
+            if last_assistant_msg and detect_question_in_message(last_assistant_msg):
+                self.qa_pairs.append({
+                    "question": last_assistant_msg,
+                    "answer": user_input
+                })
+
+    def _capture_profile_answer(self, user_input: str):
+        """Remember the answer to the Phase 1 question it replies to."""
+        question = (self.last_assistant_message(before_last=True) or "").lower()
+        for keywords, field in PROFILE_QUESTION_FIELDS:
+            if any(keyword in question for keyword in keywords):
+                self.profile_answers[field] = user_input.strip()
+                self._update_pinned_info()
+                if field == "tech_stack":
+                    self._pin_bank_questions()
+                return
+
+    def _update_pinned_info(self):
+        """Pin chat answers and resume fields (resume wins) into memory."""
+        self.chat_history.pinned_info = {
+            **self.profile_answers, **{k: v for k, v in self.candidate_info.items() if v}
+        }
+
+    def _pin_bank_questions(self):
+        """Pick Phase 2 questions from the bank once the tech stack is known."""
+        from config import AppConfig
+        from question_bank import select_questions
+
+        if self.bank_questions or not AppConfig().QUESTION_BANK_ENABLED:
+            return
+        profile = {**self.profile_answers, **{k: v for k, v in self.candidate_info.items() if v}}
+        if not profile.get("tech_stack"):
+            return
+
+        self.bank_questions = select_questions(profile["tech_stack"], profile.get("years_of_experience"))
+        self.chat_history.pinned_questions = [item["question"] for item in self.bank_questions]
+
+    def _stream_reply(self, user_input: str, check_complete: bool = True) -> Iterator[str]:
+        from llm_handler import stream_chain_response
+
+        timings: Dict[str, Any] = {}
+        reply = ""
+        usage = prompt_token_usage(self.chat_history, user_input)
+        self.prompt_tokens_history.append(usage)
+
+        with span("chat.turn") as turn_span:
+            for token in stream_chain_response(self.chain, user_input, timings, session_id=self.session_id,
+                                               callbacks=self.callbacks, prompt_tokens=usage["sent"]):
+                reply += token
+                yield token
+            turn_span.set(ttft=timings.get("ttft"), queue_wait=timings.get("queue_wait"), chars=len(reply))
+
+        if timings.get("ttft") is not None:
+            self.ttft_history.append(timings["ttft"])
+        self._commit_reply(reply, check_complete)
+
+    async def _astream_reply(self, user_input: str, check_complete: bool = True) -> AsyncIterator[str]:
+        from llm_handler import astream_chain_response
+
+        timings: Dict[str, Any] = {}
+        reply = ""
+        usage = prompt_token_usage(self.chat_history, user_input)
+        self.prompt_tokens_history.append(usage)
+
+        with span("chat.turn") as turn_span:
+            async for token in astream_chain_response(self.chain, user_input, timings, session_id=self.session_id,
+                                                      callbacks=self.callbacks, prompt_tokens=usage["sent"]):
+                reply += token
+                yield token
+            turn_span.set(ttft=timings.get("ttft"), queue_wait=timings.get("queue_wait"), chars=len(reply))
+
+        if timings.get("ttft") is not None:
+            self.ttft_history.append(timings["ttft"])
+        self._commit_reply(reply, check_complete)
+
+    def _commit_reply(self, assistant_message: str, check_complete: bool):
+        self.messages.append({"role": "assistant", "content": assistant_message})
+
+        # Detect if entering question phase
+        if not self.question_phase and detect_question_phase(assistant_message):
+            self.question_phase = True
+
+        # Detect if assessment is complete
+        if check_complete and detect_assessment_complete(assistant_message):
+            self.assessment_complete = True
+
+    # ------------------------------------------------------------------
+    # Assessment
+    # ------------------------------------------------------------------
+
+    def generate_report_artifacts(self) -> Dict[str, Any]:
+        """Run the analysis inline and cache the result (``analysis`` and ``report``)."""
+        from job_queue import run_assessment_job
+
+        if self.report_artifacts is None:
+            self.report_artifacts = run_assessment_job(
+                dict(self.candidate_info), list(self.qa_pairs), self.llm, self.telemetry
+            )
+        return self.report_artifacts
+
+    def submit_report_job(self) -> str:
+        """Queue the analysis on the shared job queue."""
+        from job_queue import submit_assessment_job
+
+        return submit_assessment_job(dict(self.candidate_info), list(self.qa_pairs), self.llm, self.telemetry)
+
+    async def agenerate_report_artifacts(self) -> Dict[str, Any]:
+        """Async generate_report_artifacts()."""
+        from job_queue import arun_assessment_job
+
+        if self.report_artifacts is None:
+            self.report_artifacts = await arun_assessment_job(
+                dict(self.candidate_info), list(self.qa_pairs), self.llm, self.telemetry
+            )
+        return self.report_artifacts
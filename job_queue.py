@@ -0,0 +1,181 @@
+# ============================================================================
+# File: job_queue.py
+"""Background job queue shared by all Streamlit sessions."""
+
+import asyncio
+import contextvars
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from config import AppConfig
+
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_UNKNOWN = "unknown"
+
+
+class JobQueue:
+    """
+    Submit/status/result API over two worker pools.
+
+    I/O-bound work (LLM calls) runs on a thread pool; CPU-bound work
+    (ReportLab builds) runs on a process pool so it never competes with
+    interactive turns for the GIL. Its workers are spawned, not forked:
+    forking the threaded Streamlit/server process can copy a lock held by
+    another thread into the child.
+    """
+
+    def __init__(self, io_workers: int, cpu_workers: int, retention_seconds: float):
+        self._io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="talentscout-job")
+        self._cpu_pool = ProcessPoolExecutor(max_workers=cpu_workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        self._retention_seconds = retention_seconds
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args, cpu_bound: bool = False, **kwargs) -> str:
+        """
+        Queue fn(*args, **kwargs) and return its job id.
+
+        :param cpu_bound: Run on the process pool (fn and arguments must be picklable)
+        """
+        if cpu_bound:
+            future = self._cpu_pool.submit(fn, *args, **kwargs)
+        else:
+            # Carry the caller's context (trace session, active span) into the worker
+            future = self._io_pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+        job_id = uuid.uuid4().hex
+
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = {"future": future, "submitted_at": time.time(), "finished_at": None}
+
+        future.add_done_callback(lambda _: self._mark_finished(job_id))
+        return job_id
+
+    def run_cpu_bound(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn on the process pool and block the calling worker until it finishes."""
+        return self._cpu_pool.submit(fn, *args, **kwargs).result()
+
+    async def arun_cpu_bound(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn on the process pool without blocking the event loop."""
+        return await asyncio.wrap_future(self._cpu_pool.submit(fn, *args, **kwargs))
+
+    def status(self, job_id: str) -> str:
+        """Return the job status: pending, running, done, failed or unknown."""
+        future = self._get_future(job_id)
+        if future is None:
+            return JOB_UNKNOWN
+        if future.done():
+            return JOB_FAILED if future.exception() is not None else JOB_DONE
+        return JOB_RUNNING if future.running() else JOB_PENDING
+
+    def result(self, job_id: str, timeout: Optional[float] = None) -> Any:
+        """
+        Return the job result, re-raising any exception from the job.
+
+        :raises KeyError: If the job id is unknown or has been pruned
+        """
+        future = self._get_future(job_id)
+        if future is None:
+            raise KeyError(f"Unknown job: {job_id}")
+        return future.result(timeout=timeout)
+
+    def forget(self, job_id: str):
+        """Drop a job record once its result has been consumed."""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def _get_future(self, job_id: str) -> Optional[Future]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job["future"] if job else None
+
+    def _mark_finished(self, job_id: str):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id]["finished_at"] = time.time()
+
+    def _prune(self):
+        cutoff = time.time() - self._retention_seconds
+        stale = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for job_id in stale:
+            del self._jobs[job_id]
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue, creating it on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            config = AppConfig()
+            _queue = JobQueue(
+                io_workers=config.JOB_IO_WORKERS,
+                cpu_workers=config.JOB_CPU_WORKERS,
+                retention_seconds=config.JOB_RETENTION_SECONDS
+            )
+        return _queue
+
+
+def run_assessment_job(candidate_info: Dict, qa_pairs: list, llm, telemetry=None) -> Dict[str, Any]:
+    """
+    Generate the candidate analysis and an in-memory Report.
+
+    Nothing is rendered or written here; the PDF is built when it is first
+    downloaded or persisted (see submit_persist_job).
+
+    :param telemetry: Session LLMTelemetry; its rollup goes into the JSON report
+    :return: Dict with ``analysis``, ``scoring`` and ``report``
+    """
+    from llm_handler import generate_candidate_analysis
+    from report_generator import Report
+
+    callbacks = [telemetry] if telemetry is not None else None
+    analysis, scoring = generate_candidate_analysis(candidate_info, qa_pairs, llm, callbacks)
+    llm_telemetry = telemetry.summary() if telemetry is not None else None
+
+    return {
+        "analysis": analysis,
+        "scoring": scoring,
+        "report": Report(candidate_info, qa_pairs, analysis, llm_telemetry, scoring)
+    }
+
+
+def submit_assessment_job(candidate_info: Dict, qa_pairs: list, llm, telemetry=None) -> str:
+    """Queue analysis for a finished interview."""
+    return get_job_queue().submit(run_assessment_job, candidate_info, qa_pairs, llm, telemetry)
+
+
+def submit_persist_job(report) -> str:
+    """Queue writing a Report to disk; the PDF is rendered on the process pool."""
+    return get_job_queue().submit(report.persist, True)
+
+
+async def arun_assessment_job(candidate_info: Dict, qa_pairs: list, llm, telemetry=None) -> Dict[str, Any]:
+    """Async counterpart of run_assessment_job for the asyncio server."""
+    from llm_handler import agenerate_candidate_analysis
+    from report_generator import Report
+
+    callbacks = [telemetry] if telemetry is not None else None
+    analysis, scoring = await agenerate_candidate_analysis(candidate_info, qa_pairs, llm, callbacks)
+    llm_telemetry = telemetry.summary() if telemetry is not None else None
+
+    return {
+        "analysis": analysis,
+        "scoring": scoring,
+        "report": Report(candidate_info, qa_pairs, analysis, llm_telemetry, scoring)
+    }
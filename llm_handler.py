@@ -1,40 +1,137 @@
 # ============================================================================
 # File: llm_handler.py
 """LLM initialization and chain creation."""
-from typing import Dict, Any
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, Iterator, Callable, Hashable, Optional, Tuple
 
+import httpx
 from langchain_groq import ChatGroq
+from langchain_core.messages import AIMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnableWithMessageHistory
 from config import AppConfig
+from rate_limiter import estimate_call_tokens, get_rate_limiter, usage_tokens
+from response_cache import get_response_cache, response_key
+from telemetry import count_http_request, acount_http_request
+
+
+class ResourceCache:
+    """
+    Thread-safe LRU cache for process-wide resources such as LLM clients.
+
+    Entries unused for ``ttl_seconds`` are evicted, and the least recently
+    used entry is dropped once ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for key, building it with factory on a miss."""
+        with self._lock:
+            now = time.monotonic()
+            self._evict_expired(now)
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                entry["last_used"] = now
+                self._entries.move_to_end(key)
+                return entry["value"]
+
+            self.misses += 1
+            value = factory()
+            self._entries[key] = {"value": value, "last_used": now}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+
+    def _evict_expired(self, now: float):
+        expired = [
+            key for key, entry in self._entries.items()
+            if now - entry["last_used"] > self.ttl_seconds
+        ]
+        for key in expired:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries)
+            }
+
+
+_config = AppConfig()
+_llm_cache = ResourceCache(_config.LLM_CACHE_MAX_ENTRIES, _config.LLM_CACHE_TTL_SECONDS)
 
 
 def initialize_llm(api_key: str) -> ChatGroq:
-    """Initialize the ChatGroq LLM with given API key."""
+    """
+    Return a ChatGroq client for the given API key.
+
+    Clients are shared process-wide, keyed by API key and model settings,
+    so reruns and sessions reuse the same HTTP connection pool. With
+    AppConfig.FAKE_LLM set, a scripted FakeChatModel is returned instead.
+    """
     config = AppConfig()
-    return ChatGroq(
+    if config.FAKE_LLM:
+        from fake_llm import initialize_fake_llm
+        return _llm_cache.get(("fake",), initialize_fake_llm)
+    
+    key = (
+        hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
+        config.MODEL_NAME,
+        config.TEMPERATURE,
+        config.MAX_RETRIES
+    )
+    return _llm_cache.get(key, lambda: ChatGroq(
         model=config.MODEL_NAME,
         temperature=config.TEMPERATURE,
         max_tokens=None,
         timeout=None,
         max_retries=config.MAX_RETRIES,
         api_key=api_key,
-    )
+        # Request hooks let telemetry count retried HTTP requests per call
+        http_client=httpx.Client(event_hooks={"request": [count_http_request]}),
+        http_async_client=httpx.AsyncClient(event_hooks={"request": [acount_http_request]}),
+    ))
 
 
-def create_chain(llm, chat_history):
-    """Create the LangChain conversation chain."""
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """Return hit rate statistics for the shared LLM client cache."""
+    return _llm_cache.stats()
+
+
+@lru_cache(maxsize=1)
+def get_chat_prompt() -> ChatPromptTemplate:
+    """Build the conversation prompt template once per process."""
     from prompts import get_system_prompt
     
-    system_prompt = get_system_prompt()
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
+    return ChatPromptTemplate.from_messages([
+        ("system", get_system_prompt()),
         MessagesPlaceholder("history"),
         ("human", "{input}")
     ])
-    
-    chain = prompt | llm
+
+
+def create_chain(llm, chat_history):
+    """Create the LangChain conversation chain."""
+    chain = get_chat_prompt() | llm
     
     langmem_chain = RunnableWithMessageHistory(
         chain,
@@ -46,22 +143,211 @@ def create_chain(llm, chat_history):
     return langmem_chain
 
 
-def extract_info_from_resume(resume_text: str, llm) -> Dict[str, Any]:
-    """Use LLM to extract structured candidate information from resume text."""
+def _estimate_tokens(text: str) -> int:
+    from utils import estimate_tokens
+    
+    return estimate_tokens(text)
+
+
+def invoke_llm(llm, messages: list, stage: str, callbacks: Optional[list] = None):
+    """
+    Call llm.invoke through the response cache and the process-wide rate limiter.
+
+    Deterministic stages are answered from the response cache when the
+    same prompt was sent to the same model before; hits skip the limiter.
+
+    :param messages: Chat messages as role/content dicts
+    :param stage: Call stage tag; also selects the limiter priority class
+    :param callbacks: LangChain callback handlers (e.g. LLMTelemetry)
+    :return: The model's AIMessage
+    """
+    cache_key = response_key(llm, messages, stage)
+    if cache_key is not None:
+        cached = get_response_cache().get(cache_key, stage)
+        if cached is not None:
+            return AIMessage(content=cached)
+    
+    tokens = estimate_call_tokens(sum(_estimate_tokens(m["content"]) for m in messages))
+    with get_rate_limiter().reserve(stage, tokens) as reservation:
+        response = llm.invoke(messages, config={"callbacks": callbacks, "tags": [stage]})
+        reservation.settle(usage_tokens(response))
+    
+    if cache_key is not None and response.content:
+        get_response_cache().put(cache_key, response.content, stage, getattr(llm, "model_name", None))
+    return response
+
+
+async def ainvoke_llm(llm, messages: list, stage: str, callbacks: Optional[list] = None):
+    """Async invoke_llm(); cache lookups run off the event loop."""
+    cache_key = response_key(llm, messages, stage)
+    if cache_key is not None:
+        cached = await asyncio.to_thread(get_response_cache().get, cache_key, stage)
+        if cached is not None:
+            return AIMessage(content=cached)
+    
+    tokens = estimate_call_tokens(sum(_estimate_tokens(m["content"]) for m in messages))
+    async with get_rate_limiter().areserve(stage, tokens) as reservation:
+        response = await llm.ainvoke(messages, config={"callbacks": callbacks, "tags": [stage]})
+        reservation.settle(usage_tokens(response))
+    
+    if cache_key is not None and response.content:
+        await asyncio.to_thread(
+            get_response_cache().put, cache_key, response.content, stage, getattr(llm, "model_name", None)
+        )
+    return response
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters for the deterministic response cache."""
+    return get_response_cache().stats()
+
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    """Return queue depth and wait metrics from the shared rate limiter."""
+    return get_rate_limiter().stats()
+
+
+def stream_chain_response(chain, user_input: str, timings: Dict[str, Any],
+                          session_id: str = "user_session", callbacks: Optional[list] = None,
+                          prompt_tokens: Optional[int] = None) -> Iterator[str]:
+    """
+    Stream the chain reply chunk by chunk.
+
+    RunnableWithMessageHistory commits the aggregated reply to the chat
+    history once the stream is exhausted, same as ``invoke``.
+
+    :param chain: Chain returned by create_chain
+    :param user_input: Human message for this turn
+    :param timings: Dict filled with ``ttft``, ``queue_wait`` and ``total`` (seconds)
+    :param session_id: Chat history session id
+    :param callbacks: LangChain callback handlers (e.g. LLMTelemetry)
+    :param prompt_tokens: Estimated prompt size for the rate limiter
+                          (defaults to the user input alone)
+    :return: Iterator of text chunks
+    """
+    start = time.perf_counter()
+    timings["ttft"] = None
+    tokens = estimate_call_tokens(prompt_tokens if prompt_tokens is not None else _estimate_tokens(user_input))
+
+    with get_rate_limiter().reserve("chat", tokens) as reservation:
+        timings["queue_wait"] = reservation.waited
+        actual_tokens = None
+        for chunk in chain.stream(
+            {"input": user_input},
+            config={"configurable": {"session_id": session_id}, "callbacks": callbacks, "tags": ["chat"]}
+        ):
+            actual_tokens = usage_tokens(chunk) or actual_tokens
+            text = getattr(chunk, "content", chunk)
+            if not text:
+                continue
+            if timings["ttft"] is None:
+                timings["ttft"] = time.perf_counter() - start
+            yield text
+        reservation.settle(actual_tokens)
+
+    timings["total"] = time.perf_counter() - start
+
+
+async def astream_chain_response(chain, user_input: str, timings: Dict[str, Any],
+                                 session_id: str = "user_session",
+                                 callbacks: Optional[list] = None,
+                                 prompt_tokens: Optional[int] = None) -> AsyncIterator[str]:
+    """
+    Async counterpart of stream_chain_response, for the asyncio server.
+
+    Waiting on the model yields to the event loop, so idle sessions cost
+    no threads.
+    """
+    start = time.perf_counter()
+    timings["ttft"] = None
+    tokens = estimate_call_tokens(prompt_tokens if prompt_tokens is not None else _estimate_tokens(user_input))
+
+    async with get_rate_limiter().areserve("chat", tokens) as reservation:
+        timings["queue_wait"] = reservation.waited
+        actual_tokens = None
+        async for chunk in chain.astream(
+            {"input": user_input},
+            config={"configurable": {"session_id": session_id}, "callbacks": callbacks, "tags": ["chat"]}
+        ):
+            actual_tokens = usage_tokens(chunk) or actual_tokens
+            text = getattr(chunk, "content", chunk)
+            if not text:
+                continue
+            if timings["ttft"] is None:
+                timings["ttft"] = time.perf_counter() - start
+            yield text
+        reservation.settle(actual_tokens)
+
+    timings["total"] = time.perf_counter() - start
+
+
+def extract_info_from_resume(resume_text: str, llm,
+                             on_field: Optional[Callable[[str, Any], None]] = None,
+                             callbacks: Optional[list] = None) -> Dict[str, Any]:
+    """
+    Use LLM to extract structured candidate information from resume text.
+    
+    :param on_field: If given, the response is streamed and on_field(key, value)
+                     is called as soon as each field is complete
+    :param callbacks: LangChain callback handlers (e.g. LLMTelemetry)
+    """
     from prompts import get_extraction_prompt
+    from utils import parse_json_from_response, StreamingJSONExtractor
     
     extraction_prompt = get_extraction_prompt(resume_text)
-    response = llm.invoke([{"role": "user", "content": extraction_prompt}])
+    messages = [{"role": "user", "content": extraction_prompt}]
+    
+    if on_field is None:
+        response = invoke_llm(llm, messages, "resume_extraction", callbacks)
+        return parse_json_from_response(response.content)
+    
+    extractor = StreamingJSONExtractor()
+    cache_key = response_key(llm, messages, "resume_extraction")
+    content = get_response_cache().get(cache_key, "resume_extraction") if cache_key is not None else None
+    if content is not None:
+        for key, value in extractor.feed(content).items():
+            on_field(key, value)
+        return extractor.fields or parse_json_from_response(content)
+    
+    content = ""
+    tokens = estimate_call_tokens(_estimate_tokens(extraction_prompt))
+    with get_rate_limiter().reserve("resume_extraction", tokens) as reservation:
+        actual_tokens = None
+        for chunk in llm.stream(messages, config={"callbacks": callbacks, "tags": ["resume_extraction"]}):
+            actual_tokens = usage_tokens(chunk) or actual_tokens
+            content += chunk.content
+            for key, value in extractor.feed(chunk.content).items():
+                on_field(key, value)
+        reservation.settle(actual_tokens)
+    
+    if cache_key is not None and content:
+        get_response_cache().put(cache_key, content, "resume_extraction", getattr(llm, "model_name", None))
+    return extractor.fields or parse_json_from_response(content)
+
+
+def generate_candidate_analysis(candidate_info: Dict, qa_pairs: list, llm,
+                                callbacks: Optional[list] = None) -> Tuple[str, Dict]:
+    """
+    Generate detailed analysis of candidate performance.
+    
+    :return: Tuple of (analysis text, scoring fields from scoring.split_analysis)
+    """
+    from prompts import get_analysis_prompt
+    from scoring import split_analysis
+    
+    analysis_prompt = get_analysis_prompt(candidate_info, qa_pairs)
+    response = invoke_llm(llm, [{"role": "user", "content": analysis_prompt}], "analysis", callbacks)
     
-    from utils import parse_json_from_response
-    return parse_json_from_response(response.content)
+    return split_analysis(response.content)
 
 
-def generate_candidate_analysis(candidate_info: Dict, qa_pairs: list, llm) -> str:
-    """Generate detailed analysis of candidate performance."""
+async def agenerate_candidate_analysis(candidate_info: Dict, qa_pairs: list, llm,
+                                       callbacks: Optional[list] = None) -> Tuple[str, Dict]:
+    """Async counterpart of generate_candidate_analysis."""
     from prompts import get_analysis_prompt
+    from scoring import split_analysis
     
     analysis_prompt = get_analysis_prompt(candidate_info, qa_pairs)
-    response = llm.invoke([{"role": "user", "content": analysis_prompt}])
+    response = await ainvoke_llm(llm, [{"role": "user", "content": analysis_prompt}], "analysis", callbacks)
     
-    return response.content
+    return split_analysis(response.content)
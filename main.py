@@ -2,44 +2,49 @@
 # File: main.py (app.py)
 """Main Streamlit application."""
 from typing import Dict, Any
+import hmac
 
 
 import streamlit as st
-from langchain_core.chat_history import InMemoryChatMessageHistory
+from tracing import trace_session, span
 from config import initialize_session_state, AppConfig
-from llm_handler import initialize_llm, create_chain, extract_info_from_resume, generate_candidate_analysis
-from utils import extract_clean_resume_text, format_candidate_info_natural
+from llm_handler import initialize_llm, get_llm_cache_stats, get_rate_limit_stats
+from interview import (
+    InterviewSession, PHASE_MODE_SELECT, PHASE_RESUME_UPLOAD, PHASE_RESUME_VERIFY, PHASE_COMPLETE
+)
 from voice_handler import get_voice_input
-from report_generator import generate_reports
-import re
+from job_queue import get_job_queue, submit_persist_job, JOB_DONE, JOB_FAILED, JOB_UNKNOWN
+import time
 
 
-def detect_assessment_complete(message: str) -> bool:
-    """Detect if the assessment has been completed based on LLM response."""
-    completion_phrases = [
-        "that completes our technical assessment",
-        "thank you for your time",
-        "generating your detailed report",
-        "concludes our technical assessment",
-        "finished with the technical questions",
-        "completed the assessment"
-    ]
-    
-    message_lower = message.lower()
-    return any(phrase in message_lower for phrase in completion_phrases)
+def render_candidate_info(placeholder, candidate_info: Dict):
+    """Render collected candidate fields into a sidebar placeholder."""
+    with placeholder.container():
+        if candidate_info:
+            for key, value in candidate_info.items():
+                if value:
+                    formatted_key = key.replace('_', ' ').title()
+                    if isinstance(value, list):
+                        formatted_value = ', '.join(str(v) for v in value)
+                    elif isinstance(value, dict):
+                        formatted_value = ', '.join(str(v) for items in value.values() for v in (items if isinstance(items, list) else [items]))
+                    else:
+                        formatted_value = str(value)
+                    st.write(f"**{formatted_key}:** {formatted_value}")
+        else:
+            st.info("No information collected yet")
 
 
-def detect_question_in_message(message: str) -> bool:
-    """Detect if message contains a question."""
-    # Check for question mark
-    if '?' in message:
-        return True
-    
-    # Check for question keywords
-    question_starters = ['what', 'how', 'why', 'when', 'where', 'can you', 'could you', 'would you', 'explain', 'describe', 'tell me']
-    message_lower = message.lower()
-    
-    return any(message_lower.strip().startswith(starter) for starter in question_starters)
+def render_streamed_reply(tokens) -> str:
+    """Render an assistant reply incrementally from a token iterator."""
+    reply = ""
+    with st.chat_message("assistant"):
+        placeholder = st.empty()
+        for token in tokens:
+            reply += token
+            placeholder.markdown(reply + "▌")
+        placeholder.markdown(reply)
+    return reply
 
 
 def main():
@@ -52,6 +57,39 @@ def main():
     # Initialize session state
     initialize_session_state()
     
+    # Recruiter pages are only offered when a recruiter token is configured
+    page = "🎯 Interview"
+    if AppConfig().RECRUITER_TOKEN:
+        page = st.sidebar.radio("Page", ["🎯 Interview", "📊 Recruiter Analytics"], label_visibility="collapsed")
+    
+    with trace_session(st.session_state.session_id), span("streamlit.rerun"):
+        if page == "📊 Recruiter Analytics":
+            if recruiter_unlocked():
+                from analytics import render_analytics_page
+                render_analytics_page()
+        else:
+            render_app()
+
+
+def recruiter_unlocked() -> bool:
+    """Ask for the recruiter token once per session; True once it matches."""
+    if st.session_state.recruiter_unlocked:
+        return True
+    
+    st.title("📊 Recruiter Analytics")
+    token = st.text_input("Recruiter token", type="password")
+    if not token:
+        return False
+    if not hmac.compare_digest(token.encode("utf-8"), AppConfig().RECRUITER_TOKEN.encode("utf-8")):
+        st.error("Invalid recruiter token")
+        return False
+    
+    st.session_state.recruiter_unlocked = True
+    st.rerun()
+
+
+def render_app():
+    """Render the whole app for one Streamlit rerun."""
     # Custom CSS
     st.markdown("""
         <style>
@@ -91,6 +129,8 @@ def main():
     st.markdown('<div class="main-header">🎯 TalentScout</div>', unsafe_allow_html=True)
     st.markdown('<div class="sub-header">AI-Powered Hiring Assistant</div>', unsafe_allow_html=True)
     
+    interview = st.session_state.interview
+    
     # Sidebar
     with st.sidebar:
         st.header("⚙️ Configuration")
@@ -98,29 +138,49 @@ def main():
         
         if api_key:
             st.success("✅ API Key configured")
+            cache_stats = get_llm_cache_stats()
+            if cache_stats["hits"] + cache_stats["misses"]:
+                st.caption(
+                    f"🔌 LLM client cache hit rate: {cache_stats['hit_rate']:.0%} "
+                    f"({cache_stats['size']} cached)"
+                )
+            limiter_stats = get_rate_limit_stats()
+            if limiter_stats["queue_depth"] or limiter_stats["classes"]["chat"]["throttled"]:
+                st.caption(
+                    f"🚦 LLM queue: {limiter_stats['queue_depth']} waiting, "
+                    f"chat p95 wait {limiter_stats['classes']['chat']['wait_p95']:.1f}s"
+                )
         else:
             st.warning("⚠️ Please enter your Groq API key")
         
         st.markdown("---")
         st.markdown("### 📋 Information Collected")
-        if st.session_state.candidate_info:
-            for key, value in st.session_state.candidate_info.items():
-                if value:
-                    formatted_key = key.replace('_', ' ').title()
-                    if isinstance(value, list):
-                        formatted_value = ', '.join(str(v) for v in value)
-                    elif isinstance(value, dict):
-                        formatted_value = ', '.join(str(v) for items in value.values() for v in (items if isinstance(items, list) else [items]))
-                    else:
-                        formatted_value = str(value)
-                    st.write(f"**{formatted_key}:** {formatted_value}")
-        else:
-            st.info("No information collected yet")
+        info_panel = st.empty()
+        render_candidate_info(info_panel, interview.candidate_info if interview else {})
+        
+        if interview and interview.ttft_history:
+            st.markdown("---")
+            st.markdown("### 📈 Turn Metrics")
+            ttft = interview.ttft_history
+            st.metric(
+                "Time to first token",
+                f"{ttft[-1]:.2f}s",
+                help=f"Average over {len(ttft)} turns: {sum(ttft) / len(ttft):.2f}s"
+            )
+        
+        if interview and interview.prompt_tokens_history:
+            usage = interview.prompt_tokens_history[-1]
+            st.metric(
+                "Prompt tokens (last turn)",
+                f"~{usage['sent']:,}",
+                delta=f"{usage['sent'] - usage['full_transcript']:,} vs full transcript",
+                delta_color="inverse"
+            )
         
         st.markdown("---")
         
         # Voice input toggle (only show during question phase)
-        if st.session_state.question_phase:
+        if interview and interview.question_phase:
             st.markdown("### 🎤 Voice Input")
             voice_enabled = st.checkbox("Enable Voice Input", value=st.session_state.voice_enabled)
             st.session_state.voice_enabled = voice_enabled
@@ -138,15 +198,16 @@ def main():
         st.warning("👈 Please enter your Groq API Key in the sidebar to continue")
         return
     
-    # Initialize LLM and chain
-    if st.session_state.chat_history is None:
-        st.session_state.chat_history = InMemoryChatMessageHistory()
-    
+    # Initialize LLM and interview engine
     llm = initialize_llm(api_key)
-    chain = create_chain(llm, st.session_state.chat_history)
+    
+    if interview is None:
+        interview = InterviewSession(llm, session_id=st.session_state.session_id)
+        st.session_state.interview = interview
+    interview.bind_llm(llm)
     
     # Mode Selection
-    if not st.session_state.mode_selected:
+    if interview.phase == PHASE_MODE_SELECT:
         st.markdown("### 👋 Welcome! How would you like to proceed?")
         
         col1, col2 = st.columns(2)
@@ -159,10 +220,7 @@ def main():
                 </div>
             """, unsafe_allow_html=True)
             if st.button("Start Chat", key="chat_mode"):
-                st.session_state.mode_selected = True
-                st.session_state.input_mode = "chat"
-                greeting = "Hello! I'm TalentScout, your AI hiring assistant. I'll help you through our initial screening process by collecting some basic information and assessing your technical skills. Let's get started!\n\nWhat's your full name?"
-                st.session_state.messages.append({"role": "assistant", "content": greeting})
+                interview.start_chat()
                 st.rerun()
         
         with col2:
@@ -173,90 +231,52 @@ def main():
                 </div>
             """, unsafe_allow_html=True)
             if st.button("Upload Resume", key="resume_mode"):
-                st.session_state.mode_selected = True
-                st.session_state.input_mode = "resume"
+                interview.start_resume()
                 st.rerun()
     
     # Resume Upload Mode
-    elif st.session_state.input_mode == "resume" and not st.session_state.resume_processed:
+    elif interview.phase == PHASE_RESUME_UPLOAD:
         st.markdown("### 📄 Upload Your Resume")
         
         uploaded_file = st.file_uploader("Choose a PDF file", type=['pdf'])
         
         if uploaded_file is not None:
             with st.spinner("🔍 Analyzing your resume..."):
-                resume_text = extract_clean_resume_text(uploaded_file)
-                extracted_info = extract_info_from_resume(resume_text, llm)
+                partial_info = {}
                 
-                if extracted_info:
-                    st.session_state.candidate_info = extracted_info
-                    st.success("✅ Resume processed successfully!")
-                    
-                    info_natural = format_candidate_info_natural(extracted_info)
-                    
-                    greeting = f"""Hello! I'm TalentScout, your AI hiring assistant. I've analyzed your resume and extracted the following information:
-
-{info_natural}
-
-Let me verify if I have everything I need, and I'll ask for any missing details."""
-                    
-                    st.session_state.messages.append({"role": "assistant", "content": greeting})
-                    st.session_state.resume_processed = True
-                    
+                def show_field(key, value):
+                    partial_info[key] = value
+                    render_candidate_info(info_panel, partial_info)
+                
+                result = interview.process_resume(uploaded_file.getvalue(), show_field)
+                
+                if result["ok"]:
+                    st.success("✅ Resume processed successfully!" + (" (cached)" if result["cache_hit"] else ""))
                     st.rerun()
                 else:
                     st.error("❌ Could not extract information from resume. Please try chat mode instead.")
     
     # Chat Interface
-    if st.session_state.mode_selected and not st.session_state.assessment_complete:
+    if interview.phase not in (PHASE_MODE_SELECT, PHASE_RESUME_UPLOAD, PHASE_COMPLETE):
         st.markdown("### 💬 Conversation")
         
         # Display chat messages
         chat_container = st.container()
         with chat_container:
-            for message in st.session_state.messages:
+            for message in interview.messages:
                 with st.chat_message(message["role"]):
                     st.markdown(message["content"])
         
         # Special handling for resume mode first verification
-        if st.session_state.input_mode == "resume" and st.session_state.resume_processed and len(st.session_state.messages) == 1:
-            info_natural = format_candidate_info_natural(st.session_state.candidate_info)
-            
-            initial_query = f"""
-I have extracted the following information from the candidate's resume:
-
-{info_natural}
-
-Please review this information and:
-1. Check if ALL 7 required fields are present (Full Name, Email, Phone Number, Years of Experience, Desired Position(s), Current Location, Tech Stack)
-2. If anything is missing or unclear, ask for it naturally and professionally
-3. If everything is complete, acknowledge it professionally and move to technical questions
-4. DO NOT show the information as JSON or dictionary format
-5. Be conversational and natural
-
-Start your response directly.
-"""
-            
-            with st.spinner("Reviewing information..."):
-                response = chain.invoke(
-                    {"input": initial_query},
-                    config={"configurable": {"session_id": "user_session"}}
-                )
-                
-                assistant_message = response.content
-                st.session_state.messages.append({"role": "assistant", "content": assistant_message})
-                
-                # Check if question phase started
-                if "technical" in assistant_message.lower() and "question" in assistant_message.lower():
-                    st.session_state.question_phase = True
-                
-                st.rerun()
+        if interview.phase == PHASE_RESUME_VERIFY:
+            render_streamed_reply(interview.stream_resume_verification())
+            st.rerun()
         
         # Chat input with voice option
         user_input = None
         
         # Voice input during question phase
-        if st.session_state.question_phase and st.session_state.voice_enabled:
+        if interview.question_phase and st.session_state.voice_enabled:
             col1, col2 = st.columns([3, 1])
             
             with col1:
@@ -277,98 +297,114 @@ Start your response directly.
             user_input = st.chat_input("Type your message here...")
         
         if user_input:
-            # Add user message to chat
-            st.session_state.messages.append({"role": "user", "content": user_input})
-            
-            # Store Q&A if in question phase
-            if st.session_state.question_phase and len(st.session_state.messages) >= 2:
-                last_assistant_msg = None
-                for msg in reversed(st.session_state.messages[:-1]):
-                    if msg["role"] == "assistant":
-                        last_assistant_msg = msg["content"]
-                        break
-                
-                if last_assistant_msg and detect_question_in_message(last_assistant_msg):
-                    st.session_state.qa_pairs.append({
-                        "question": last_assistant_msg,
-                        "answer": user_input
-                    })
+            with st.chat_message("user"):
+                st.markdown(user_input)
             
-            # Get response from LLM
-            with st.spinner("Thinking..."):
-                response = chain.invoke(
-                    {"input": user_input},
-                    config={"configurable": {"session_id": "user_session"}}
-                )
-                
-                assistant_message = response.content
-                st.session_state.messages.append({"role": "assistant", "content": assistant_message})
-                
-                # Detect if entering question phase
-                if not st.session_state.question_phase:
-                    if "technical" in assistant_message.lower() and "question" in assistant_message.lower():
-                        st.session_state.question_phase = True
-                
-                # Detect if assessment is complete
-                if detect_assessment_complete(assistant_message):
-                    st.session_state.assessment_complete = True
+            # Stream response from LLM; the engine records Q&A and phase changes
+            render_streamed_reply(interview.stream_turn(user_input))
             
             st.rerun()
     
     # Assessment Complete - Generate Reports
-    elif st.session_state.assessment_complete:
+    elif interview.phase == PHASE_COMPLETE:
         st.markdown("### ✅ Assessment Complete!")
         
-        with st.spinner("🔄 Generating comprehensive analysis and reports..."):
-            # Generate AI analysis
-            analysis = generate_candidate_analysis(
-                st.session_state.candidate_info,
-                st.session_state.qa_pairs,
-                llm
-            )
+        # The analysis is generated once per session on the shared background
+        # queue; download buttons and expanders rerun the script and reuse
+        # the finished artifacts.
+        if interview.report_artifacts is None:
+            jobs = get_job_queue()
             
-            # Generate reports
-            pdf_path, json_path = generate_reports(
-                st.session_state.candidate_info,
-                st.session_state.qa_pairs,
-                analysis
-            )
+            if st.session_state.report_job_id is None:
+                st.session_state.report_job_id = interview.submit_report_job()
+            
+            job_id = st.session_state.report_job_id
+            status = jobs.status(job_id)
+            
+            if status == JOB_DONE:
+                interview.report_artifacts = jobs.result(job_id)
+                jobs.forget(job_id)
+            elif status in (JOB_FAILED, JOB_UNKNOWN):
+                if status == JOB_FAILED:
+                    try:
+                        jobs.result(job_id)
+                    except Exception as e:
+                        st.error(f"❌ Report generation failed: {str(e)}")
+                    jobs.forget(job_id)
+                else:
+                    st.error("❌ Report generation job was lost.")
+                if st.button("🔁 Retry Report Generation", use_container_width=True):
+                    st.session_state.report_job_id = None
+                    st.rerun()
+                return
+            else:
+                st.info("🔄 Generating comprehensive analysis... This page will update automatically.")
+                time.sleep(AppConfig().JOB_POLL_INTERVAL_SECONDS)
+                st.rerun()
+        
+        artifacts = interview.report_artifacts
+        analysis = artifacts["analysis"]
+        report = artifacts["report"]
+        jobs = get_job_queue()
+        
+        # Saving to Reports/ happens off the critical path
+        if AppConfig().REPORT_AUTO_PERSIST and st.session_state.report_persist_job_id is None:
+            st.session_state.report_persist_job_id = submit_persist_job(report)
         
         st.markdown("""
             <div class="success-box">
-                <h3>🎉 Reports Generated Successfully!</h3>
-                <p>Your comprehensive assessment report has been created and saved.</p>
+                <h3>🎉 Assessment Report Ready!</h3>
+                <p>Your comprehensive assessment report has been created.</p>
             </div>
         """, unsafe_allow_html=True)
         
+        # Structured scoring fields stored alongside the analysis
+        scoring = artifacts.get("scoring") or {}
+        score_col, depth_col, rec_col = st.columns(3)
+        score_col.metric("Score", f"{scoring['score']:g}/10" if scoring.get("score") is not None else "—")
+        depth_col.metric("Knowledge Depth", (scoring.get("depth_level") or "—").title())
+        rec_col.metric("Recommendation", scoring.get("recommendation") or "—")
+        
         # Display analysis
         with st.expander("📊 View Candidate Analysis", expanded=True):
             st.markdown(analysis)
         
-        # Download buttons
+        # Download buttons; the PDF is only rendered once someone asks for it
         col1, col2 = st.columns(2)
         
         with col1:
-            with open(pdf_path, "rb") as pdf_file:
+            if report.has_pdf:
                 st.download_button(
                     label="📥 Download PDF Report",
-                    data=pdf_file,
-                    file_name=pdf_path.split('/')[-1],
+                    data=report.pdf_bytes(),
+                    file_name=report.pdf_filename,
                     mime="application/pdf",
                     use_container_width=True
                 )
+            elif st.button("📄 Prepare PDF Report", use_container_width=True):
+                with st.spinner("Rendering PDF..."):
+                    report.pdf_bytes(use_process_pool=True)
+                st.rerun()
         
         with col2:
-            with open(json_path, "rb") as json_file:
-                st.download_button(
-                    label="📥 Download JSON Report",
-                    data=json_file,
-                    file_name=json_path.split('/')[-1],
-                    mime="application/json",
-                    use_container_width=True
-                )
+            st.download_button(
+                label="📥 Download JSON Report",
+                data=report.json_bytes(),
+                file_name=report.json_filename,
+                mime="application/json",
+                use_container_width=True
+            )
         
-        st.info(f"📁 Reports saved to: `{pdf_path}` and `{json_path}`")
+        persist_job_id = st.session_state.report_persist_job_id
+        if report.persisted:
+            st.info(f"📁 Reports saved to: `{report.pdf_path}` and `{report.json_path}`")
+        elif persist_job_id is not None and jobs.status(persist_job_id) == JOB_FAILED:
+            try:
+                jobs.result(persist_job_id)
+            except Exception as e:
+                st.warning(f"⚠️ Could not save reports to disk: {str(e)}")
+        elif persist_job_id is not None:
+            st.caption("💾 Saving reports in the background...")
         
         # New candidate button
         st.markdown("---")
@@ -379,7 +415,7 @@ Start your response directly.
         
         # Show conversation summary
         with st.expander("💬 View Full Conversation"):
-            for message in st.session_state.messages:
+            for message in interview.messages:
                 with st.chat_message(message["role"]):
                     st.markdown(message["content"])
 
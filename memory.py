@@ -0,0 +1,212 @@
+# ============================================================================
+# File: memory.py
+"""Bounded conversation memory with a rolling summary."""
+
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from config import AppConfig
+
+
+def _speaker(message: BaseMessage) -> str:
+    """Transcript label for a message; chunk classes subclass the full ones."""
+    if isinstance(message, HumanMessage):
+        return "Candidate"
+    if isinstance(message, AIMessage):
+        return "Assistant"
+    return message.type.title()
+
+
+class RollingSummaryHistory(BaseChatMessageHistory):
+    """
+    Chat history that is sent verbatim until it outgrows a token budget,
+    then folds older turns into a running summary.
+
+    Nothing is pinned or summarized while the verbatim turns fit in
+    ``token_budget``, so short conversations cost exactly what an unbounded
+    history would. Past the budget, turns are evicted in one batch down to
+    the last ``recent_turns`` (or half the budget), so the summarizer runs
+    once per batch rather than once per turn, and it runs on the job queue
+    instead of inside the reply. Evicted turns stay in the prompt verbatim
+    until their summary lands.
+
+    Once anything has been evicted, the collected candidate fields are
+    pinned into every prompt so they never depend on the summary.
+    """
+
+    def __init__(self, summarizer=None, recent_turns: Optional[int] = None,
+                 token_budget: Optional[int] = None, background: bool = True):
+        config = AppConfig()
+        self.summarizer = summarizer
+        self.recent_turns = recent_turns or config.MEMORY_RECENT_TURNS
+        self.token_budget = token_budget or config.MEMORY_TOKEN_BUDGET
+        # Summarize on the job queue (False: inline, e.g. for benchmarks)
+        self.background = background
+        self.recent: List[BaseMessage] = []
+        self.summary = ""
+        # Evicted turns whose summary has not landed yet
+        self.pending: List[BaseMessage] = []
+        self.pinned_info: Dict = {}
+        # Question bank picks for Phase 2, pinned like the candidate fields
+        self.pinned_questions: List[str] = []
+        # LangChain callback handlers for summarizer calls (e.g. LLMTelemetry)
+        self.callbacks: Optional[list] = None
+        # Tokens the full transcript would cost, for before/after comparison
+        self.transcript_tokens = 0
+        # Summarizer LLM calls and their estimated input + output tokens
+        self.summary_calls = 0
+        self.summary_tokens = 0
+        self._lock = threading.Lock()
+        self._summary_job: Optional[str] = None
+        self._generation = 0
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        with self._lock:
+            context = self._context_block()
+            recent = list(self.recent)
+        prefix = [SystemMessage(content=context)] if context else []
+        return prefix + recent
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        from utils import estimate_tokens
+
+        with self._lock:
+            self.recent.extend(messages)
+            self.transcript_tokens += sum(estimate_tokens(str(m.content)) for m in messages)
+            evicted = self._evict()
+        if evicted:
+            self._schedule_summary()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.recent = []
+            self.pending = []
+            self.summary = ""
+            self.transcript_tokens = 0
+            # Drops the result of any summary still running
+            self._generation += 1
+
+    def wait_for_summary(self, timeout: Optional[float] = None):
+        """Block until a background summary in flight has landed."""
+        from job_queue import get_job_queue
+
+        job_id = self._summary_job
+        if job_id is not None:
+            try:
+                get_job_queue().result(job_id, timeout)
+            except KeyError:
+                pass
+
+    def _context_block(self) -> str:
+        from utils import format_candidate_info_natural
+
+        parts = []
+        if self.pinned_info and (self.summary or self.pending):
+            parts.append("Candidate information collected so far:\n" + format_candidate_info_natural(self.pinned_info))
+        if self.pinned_questions:
+            parts.append(
+                "Question bank for the technical assessment (ask in order, one at a time, "
+                "adapting the wording to the candidate):\n"
+                + "\n".join(f"{i}. {q}" for i, q in enumerate(self.pinned_questions, 1))
+            )
+        if self.summary:
+            parts.append("Summary of the earlier conversation:\n" + self.summary)
+        if self.pending:
+            parts.append("Earlier turns (being summarized):\n" + _transcript(self.pending))
+        return "\n\n".join(parts)
+
+    def _recent_tokens(self) -> int:
+        from utils import estimate_tokens
+
+        return sum(estimate_tokens(str(m.content)) for m in self.recent)
+
+    def _evict(self) -> bool:
+        """Move a batch of old turns to pending once over budget (caller holds the lock)."""
+        if self._recent_tokens() <= self.token_budget:
+            return False
+        # Evict whole turns (human + assistant) from the front
+        evicted = []
+        while len(self.recent) > 2 and (
+            len(self.recent) > 2 * self.recent_turns or self._recent_tokens() > self.token_budget // 2
+        ):
+            evicted.extend(self.recent[:2])
+            del self.recent[:2]
+        self.pending.extend(evicted)
+        return bool(evicted)
+
+    def _schedule_summary(self):
+        if self.summarizer is None or not self.background:
+            self._fold_pending()
+            return
+        from job_queue import get_job_queue
+
+        with self._lock:
+            if self._summary_job is not None:
+                # The running job picks up the new batch before it exits
+                return
+            self._summary_job = get_job_queue().submit(self._fold_pending)
+
+    def _fold_pending(self):
+        """Fold pending turns into the summary until none are left."""
+        while True:
+            with self._lock:
+                batch, previous, generation = list(self.pending), self.summary, self._generation
+                if not batch:
+                    self._summary_job = None
+                    return
+            summary = self._summarize(previous, batch)
+            with self._lock:
+                if generation == self._generation:
+                    self.summary = summary
+                    del self.pending[:len(batch)]
+
+    def _summarize(self, previous: str, evicted: List[BaseMessage]) -> str:
+        from utils import estimate_tokens
+
+        if self.summarizer is not None:
+            from prompts import get_memory_summary_prompt
+
+            prompt = get_memory_summary_prompt(previous, _transcript(evicted))
+            try:
+                from llm_handler import invoke_llm
+
+                response = invoke_llm(
+                    self.summarizer, [{"role": "user", "content": prompt}],
+                    "memory_summary", self.callbacks
+                )
+                summary = response.content.strip()
+                self.summary_calls += 1
+                self.summary_tokens += estimate_tokens(prompt) + estimate_tokens(summary)
+                return summary
+            except Exception:
+                pass
+
+        # Extractive fallback: clipped turns, oldest dropped past the budget
+        lines = (previous.splitlines() if previous else []) + _transcript(evicted, clip=200).splitlines()
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.token_budget // 2:
+            lines.pop(0)
+        return "\n".join(lines)
+
+
+def _transcript(messages: List[BaseMessage], clip: Optional[int] = None) -> str:
+    return "\n".join(f"{_speaker(m)}: {str(m.content)[:clip]}" for m in messages)
+
+
+def prompt_token_usage(history: BaseChatMessageHistory, user_input: str) -> Dict[str, int]:
+    """
+    Estimate input tokens for the next chain call.
+
+    :return: Dict with ``sent`` (system prompt + bounded history + input) and,
+             for RollingSummaryHistory, ``full_transcript`` (what an unbounded
+             history would have sent)
+    """
+    from prompts import get_system_prompt
+    from utils import estimate_tokens
+
+    fixed = estimate_tokens(get_system_prompt()) + estimate_tokens(user_input)
+    sent = fixed + sum(estimate_tokens(str(m.content)) for m in history.messages)
+    full = fixed + history.transcript_tokens if isinstance(history, RollingSummaryHistory) else sent
+    return {"sent": sent, "full_transcript": full}
@@ -36,14 +36,15 @@ PHASE 1 — Information Gathering:
 PHASE 2 — Technical Assessment:
 - Once you have ALL required information, acknowledge completion professionally
 - Example: "Thank you for providing your information. Now, I'd like to assess your technical skills with a few questions."
-- Generate exactly 5 technical questions based on their tech stack
+- If a question bank is provided in the context, ask those questions in order, lightly adapted to the candidate; write your own only if the bank has fewer than 5
+- Otherwise generate exactly 5 technical questions based on their tech stack
 - Questions should be:
   * Practical and scenario-based
   * Directly related to technologies they mentioned
   * Appropriate for their experience level
   * Testing understanding, not just definitions
 - Ask questions ONE AT A TIME
-- After each answer, acknowledge it briefly before asking the next question
+- After each answer, acknowledge it in one short sentence before asking the next question
 - After all 5 questions, say: "That completes our technical assessment. Thank you for your time! I'm now generating your detailed report."
 
 IMPORTANT RULES:
@@ -63,6 +64,38 @@ NEVER:
 """
 
 
+def get_chat_greeting() -> str:
+    """Returns the opening message for chat mode."""
+    return "Hello! I'm TalentScout, your AI hiring assistant. I'll help you through our initial screening process by collecting some basic information and assessing your technical skills. Let's get started!\n\nWhat's your full name?"
+
+
+def get_resume_greeting(info_natural: str) -> str:
+    """Returns the opening message after a resume has been processed."""
+    return f"""Hello! I'm TalentScout, your AI hiring assistant. I've analyzed your resume and extracted the following information:
+
+{info_natural}
+
+Let me verify if I have everything I need, and I'll ask for any missing details."""
+
+
+def get_resume_verification_prompt(info_natural: str) -> str:
+    """Generate the first chain input in resume mode, asking the LLM to review extracted fields."""
+    return f"""
+I have extracted the following information from the candidate's resume:
+
+{info_natural}
+
+Please review this information and:
+1. Check if ALL 7 required fields are present (Full Name, Email, Phone Number, Years of Experience, Desired Position(s), Current Location, Tech Stack)
+2. If anything is missing or unclear, ask for it naturally and professionally
+3. If everything is complete, acknowledge it professionally and move to technical questions
+4. DO NOT show the information as JSON or dictionary format
+5. Be conversational and natural
+
+Start your response directly.
+"""
+
+
 def get_extraction_prompt(resume_text: str) -> str:
     """Generate prompt for resume information extraction."""
     return f"""
@@ -108,6 +141,12 @@ Provide a comprehensive analysis covering:
 7. Suggested Next Steps
 
 Be specific, fair, and constructive in your assessment.
+
+After the assessment, end with a fenced ```json block holding the same
+conclusions as structured fields, and nothing after it:
+{{"score": <0-10>, "depth_level": "beginner|intermediate|advanced|expert",
+  "recommendation": "Strong Hire|Hire|Maybe|No Hire",
+  "strengths": ["..."], "weaknesses": ["..."]}}
 """
 
 
@@ -131,3 +170,41 @@ def format_info_for_analysis(info: Dict) -> str:
 
 
 
+
+
+def get_memory_summary_prompt(summary: str, transcript: str) -> str:
+    """Generate prompt for folding older conversation turns into the running summary."""
+    return f"""
+Update the running summary of a candidate screening conversation.
+
+Current summary:
+{summary or "(none yet)"}
+
+Older turns to fold in:
+{transcript}
+
+Write a concise updated summary (under 150 words) that keeps:
+- Every candidate detail collected so far (name, contact, experience, roles, location, tech stack)
+- Which technical questions have been asked, numbered, with a one-line gist of each answer
+- Anything the candidate asked to be clarified or said they could not answer
+
+Return ONLY the summary text.
+"""
+
+
+def get_question_bank_prompt(technology: str, level: str, count: int, existing: list) -> str:
+    """Generate prompt for the offline question bank build."""
+    existing_text = "\n".join(f"- {q}" for q in existing) or "(none)"
+    return f"""
+Write {count} technical screening questions about {technology} for a {level}-level candidate.
+
+Each question must:
+- Be practical and scenario-based, testing understanding rather than definitions
+- Be answerable verbally in two or three minutes
+- Be a single question ending with a question mark, under 300 characters
+- Not repeat or closely paraphrase these existing questions:
+{existing_text}
+
+Return ONLY valid JSON in this format:
+{{"questions": ["...", "..."]}}
+"""
@@ -0,0 +1,231 @@
+# ============================================================================
+# File: question_bank.py
+"""Precomputed technical question bank indexed by technology and level.
+
+Usage:
+    python question_bank.py lookup "Python, Django, Redis" --years 6
+    python question_bank.py build --technologies "go, rust" [--per-level 3] [--api-key KEY]
+
+Phase 2 questions are picked from the bank for the candidate's stack and
+experience level and pinned into the chat context, so the model only adapts
+a vetted question instead of writing one each turn. ``build`` generates and
+vets new questions offline and merges them into the bank file.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from config import AppConfig
+from utils import tech_stack_items
+
+
+LEVELS = ["junior", "mid", "senior"]
+
+
+def experience_level(years: Any) -> str:
+    """Map years of experience (number or free text) to junior, mid or senior."""
+    match = re.search(r"\d+(?:\.\d+)?", str(years if years is not None else ""))
+    if match is None:
+        return "mid"
+    value = float(match.group())
+    if value < 2:
+        return "junior"
+    if value < 5:
+        return "mid"
+    return "senior"
+
+
+class QuestionBank:
+    """
+    Questions per technology and level with an alias index.
+
+    All known names and aliases are compiled into one regex (longest
+    first), so matching a stack is a single scan of its text.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.questions: Dict[str, Dict[str, List[str]]] = data.get("technologies", {})
+        self._names: Dict[str, str] = {}
+        for tech in self.questions:
+            self._names[tech.lower()] = tech
+        for tech, aliases in data.get("aliases", {}).items():
+            if tech in self.questions:
+                for alias in aliases:
+                    self._names.setdefault(alias.lower(), tech)
+
+        names = sorted(self._names, key=len, reverse=True)
+        self._pattern = re.compile(
+            r"(?<![\w.+#])(" + "|".join(re.escape(n) for n in names) + r")(?![\w+#])"
+        ) if names else None
+
+    def match_technologies(self, tech_stack: Any) -> List[str]:
+        """Known technologies in the stack, in the order the candidate listed them."""
+        if self._pattern is None:
+            return []
+        found = []
+        for match in self._pattern.finditer(", ".join(tech_stack_items(tech_stack)).lower()):
+            tech = self._names[match.group(1)]
+            if tech not in found:
+                found.append(tech)
+        return found
+
+    def select(self, tech_stack: Any, years: Any, count: int) -> List[Dict[str, str]]:
+        """
+        Pick count questions, round-robin across the candidate's technologies.
+
+        Questions at the candidate's level come first, then the nearest
+        other levels. The result is deterministic for a given stack and level.
+        """
+        level = experience_level(years)
+        order = sorted(LEVELS, key=lambda lvl: abs(LEVELS.index(lvl) - LEVELS.index(level)))
+        pools = []
+        for tech in self.match_technologies(tech_stack):
+            pool = [(tech, lvl, q) for lvl in order for q in self.questions[tech].get(lvl, [])]
+            if pool:
+                pools.append(pool)
+
+        selected = []
+        while pools and len(selected) < count:
+            for pool in list(pools):
+                tech, lvl, question = pool.pop(0)
+                selected.append({"technology": tech, "level": lvl, "question": question})
+                if not pool:
+                    pools.remove(pool)
+                if len(selected) == count:
+                    break
+        return selected
+
+
+def load_question_bank(path: str) -> Dict[str, Any]:
+    """Read a bank file; a missing file is an empty bank."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"version": 1, "aliases": {}, "technologies": {}}
+
+
+@lru_cache(maxsize=1)
+def get_question_bank() -> QuestionBank:
+    """Load and index the configured bank once per process."""
+    return QuestionBank(load_question_bank(AppConfig().QUESTION_BANK_PATH))
+
+
+def select_questions(tech_stack: Any, years: Any, count: Optional[int] = None) -> List[Dict[str, str]]:
+    """
+    Pick bank questions for a candidate.
+
+    :param tech_stack: Tech stack as text, a list or a dict of lists
+    :param years: Years of experience (number or free text)
+    :param count: Number of questions (default AppConfig.QUESTION_BANK_QUESTIONS)
+    :return: List of dicts with ``technology``, ``level`` and ``question``
+    """
+    count = count or AppConfig().QUESTION_BANK_QUESTIONS
+    return get_question_bank().select(tech_stack, years, count)
+
+
+# ----------------------------------------------------------------------
+# Offline build
+# ----------------------------------------------------------------------
+
+def vet_questions(candidates: List[Any], existing: List[str], max_chars: int = 300) -> List[str]:
+    """Keep well-formed questions that are not near-duplicates of existing ones."""
+    def normalized(text: str) -> str:
+        return re.sub(r"[^a-z0-9 ]", "", text.lower()).strip()
+
+    seen = {normalized(q) for q in existing}
+    vetted = []
+    for question in candidates:
+        if not isinstance(question, str):
+            continue
+        question = " ".join(question.split())
+        if not 30 <= len(question) <= max_chars or not question.endswith("?"):
+            continue
+        key = normalized(question)
+        if key in seen:
+            continue
+        seen.add(key)
+        vetted.append(question)
+    return vetted
+
+
+def build_questions(llm, technology: str, level: str, count: int, existing: List[str]) -> List[str]:
+    """Generate and vet count new questions for one technology and level."""
+    from llm_handler import invoke_llm
+    from prompts import get_question_bank_prompt
+    from utils import parse_json_from_response
+
+    response = invoke_llm(
+        llm, [{"role": "user", "content": get_question_bank_prompt(technology, level, count, existing)}],
+        "question_bank"
+    )
+    parsed = parse_json_from_response(response.content)
+    candidates = parsed.get("questions", []) if isinstance(parsed, dict) else []
+    return vet_questions(candidates, existing)[:count]
+
+
+def save_question_bank(data: Dict[str, Any], path: str):
+    """Atomically write the bank file."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def main():
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="Build or query the technical question bank.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    lookup = sub.add_parser("lookup", help="Show the questions a candidate would get")
+    lookup.add_argument("tech_stack")
+    lookup.add_argument("--years", default="3")
+    lookup.add_argument("--count", type=int, default=config.QUESTION_BANK_QUESTIONS)
+
+    build = sub.add_parser("build", help="Generate questions with the LLM and merge them into the bank")
+    build.add_argument("--technologies", required=True, help="Comma-separated technology names")
+    build.add_argument("--per-level", type=int, default=3)
+    build.add_argument("--api-key", default=os.environ.get("GROQ_API_KEY"))
+    build.add_argument("--bank", default=config.QUESTION_BANK_PATH)
+
+    args = parser.parse_args()
+
+    if args.command == "lookup":
+        bank = get_question_bank()
+        print(f"matched: {', '.join(bank.match_technologies(args.tech_stack)) or '-'} "
+              f"(level {experience_level(args.years)})")
+        for i, item in enumerate(bank.select(args.tech_stack, args.years, args.count), 1):
+            print(f"{i}. [{item['technology']}/{item['level']}] {item['question']}")
+        return
+
+    from llm_handler import initialize_llm
+
+    if not args.api_key and not config.FAKE_LLM:
+        parser.error("a Groq API key is required (--api-key or GROQ_API_KEY)")
+
+    llm = initialize_llm(args.api_key or "")
+    data = load_question_bank(args.bank)
+    data["generated_by"] = config.MODEL_NAME
+    for technology in [t.strip().lower() for t in args.technologies.split(",") if t.strip()]:
+        levels = data["technologies"].setdefault(technology, {})
+        for level in LEVELS:
+            existing = levels.setdefault(level, [])
+            added = build_questions(llm, technology, level, args.per_level, existing)
+            existing.extend(added)
+            print(f"{technology}/{level}: +{len(added)} ({len(existing)} total)", file=sys.stderr)
+        # Save after each technology so an interrupted build keeps its progress
+        save_question_bank(data, args.bank)
+
+
+if __name__ == "__main__":
+    main()
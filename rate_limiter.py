@@ -0,0 +1,305 @@
+# ============================================================================
+# File: rate_limiter.py
+"""Process-wide LLM rate limiter with priority classes.
+
+Every LLM call reserves one request and an estimated number of tokens from
+two token buckets (requests/minute and tokens/minute) before it is sent.
+Callers queue by priority (live chat turns, then resume extraction, then
+end-of-interview analysis) so a burst of background work cannot starve
+candidates waiting on a reply. Once a call finishes, the reservation is
+settled against the actual token usage.
+"""
+
+import asyncio
+import heapq
+import itertools
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, List, Optional
+
+from config import AppConfig
+from tracing import span
+
+
+PRIORITY_CHAT = 0
+PRIORITY_EXTRACTION = 1
+PRIORITY_ANALYSIS = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_CHAT: "chat",
+    PRIORITY_EXTRACTION: "extraction",
+    PRIORITY_ANALYSIS: "analysis"
+}
+
+# Call stage tag -> priority class. Memory summaries run inside a chat turn.
+STAGE_PRIORITIES = {
+    "chat": PRIORITY_CHAT,
+    "memory_summary": PRIORITY_CHAT,
+    "resume_extraction": PRIORITY_EXTRACTION,
+    "analysis": PRIORITY_ANALYSIS
+}
+
+
+class TokenBucket:
+    """Continuously refilling bucket; capacity is one minute of budget."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until amount can be taken (0 if available now)."""
+        if not self.enabled:
+            return 0.0
+        # Oversized requests wait for a full bucket rather than forever
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def take(self, amount: float):
+        if self.enabled:
+            self.level -= amount
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "tokens", "loop", "event", "throttled")
+
+    def __init__(self, priority: int, seq: int, tokens: int, loop: Optional[asyncio.AbstractEventLoop]):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.loop = loop
+        self.event = asyncio.Event() if loop is not None else threading.Event()
+        self.throttled = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def wake(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.event.set)
+        else:
+            self.event.set()
+
+
+class Reservation:
+    """Capacity granted to one LLM call."""
+
+    def __init__(self, limiter: "RateLimiter", tokens: int, waited: float):
+        self._limiter = limiter
+        self.tokens = tokens
+        self.waited = waited
+
+    def settle(self, actual_tokens: Optional[int]):
+        """Correct the token bucket once the call's real usage is known."""
+        if actual_tokens is not None:
+            self._limiter._adjust_tokens(actual_tokens - self.tokens)
+            self.tokens = actual_tokens
+
+
+class RateLimiter:
+    """
+    Requests/minute and tokens/minute limits shared by sync and async callers.
+
+    Waiters form one priority queue (FIFO within a class). Only the head of
+    the queue waits on the buckets; everyone else waits to become head.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, wait_history: int = 1000):
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._waits = {priority: deque(maxlen=wait_history) for priority in PRIORITY_NAMES}
+        self._admitted = {priority: 0 for priority in PRIORITY_NAMES}
+        self._throttled = {priority: 0 for priority in PRIORITY_NAMES}
+
+    @property
+    def enabled(self) -> bool:
+        return self._requests.enabled or self._tokens.enabled
+
+    # ------------------------------------------------------------------
+    # Acquire
+    # ------------------------------------------------------------------
+
+    def acquire(self, priority: int, tokens: int) -> Reservation:
+        """Block the calling thread until the call may be sent."""
+        start = time.perf_counter()
+        if not self.enabled:
+            return self._admit(priority, tokens, start)
+
+        waiter = self._enqueue(priority, tokens, None)
+        try:
+            while True:
+                waiter.event.clear()
+                delay = self._try_admit(waiter)
+                if delay is None:
+                    return self._admit(priority, tokens, start, waiter.throttled)
+                waiter.event.wait(delay)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    async def aacquire(self, priority: int, tokens: int) -> Reservation:
+        """Wait on the event loop until the call may be sent."""
+        start = time.perf_counter()
+        if not self.enabled:
+            return self._admit(priority, tokens, start)
+
+        waiter = self._enqueue(priority, tokens, asyncio.get_running_loop())
+        try:
+            while True:
+                waiter.event.clear()
+                delay = self._try_admit(waiter)
+                if delay is None:
+                    return self._admit(priority, tokens, start, waiter.throttled)
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    @contextmanager
+    def reserve(self, stage: str, tokens: int):
+        """
+        Hold a reservation for the duration of a sync LLM call.
+
+        :param stage: Call stage tag ("chat", "resume_extraction", ...)
+        :param tokens: Estimated input + output tokens
+        """
+        with span("llm.rate_limit", stage=stage) as wait_span:
+            reservation = self.acquire(STAGE_PRIORITIES.get(stage, PRIORITY_ANALYSIS), tokens)
+            wait_span.set(waited=reservation.waited)
+        yield reservation
+
+    @asynccontextmanager
+    async def areserve(self, stage: str, tokens: int):
+        """Async reserve() for the asyncio server."""
+        with span("llm.rate_limit", stage=stage) as wait_span:
+            reservation = await self.aacquire(STAGE_PRIORITIES.get(stage, PRIORITY_ANALYSIS), tokens)
+            wait_span.set(waited=reservation.waited)
+        yield reservation
+
+    def _enqueue(self, priority: int, tokens: int, loop) -> _Waiter:
+        with self._lock:
+            waiter = _Waiter(priority, next(self._seq), tokens, loop)
+            heapq.heappush(self._queue, waiter)
+            return waiter
+
+    def _try_admit(self, waiter: _Waiter) -> Optional[float]:
+        """Take capacity if waiter is at the head; else return how long to wait."""
+        with self._lock:
+            if self._queue[0] is not waiter:
+                # Woken when it becomes head; the timeout guards lost wakeups
+                waiter.throttled = True
+                return 1.0
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            delay = max(self._requests.delay(1), self._tokens.delay(waiter.tokens))
+            if delay > 0:
+                waiter.throttled = True
+                return delay
+            self._requests.take(1)
+            self._tokens.take(min(waiter.tokens, self._tokens.capacity))
+            heapq.heappop(self._queue)
+            if self._queue:
+                self._queue[0].wake()
+            return None
+
+    def _abandon(self, waiter: _Waiter):
+        with self._lock:
+            if waiter in self._queue:
+                was_head = self._queue[0] is waiter
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+                if was_head and self._queue:
+                    self._queue[0].wake()
+
+    def _admit(self, priority: int, tokens: int, start: float, throttled: bool = False) -> Reservation:
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._waits[priority].append(waited)
+            self._admitted[priority] += 1
+            self._throttled[priority] += throttled
+        return Reservation(self, tokens, waited)
+
+    def _adjust_tokens(self, delta: int):
+        with self._lock:
+            self._tokens.take(delta)
+            # Returned tokens may let the head go now
+            if delta < 0 and self._queue:
+                self._queue[0].wake()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait times per priority class."""
+        with self._lock:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for waiter in self._queue:
+                depth[PRIORITY_NAMES[waiter.priority]] += 1
+
+            classes = {}
+            for priority, name in PRIORITY_NAMES.items():
+                waits = sorted(self._waits[priority])
+                classes[name] = {
+                    "admitted": self._admitted[priority],
+                    "throttled": self._throttled[priority],
+                    "wait_mean": statistics.mean(waits) if waits else 0.0,
+                    "wait_p95": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                    "wait_max": waits[-1] if waits else 0.0
+                }
+
+            return {
+                "queue_depth": sum(depth.values()),
+                "queue_depth_by_class": depth,
+                "requests_available": self._requests.level if self._requests.enabled else None,
+                "tokens_available": self._tokens.level if self._tokens.enabled else None,
+                "classes": classes
+            }
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter, creating it on first use."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            config = AppConfig()
+            _limiter = RateLimiter(config.LLM_REQUESTS_PER_MINUTE, config.LLM_TOKENS_PER_MINUTE)
+        return _limiter
+
+
+def estimate_call_tokens(prompt_tokens: int) -> int:
+    """Tokens to reserve for a call: prompt plus expected completion."""
+    return prompt_tokens + AppConfig().LLM_EXPECTED_OUTPUT_TOKENS
+
+
+def usage_tokens(message: Any) -> Optional[int]:
+    """Total tokens reported on an AIMessage/AIMessageChunk, if any."""
+    usage = getattr(message, "usage_metadata", None)
+    return usage.get("total_tokens") if usage else None
@@ -0,0 +1,94 @@
+# ============================================================================
+# File: regenerate_pdfs.py
+"""Rebuild PDF reports from the stored JSON reports.
+
+Usage:
+    python regenerate_pdfs.py [--reports-dir Reports] [--workers N] [--force]
+
+Run after changing the layout or branding in report_generator (and bumping
+PDF_LAYOUT_VERSION). PDFs that are newer than their JSON and already carry
+the current layout marker are skipped unless --force is given.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from config import AppConfig
+
+
+def _warm_worker():
+    """Build the shared report styles once per worker process."""
+    from report_generator import get_report_styles
+    get_report_styles()
+
+
+def find_stale_reports(store, force: bool = False) -> Tuple[List[str], int]:
+    """
+    List the report IDs whose PDF needs rebuilding.
+
+    :return: Tuple of (report IDs to rebuild, number of current PDFs skipped)
+    """
+    from report_generator import is_pdf_current
+
+    todo, skipped = [], 0
+    for report_id, _ in store.iter_json_keys():
+        if not force and is_pdf_current(store, report_id):
+            skipped += 1
+        else:
+            todo.append(report_id)
+    return todo, skipped
+
+
+def regenerate(reports_dir: Optional[str], workers: int, force: bool = False) -> Dict:
+    """
+    Rebuild stale PDFs in the report store on a process pool.
+
+    :param reports_dir: Store root (default AppConfig.REPORTS_FOLDER)
+    :return: Throughput statistics
+    """
+    from report_generator import rebuild_pdf_from_json
+    from report_store import get_report_store
+
+    store = get_report_store(reports_dir)
+    todo, skipped = find_stale_reports(store, force)
+    stats = {"total": len(todo) + skipped, "rebuilt": 0, "skipped": skipped, "failed": 0}
+    start = time.perf_counter()
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+            futures = {pool.submit(rebuild_pdf_from_json, store, report_id): report_id for report_id in todo}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    future.result()
+                    stats["rebuilt"] += 1
+                except Exception as e:
+                    stats["failed"] += 1
+                    print(f"❌ {name}: {e}", file=sys.stderr)
+                    continue
+                print(f"[{stats['rebuilt'] + stats['failed']}/{len(todo)}] {name}", file=sys.stderr)
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    stats["elapsed_seconds"] = round(elapsed, 2)
+    stats["pdfs_per_second"] = round(stats["rebuilt"] / elapsed, 2)
+    return stats
+
+
+def main():
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="Rebuild PDF reports from stored JSON reports.")
+    parser.add_argument("--reports-dir", default=config.REPORTS_FOLDER)
+    parser.add_argument("--workers", type=int, default=config.PDF_REGEN_WORKERS)
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the PDF is current")
+    args = parser.parse_args()
+
+    stats = regenerate(args.reports_dir, args.workers, args.force)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# ============================================================================
+# File: report_fields.py
+"""Flattened summary fields of a JSON report.
+
+One row per report with list and dict values joined into strings, shared by
+the CSV/JSONL export (export_reports.py) and the search index
+(report_index.py) so both see the same values.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from utils import tech_stack_items
+
+
+SUMMARY_FIELDS = [
+    "report_id", "generated_at", "full_name", "email", "phone_number",
+    "years_of_experience", "desired_positions", "current_location",
+    "tech_stack", "tech_count", "total_questions", "answered_questions",
+    "score", "depth_level", "recommendation", "strengths", "weaknesses", "duration_seconds"
+]
+
+
+def _join(value: Any) -> str:
+    """Flatten list/dict field values into one '; '-separated string."""
+    if isinstance(value, dict):
+        return "; ".join(_join(v) for v in value.values() if v)
+    if isinstance(value, (list, tuple)):
+        return "; ".join(_join(v) for v in value if v)
+    return "" if value is None else str(value)
+
+
+def _duration_seconds(report_data: Dict[str, Any]) -> Optional[float]:
+    """Seconds from the session's first LLM call to report generation, if telemetry was recorded."""
+    metadata = report_data.get("report_metadata") or {}
+    calls = (metadata.get("llm_telemetry") or {}).get("calls") or []
+    starts = [call["started_at"] for call in calls if isinstance(call.get("started_at"), (int, float))]
+    if not starts or not metadata.get("generated_at"):
+        return None
+    try:
+        generated_at = datetime.fromisoformat(metadata["generated_at"]).timestamp()
+    except ValueError:
+        return None
+    return round(max(generated_at - min(starts), 0.0), 1)
+
+
+def flatten_report(report_id: str, report_data: Dict[str, Any]) -> Dict[str, Any]:
+    """One summary row for a JSON report."""
+    from scoring import report_scoring
+
+    info = report_data.get("candidate_information") or {}
+    assessment = report_data.get("technical_assessment") or {}
+    qa_pairs = assessment.get("qa_pairs") or []
+    tech = tech_stack_items(info.get("tech_stack"))
+    scoring = report_scoring(report_data)
+
+    return {
+        "report_id": report_id,
+        "generated_at": (report_data.get("report_metadata") or {}).get("generated_at", ""),
+        "full_name": _join(info.get("full_name")),
+        "email": _join(info.get("email")),
+        "phone_number": _join(info.get("phone_number")),
+        "years_of_experience": _join(info.get("years_of_experience")),
+        "desired_positions": _join(info.get("desired_positions")),
+        "current_location": _join(info.get("current_location")),
+        "tech_stack": "; ".join(tech),
+        "tech_count": len(tech),
+        "total_questions": assessment.get("total_questions", len(qa_pairs)),
+        "answered_questions": sum(1 for qa in qa_pairs if str(qa.get("answer", "")).strip()),
+        "score": scoring["score"],
+        "depth_level": scoring["depth_level"] or "",
+        "recommendation": scoring["recommendation"] or "",
+        "strengths": _join(scoring["strengths"]),
+        "weaknesses": _join(scoring["weaknesses"]),
+        "duration_seconds": _duration_seconds(report_data)
+    }
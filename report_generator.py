@@ -1,11 +1,20 @@
 # ============================================================================
 # File: report_generator.py
-"""PDF and JSON report generation."""
+"""PDF and JSON report generation.
 
-import os
+Reports render into memory; writing them to the report store is a
+separate step (Report.persist), and the PDF is only built when someone
+asks for it.
+"""
+
+import io
 import json
+import os
+import re
+import threading
 from datetime import datetime
-from typing import Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -13,62 +22,100 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from config import AppConfig
+from tracing import span
+
+
+# Bump when the PDF layout or branding changes; regenerate_pdfs.py rebuilds
+# every PDF whose embedded marker differs.
+PDF_LAYOUT_VERSION = "2"
+PDF_LAYOUT_MARKER = f"TalentScout report layout {PDF_LAYOUT_VERSION}"
 
+# Bytes read from the end of a PDF to find its trailer, and from its Info object
+_PDF_TAIL_BYTES = 2048
+_PDF_INFO_BYTES = 4096
 
-def ensure_reports_folder():
-    """Create Reports folder if it doesn't exist."""
-    config = AppConfig()
-    if not os.path.exists(config.REPORTS_FOLDER):
-        os.makedirs(config.REPORTS_FOLDER)
+
+@lru_cache(maxsize=1)
+def get_report_styles() -> Dict[str, Any]:
+    """
+    Paragraph and table styles for the PDF report, built once per process.
+
+    getSampleStyleSheet() allocates a fresh stylesheet on every call, which
+    adds up when rebuilding many reports.
+    """
+    styles = getSampleStyleSheet()
+    return {
+        'Normal': styles['Normal'],
+        'CustomTitle': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#1E88E5'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        ),
+        'CustomHeading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#1E88E5'),
+            spaceBefore=12,
+            spaceAfter=12
+        ),
+        'Footer': ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=TA_CENTER
+        ),
+        'InfoTable': TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E3F2FD')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+        ])
+    }
 
 
-def generate_pdf_report(candidate_info: Dict, qa_pairs: List[Dict], analysis: str, filename: str):
+def render_pdf_report(candidate_info: Dict, qa_pairs: List[Dict], analysis: str,
+                      generated_at: Optional[datetime] = None) -> bytes:
     """
-    Generate PDF report for candidate assessment.
+    Render the PDF report for candidate assessment into memory.
+
+    :param generated_at: Timestamp printed in the report (default: now)
+    :return: PDF file contents
     """
-    ensure_reports_folder()
-    config = AppConfig()
-    filepath = os.path.join(config.REPORTS_FOLDER, filename)
+    buffer = io.BytesIO()
 
     # Create PDF
     doc = SimpleDocTemplate(
-        filepath,
+        buffer,
         pagesize=letter,
         rightMargin=72,
         leftMargin=72,
         topMargin=72,
-        bottomMargin=18
+        bottomMargin=18,
+        creator=PDF_LAYOUT_MARKER
     )
 
     elements = []
 
-    # Styles
-    styles = getSampleStyleSheet()
-
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1E88E5'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#1E88E5'),
-        spaceBefore=12,
-        spaceAfter=12
-    )
+    # Styles (built once per process)
+    styles = get_report_styles()
+    title_style = styles['CustomTitle']
+    heading_style = styles['CustomHeading']
 
     # Title
     elements.append(Paragraph("🎯 TalentScout Candidate Assessment Report", title_style))
     elements.append(Spacer(1, 0.3 * inch))
 
     # Metadata
-    report_date = datetime.now().strftime("%B %d, %Y at %I:%M %p")
+    report_date = (generated_at or datetime.now()).strftime("%B %d, %Y at %I:%M %p")
     elements.append(Paragraph(f"<b>Report Generated:</b> {report_date}", styles['Normal']))
     elements.append(Spacer(1, 0.3 * inch))
 
@@ -119,16 +166,7 @@ def generate_pdf_report(candidate_info: Dict, qa_pairs: List[Dict], analysis: st
 
     # Table creation
     info_table = Table(info_data, colWidths=[2 * inch, 4.5 * inch])
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E3F2FD')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-    ]))
+    info_table.setStyle(styles['InfoTable'])
 
     elements.append(info_table)
     elements.append(Spacer(1, 0.4 * inch))
@@ -159,68 +197,228 @@ def generate_pdf_report(candidate_info: Dict, qa_pairs: List[Dict], analysis: st
 
     elements.append(Spacer(1, 0.5 * inch))
 
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.grey,
-        alignment=TA_CENTER
-    )
-    elements.append(Paragraph("Generated by TalentScout AI Hiring Assistant", footer_style))
+    elements.append(Paragraph("Generated by TalentScout AI Hiring Assistant", styles['Footer']))
 
-    doc.build(elements)
+    with span("pdf.build", flowables=len(elements)):
+        doc.build(elements)
 
-    return filepath
+    return buffer.getvalue()
 
-def generate_json_report(candidate_info: Dict, qa_pairs: List[Dict], analysis: str, filename: str):
+
+def build_report_data(candidate_info: Dict, qa_pairs: List[Dict], analysis: str,
+                      llm_telemetry: Optional[Dict] = None,
+                      generated_at: Optional[datetime] = None,
+                      scoring: Optional[Dict] = None) -> Dict:
     """
-    Generate JSON report for candidate assessment.
+    Assemble the JSON report document.
     
     :param candidate_info: Dictionary containing candidate information
     :param qa_pairs: List of question-answer pairs
     :param analysis: AI-generated analysis text
-    :param filename: Output filename
+    :param llm_telemetry: Session LLM usage rollup (LLMTelemetry.summary())
+    :param generated_at: Report timestamp (default: now)
+    :param scoring: Structured scoring fields (scoring.split_analysis); derived
+                    from the analysis text if not given
     """
-    ensure_reports_folder()
-    config = AppConfig()
-    filepath = os.path.join(config.REPORTS_FOLDER, filename)
-    
-    report_data = {
+    if scoring is None:
+        from scoring import extract_scoring_from_text
+        scoring = extract_scoring_from_text(analysis or "")
+    return {
         "report_metadata": {
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": (generated_at or datetime.now()).isoformat(),
             "report_type": "Technical Screening Assessment",
-            "generated_by": "TalentScout AI"
+            "generated_by": "TalentScout AI",
+            "llm_telemetry": llm_telemetry
         },
         "candidate_information": candidate_info,
         "technical_assessment": {
             "total_questions": len(qa_pairs),
             "qa_pairs": qa_pairs
         },
+        "scoring": scoring,
         "ai_analysis": analysis
     }
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(report_data, f, indent=2, ensure_ascii=False)
-    
-    return filepath
 
 
-def generate_reports(candidate_info: Dict, qa_pairs: List[Dict], analysis: str) -> tuple:
+def render_json_report(report_data: Dict) -> bytes:
+    """Serialize a report document to UTF-8 JSON."""
+    with span("json.dump"):
+        return json.dumps(report_data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+class Report:
+    """
+    One candidate's assessment report, rendered on demand.
+
+    The JSON document is cheap and built on first access; the PDF is only
+    rendered when downloaded or persisted. Both are cached, so repeated
+    downloads (and Streamlit reruns) reuse the same bytes.
+    """
+
+    def __init__(self, candidate_info: Dict, qa_pairs: List[Dict], analysis: str,
+                 llm_telemetry: Optional[Dict] = None, scoring: Optional[Dict] = None):
+        from report_store import new_report_id
+
+        self.candidate_info = candidate_info
+        self.qa_pairs = qa_pairs
+        self.analysis = analysis
+        self.llm_telemetry = llm_telemetry
+        self.scoring = scoring
+        self.generated_at = datetime.now()
+
+        self.report_id = new_report_id(candidate_info.get('full_name', 'Unknown_Candidate'), self.generated_at)
+        self.pdf_filename = f"{self.report_id}.pdf"
+        self.json_filename = f"{self.report_id}.json"
+
+        self.pdf_path: Optional[str] = None
+        self.json_path: Optional[str] = None
+        self._pdf: Optional[bytes] = None
+        self._json: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    @property
+    def data(self) -> Dict:
+        return build_report_data(self.candidate_info, self.qa_pairs, self.analysis,
+                                 self.llm_telemetry, self.generated_at, self.scoring)
+
+    @property
+    def has_pdf(self) -> bool:
+        return self._pdf is not None
+
+    @property
+    def persisted(self) -> bool:
+        return self.pdf_path is not None
+
+    def json_bytes(self) -> bytes:
+        if self._json is None:
+            self._json = render_json_report(self.data)
+        return self._json
+
+    def pdf_bytes(self, use_process_pool: bool = False) -> bytes:
+        """
+        Render the PDF once and cache it.
+
+        :param use_process_pool: Build on the shared job queue's process pool
+                                 so ReportLab does not hold this process's GIL
+        """
+        with self._lock:
+            if self._pdf is None:
+                args = (self.candidate_info, self.qa_pairs, self.analysis, self.generated_at)
+                if use_process_pool:
+                    from job_queue import get_job_queue
+                    self._pdf = get_job_queue().run_cpu_bound(render_pdf_report, *args)
+                else:
+                    self._pdf = render_pdf_report(*args)
+            return self._pdf
+
+    def persist(self, use_process_pool: bool = False) -> Tuple[str, str]:
+        """
+        Write both reports to the report store (once) and add them to the
+        report index.
+
+        :return: Tuple of (pdf_location, json_location)
+        """
+        from report_store import get_report_store
+
+        pdf_bytes = self.pdf_bytes(use_process_pool)
+        with self._lock:
+            if self.pdf_path is None:
+                store = get_report_store()
+                json_key, pdf_key = store.save(self.report_id, self.json_bytes(), pdf_bytes)
+                json_path, pdf_path = store.location(json_key), store.location(pdf_key)
+                self.json_path, self.pdf_path = json_path, pdf_path
+                if AppConfig().REPORT_INDEX_ENABLED:
+                    from report_index import get_report_index
+                    get_report_index().upsert(self.report_id, self.data, json_path, pdf_path)
+            return self.pdf_path, self.json_path
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_lock")
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def generate_reports(candidate_info: Dict, qa_pairs: List[Dict], analysis: str,
+                     llm_telemetry: Optional[Dict] = None, scoring: Optional[Dict] = None) -> tuple:
     """
     Generate both PDF and JSON reports.
     
+    :param llm_telemetry: Session LLM usage rollup stored in the JSON metadata
+    :param scoring: Structured scoring fields stored in the JSON report
     :return: Tuple of (pdf_filepath, json_filepath)
     """
-    from utils import generate_filename
-    
-    candidate_name = candidate_info.get('full_name', 'Unknown_Candidate')
-    
-    pdf_filename = generate_filename(candidate_name, 'pdf')
-    json_filename = generate_filename(candidate_name, 'json')
-    
-    pdf_path = generate_pdf_report(candidate_info, qa_pairs, analysis, pdf_filename)
-    json_path = generate_json_report(candidate_info, qa_pairs, analysis, json_filename)
-    
-    return pdf_path, json_path
+    return Report(candidate_info, qa_pairs, analysis, llm_telemetry, scoring).persist()
+
+
+def _read_pdf_info(f) -> Optional[bytes]:
+    """
+    Raw Info dictionary object of a PDF, reading only the trailer, one xref
+    entry and the object itself.
 
+    :param f: Seekable binary file
+    :return: The object's bytes, or None if the PDF has no classic xref table
+             (e.g. a cross-reference stream) or no Info entry
+    """
+    f.seek(0, os.SEEK_END)
+    f.seek(max(f.tell() - _PDF_TAIL_BYTES, 0))
+    tail = f.read()
+    info = re.findall(rb"/Info\s+(\d+)\s+\d+\s+R", tail)
+    startxref = re.findall(rb"startxref\s+(\d+)", tail)
+    if not info or not startxref:
+        return None
+    number = int(info[-1])
+
+    f.seek(int(startxref[-1]))
+    section = re.match(rb"xref\s+(\d+)\s+(\d+)[ \t]*(?:\r\n|\r|\n)", f.read(64))
+    if section is None or not int(section.group(1)) <= number < int(section.group(1)) + int(section.group(2)):
+        return None
+    # Classic xref entries are exactly 20 bytes: "oooooooooo ggggg n\r\n"
+    f.seek(int(startxref[-1]) + section.end() + 20 * (number - int(section.group(1))))
+    entry = f.read(20)
+    if entry[17:18] != b"n":
+        return None
+
+    f.seek(int(entry[:10]))
+    return f.read(_PDF_INFO_BYTES).split(b"endobj", 1)[0]
+
+
+def is_pdf_current(store, report_id: str) -> bool:
+    """True if the report's PDF is newer than its JSON and carries the current layout marker."""
+    json_key, pdf_key = store.json_key(report_id), store.pdf_key(report_id)
+    marker = PDF_LAYOUT_MARKER.encode("ascii")
+    try:
+        if store.backend.mtime(pdf_key) < store.backend.mtime(json_key):
+            return False
+        # The marker is the PDF creator, so only the Info dictionary is read
+        with store.backend.open(pdf_key) as f:
+            info = _read_pdf_info(f)
+        if info is None:
+            return marker in store.backend.get(pdf_key)
+        return marker in info
+    except (OSError, ValueError):
+        return False
+
+
+def rebuild_pdf_from_json(store, report_id: str) -> str:
+    """
+    Re-render a report's PDF from its stored JSON report.
 
+    :param store: ReportStore holding the report
+    :return: Location of the rewritten PDF
+    """
+    report_data = json.loads(store.read_json_bytes(store.json_key(report_id)))
+
+    generated_at = report_data.get("report_metadata", {}).get("generated_at")
+    pdf_bytes = render_pdf_report(
+        report_data.get("candidate_information") or {},
+        report_data.get("technical_assessment", {}).get("qa_pairs", []),
+        report_data.get("ai_analysis", ""),
+        datetime.fromisoformat(generated_at) if generated_at else None
+    )
+    pdf_key = store.pdf_key(report_id)
+    store.backend.put(pdf_key, pdf_bytes)
+    return store.location(pdf_key)
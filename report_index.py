@@ -0,0 +1,397 @@
+# ============================================================================
+# File: report_index.py
+"""SQLite index over generated reports for search and listing.
+
+Usage:
+    python report_index.py rebuild [--reports-dir Reports]
+    python report_index.py search [--text "kafka latency"] [--email E] [--name N]
+                                  [--skill python] [--since 2025-11-01] [--until ...]
+                                  [--min-score 7] [--recommendation Hire] [--order-by score]
+    python report_index.py stats
+
+Report.persist upserts one row per report (candidate fields, tech stack
+terms, question count, timestamps and file paths) and an FTS5 row over the
+name, positions, stack and analysis text, so listings and searches no longer
+open every JSON file. The index is derived data: ``rebuild`` recreates it
+from the reports on disk.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import AppConfig
+
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS reports ("
+    " id INTEGER PRIMARY KEY, report_id TEXT NOT NULL UNIQUE,"
+    " full_name TEXT COLLATE NOCASE, email TEXT COLLATE NOCASE, phone_number TEXT,"
+    " years_of_experience TEXT, desired_positions TEXT, current_location TEXT,"
+    " tech_stack TEXT, tech_count INTEGER, total_questions INTEGER, answered_questions INTEGER,"
+    " generated_at TEXT, indexed_at REAL NOT NULL, json_path TEXT, pdf_path TEXT,"
+    " score REAL, depth_level TEXT, recommendation TEXT, duration_seconds REAL)",
+    "CREATE INDEX IF NOT EXISTS reports_email ON reports (email)",
+    "CREATE INDEX IF NOT EXISTS reports_name ON reports (full_name)",
+    "CREATE INDEX IF NOT EXISTS reports_generated ON reports (generated_at)",
+    "CREATE TABLE IF NOT EXISTS report_terms ("
+    " term TEXT NOT NULL COLLATE NOCASE, id INTEGER NOT NULL, PRIMARY KEY (term, id)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS report_terms_id ON report_terms (id)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5("
+    " full_name, desired_positions, tech_stack, analysis, tokenize='unicode61')"
+]
+
+# Columns added after the first release of the index, with their indexes
+_ADDED_COLUMNS = {"score": "REAL", "depth_level": "TEXT", "recommendation": "TEXT", "duration_seconds": "REAL"}
+_ADDED_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS reports_score ON reports (score)",
+    "CREATE INDEX IF NOT EXISTS reports_recommendation ON reports (recommendation, score)",
+    "CREATE INDEX IF NOT EXISTS reports_indexed ON reports (indexed_at)"
+]
+
+_COLUMNS = [
+    "report_id", "full_name", "email", "phone_number", "years_of_experience",
+    "desired_positions", "current_location", "tech_stack", "tech_count",
+    "total_questions", "answered_questions", "generated_at", "json_path", "pdf_path",
+    "score", "depth_level", "recommendation", "duration_seconds"
+]
+
+
+def _fts_query(text: str) -> str:
+    """Quote each word so user input is never parsed as FTS5 syntax."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+class ReportIndex:
+    """
+    SQLite index of persisted reports.
+
+    Rows share an integer id with their FTS5 row, so an upsert replaces
+    both by primary key. Safe to share between threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Held by writers only, so an in-process upsert queues behind a rebuild
+        # instead of timing out, while searches keep going
+        self._write_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = self._open()
+        return self._conn
+
+    def _open(self) -> sqlite3.Connection:
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(reports)")}
+        for column, kind in _ADDED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE reports ADD COLUMN {column} {kind}")
+        for statement in _ADDED_INDEXES:
+            conn.execute(statement)
+        return conn
+
+    def _upsert(self, conn: sqlite3.Connection, report_id: str, report_data: Dict[str, Any],
+                json_path: Optional[str], pdf_path: Optional[str]):
+        from report_fields import flatten_report
+        from utils import tech_stack_items
+
+        row = flatten_report(report_id, report_data)
+        row.update(json_path=json_path, pdf_path=pdf_path,
+                   depth_level=row["depth_level"] or None, recommendation=row["recommendation"] or None)
+        values = [row[c] for c in _COLUMNS]
+
+        existing = conn.execute("SELECT id FROM reports WHERE report_id = ?", (report_id,)).fetchone()
+        if existing is None:
+            cursor = conn.execute(
+                f"INSERT INTO reports ({', '.join(_COLUMNS)}, indexed_at)"
+                f" VALUES ({', '.join('?' * len(_COLUMNS))}, ?)",
+                values + [time.time()]
+            )
+            row_id = cursor.lastrowid
+        else:
+            row_id = existing["id"]
+            conn.execute(
+                f"UPDATE reports SET {', '.join(c + ' = ?' for c in _COLUMNS)}, indexed_at = ? WHERE id = ?",
+                values + [time.time(), row_id]
+            )
+            conn.execute("DELETE FROM report_terms WHERE id = ?", (row_id,))
+            conn.execute("DELETE FROM reports_fts WHERE rowid = ?", (row_id,))
+
+        terms = {item.lower() for item in tech_stack_items((report_data.get("candidate_information") or {}).get("tech_stack"))}
+        conn.executemany("INSERT OR IGNORE INTO report_terms (term, id) VALUES (?, ?)",
+                         [(term, row_id) for term in terms])
+        conn.execute(
+            "INSERT INTO reports_fts (rowid, full_name, desired_positions, tech_stack, analysis)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (row_id, row["full_name"], row["desired_positions"], row["tech_stack"],
+             str(report_data.get("ai_analysis") or ""))
+        )
+
+    def upsert(self, report_id: str, report_data: Dict[str, Any],
+               json_path: Optional[str] = None, pdf_path: Optional[str] = None):
+        """
+        Insert or replace one report.
+
+        :param report_id: Stable report identifier (JSON file name without extension)
+        :param report_data: JSON report document (build_report_data)
+        """
+        with self._write_lock, self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._upsert(conn, report_id, report_data, json_path, pdf_path)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def remove(self, report_id: str) -> bool:
+        with self._write_lock, self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT id FROM reports WHERE report_id = ?", (report_id,)).fetchone()
+            if row is None:
+                return False
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM report_terms WHERE id = ?", (row["id"],))
+            conn.execute("DELETE FROM reports_fts WHERE rowid = ?", (row["id"],))
+            conn.execute("DELETE FROM reports WHERE id = ?", (row["id"],))
+            conn.execute("COMMIT")
+            return True
+
+    def rebuild(self, reports: Iterable[Dict[str, Any]]) -> int:
+        """
+        Replace the whole index with the given reports.
+
+        The rebuild runs in one transaction on its own connection, so
+        searches keep reading the previous index (WAL snapshot) until the
+        new one commits, and never see it half-built. Upserts wait for it.
+
+        :param reports: Iterable of dicts with ``report_id``, ``json_path``,
+                        ``pdf_path`` and ``data``
+        :return: Number of reports indexed
+        """
+        count = 0
+        with self._write_lock:
+            conn = self._open()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute("DELETE FROM report_terms")
+                    conn.execute("DELETE FROM reports_fts")
+                    conn.execute("DELETE FROM reports")
+                    for report in reports:
+                        self._upsert(conn, report["report_id"], report["data"],
+                                     report["json_path"], report["pdf_path"])
+                        count += 1
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("INSERT INTO reports_fts (reports_fts) VALUES ('optimize')")
+            finally:
+                conn.close()
+        return count
+
+    def get(self, report_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM reports WHERE report_id = ?", (report_id,)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def search(self, text: Optional[str] = None, email: Optional[str] = None, name: Optional[str] = None,
+               skill: Optional[str] = None, since: Optional[datetime] = None,
+               until: Optional[datetime] = None, limit: int = 50, offset: int = 0,
+               min_score: Optional[float] = None, recommendation: Optional[str] = None,
+               depth_level: Optional[str] = None, order_by: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List reports matching every given filter.
+
+        :param text: Full-text query over name, positions, stack and analysis
+        :param email: Exact email, case-insensitive
+        :param name: Candidate name prefix, case-insensitive
+        :param skill: Exact tech stack term, case-insensitive (e.g. "python")
+        :param since: Generated at or after this time
+        :param until: Generated before this time
+        :param min_score: Score (out of 10) at or above this value
+        :param recommendation: Strong Hire, Hire, Maybe or No Hire
+        :param depth_level: beginner, intermediate, advanced or expert
+        :param order_by: "newest", "score" (highest first) or "relevance"
+                         (default: relevance for text queries, else newest)
+        :return: Report rows
+        """
+        where, params, joins = [], [], []
+        if text and text.strip():
+            joins.append("JOIN reports_fts ON reports_fts.rowid = r.id")
+            where.append("reports_fts MATCH ?")
+            params.append(_fts_query(text))
+        if email:
+            where.append("r.email = ?")
+            params.append(email.strip())
+        if name:
+            where.append("r.full_name LIKE ?")
+            params.append(name.strip().replace("%", "").replace("_", "") + "%")
+        if skill:
+            where.append("r.id IN (SELECT id FROM report_terms WHERE term = ?)")
+            params.append(skill.strip())
+        if since is not None:
+            where.append("r.generated_at >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            where.append("r.generated_at < ?")
+            params.append(until.isoformat())
+        if min_score is not None:
+            where.append("r.score >= ?")
+            params.append(min_score)
+        if recommendation:
+            where.append("r.recommendation = ? COLLATE NOCASE")
+            params.append(recommendation.strip())
+        if depth_level:
+            where.append("r.depth_level = ? COLLATE NOCASE")
+            params.append(depth_level.strip())
+
+        if order_by == "score":
+            order = "r.score IS NULL, r.score DESC, r.generated_at DESC"
+        elif joins and order_by in (None, "relevance"):
+            order = "reports_fts.rank"
+        else:
+            order = "r.generated_at DESC"
+        sql = (f"SELECT {', '.join('r.' + c for c in _COLUMNS)} FROM reports r {' '.join(joins)}"
+               f"{' WHERE ' + ' AND '.join(where) if where else ''} ORDER BY {order} LIMIT ? OFFSET ?")
+        with self._lock:
+            rows = self._connect().execute(sql, params + [limit, offset]).fetchall()
+        return [dict(row) for row in rows]
+
+    def changes(self, indexed_after: float, columns: List[str]
+                ) -> Tuple[List[tuple], List[Tuple[int, str]], Tuple[int, int]]:
+        """
+        Rows (re)indexed at or after a timestamp, for incremental readers.
+
+        :param columns: Report columns to return after ``id`` and ``indexed_at``
+        :return: Tuple of (row tuples ordered by id, (id, term) pairs for those
+                 rows, (row count, sum of ids) of the whole table so readers
+                 can detect deletions)
+        """
+        unknown = set(columns) - set(_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown report index columns: {sorted(unknown)}")
+        # A full read scans the tables directly instead of going through the indexed_at index
+        where, params = ("", ()) if indexed_after <= 0 else (" WHERE indexed_at >= ?", (indexed_after,))
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                rows = conn.execute(
+                    f"SELECT id, indexed_at, {', '.join(columns)} FROM reports{where} ORDER BY id", params
+                ).fetchall()
+                if where:
+                    terms = conn.execute(
+                        "SELECT t.id, t.term FROM reports r JOIN report_terms t ON t.id = r.id"
+                        " WHERE r.indexed_at >= ?", params
+                    ).fetchall()
+                else:
+                    terms = conn.execute("SELECT id, term FROM report_terms").fetchall()
+                count, id_sum = conn.execute("SELECT COUNT(*), COALESCE(SUM(id), 0) FROM reports").fetchone()
+            finally:
+                conn.execute("COMMIT")
+        return [tuple(row) for row in rows], [tuple(row) for row in terms], (count, id_sum)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connect()
+            reports, oldest, newest = conn.execute(
+                "SELECT COUNT(*), MIN(generated_at), MAX(generated_at) FROM reports"
+            ).fetchone()
+            terms = conn.execute("SELECT COUNT(DISTINCT term) FROM report_terms").fetchone()[0]
+        return {"reports": reports, "distinct_terms": terms, "oldest": oldest, "newest": newest}
+
+
+_index: Optional[ReportIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_report_index() -> ReportIndex:
+    """Return the process-wide report index, creating it on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ReportIndex(AppConfig().REPORT_INDEX_PATH)
+        return _index
+
+
+def rebuild_index(reports_dir: Optional[str] = None) -> int:
+    """Re-index every JSON report in the report store (rooted at reports_dir if given)."""
+    from export_reports import iter_reports
+    from report_store import get_report_store
+
+    store = get_report_store(reports_dir)
+    return get_report_index().rebuild(
+        {"report_id": report["report_id"], "data": report["data"],
+         "json_path": store.location(report["json_key"]), "pdf_path": store.location(report["pdf_key"])}
+        for report in iter_reports(store)
+    )
+
+
+def main():
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="Search or rebuild the report index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = sub.add_parser("rebuild", help="Recreate the index from the reports on disk")
+    rebuild.add_argument("--reports-dir", default=config.REPORTS_FOLDER)
+
+    search = sub.add_parser("search", help="List matching reports as JSON lines")
+    search.add_argument("--text")
+    search.add_argument("--email")
+    search.add_argument("--name")
+    search.add_argument("--skill")
+    search.add_argument("--since", help="ISO date/time, inclusive")
+    search.add_argument("--until", help="ISO date/time, exclusive")
+    search.add_argument("--limit", type=int, default=50)
+    search.add_argument("--offset", type=int, default=0)
+    search.add_argument("--min-score", type=float)
+    search.add_argument("--recommendation", help="Strong Hire, Hire, Maybe or No Hire")
+    search.add_argument("--depth-level", help="beginner, intermediate, advanced or expert")
+    search.add_argument("--order-by", choices=["newest", "score", "relevance"])
+
+    sub.add_parser("stats", help="Show index size")
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        start = time.perf_counter()
+        count = rebuild_index(args.reports_dir)
+        print(json.dumps({"indexed": count, "elapsed_seconds": round(time.perf_counter() - start, 2)}, indent=2))
+    elif args.command == "search":
+        start = time.perf_counter()
+        rows = get_report_index().search(
+            args.text, args.email, args.name, args.skill,
+            datetime.fromisoformat(args.since) if args.since else None,
+            datetime.fromisoformat(args.until) if args.until else None,
+            args.limit, args.offset, args.min_score, args.recommendation, args.depth_level, args.order_by
+        )
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+        print(f"{len(rows)} result(s) in {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+    else:
+        print(json.dumps(get_report_index().stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
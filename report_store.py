@@ -0,0 +1,255 @@
+# ============================================================================
+# File: report_store.py
+"""Sharded report storage with collision-free IDs and atomic writes.
+
+Report IDs are ``<Name>_<YYYYmmdd_HHMMSS>_<12 hex>``; the random suffix
+keeps two screenings of the same name in the same second apart. Objects are
+stored under ``<YYYY>/<MM>/<xx>/`` where ``xx`` is the first two hex digits
+of that suffix, so no directory grows past a few hundred entries a month.
+Reports written before sharding (flat ``<Name>_<timestamp>`` files) are
+still found at the root.
+
+Storage goes through a backend so the filesystem can be swapped out:
+``local`` keeps the sharded tree on disk, ``object`` is a local stand-in for
+a shared object store (flat keys, no file paths) for multi-replica setups.
+"""
+
+import gzip
+import os
+import re
+import tempfile
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from config import AppConfig
+
+
+_SHARDED_ID = re.compile(r"_(\d{4})(\d{2})\d{2}_\d{6}_([0-9a-f]{12})$")
+_JSON_SUFFIXES = (".json.gz", ".json")
+
+
+class LocalBackend:
+    """Objects as files under root; each write lands via temp file + rename."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, key: str) -> bytes:
+        with open(self._path(key), 'rb') as f:
+            return f.read()
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self._path(key), 'rb')
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def mtime(self, key: str) -> float:
+        return os.path.getmtime(self._path(key))
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def keys(self, skip: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+        """
+        All keys, directory by directory in sorted order.
+
+        :param skip: Predicate on a directory prefix (e.g. "2025/11/"); skipped directories are not listed
+        """
+        for folder, dirs, files in os.walk(self.root):
+            rel = os.path.relpath(folder, self.root)
+            prefix = "" if rel == "." else rel.replace(os.sep, "/") + "/"
+            dirs[:] = sorted(name for name in dirs if skip is None or not skip(f"{prefix}{name}/"))
+            for name in sorted(files):
+                if not name.endswith(".tmp"):
+                    yield prefix + name
+
+    def location(self, key: str) -> str:
+        return self._path(key)
+
+
+class ObjectStoreBackend(LocalBackend):
+    """
+    Local stand-in for a shared object store bucket.
+
+    Keys are flat object names (slashes escaped) in one directory, and
+    locations are ``object://`` URIs rather than file paths, so callers only
+    use put/get/open/keys the way they would against a real bucket.
+    """
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, quote(key, safe=""))
+
+    def keys(self, skip: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+        try:
+            names = sorted(os.listdir(self.root))
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(".tmp"):
+                continue
+            key = unquote(name)
+            # No directories to prune; drop keys under a skipped year or month prefix instead
+            parts = key.split("/")[:-1]
+            if skip is not None and any(skip("/".join(parts[:depth]) + "/") for depth in (1, 2) if len(parts) >= depth):
+                continue
+            yield key
+
+    def location(self, key: str) -> str:
+        return f"object://{os.path.basename(os.path.abspath(self.root))}/{key}"
+
+
+BACKENDS = {"local": LocalBackend, "object": ObjectStoreBackend}
+
+
+def new_report_id(candidate_name: str, generated_at: Optional[datetime] = None) -> str:
+    """Unique report ID: sanitized name, timestamp and a random suffix."""
+    safe_name = re.sub(r'[^\w\s-]', '', candidate_name or '').strip().replace(' ', '_') or "Unknown_Candidate"
+    timestamp = (generated_at or datetime.now()).strftime("%Y%m%d_%H%M%S")
+    return f"{safe_name}_{timestamp}_{uuid.uuid4().hex[:12]}"
+
+
+def report_id_from_key(key: str) -> Optional[str]:
+    """Report ID for a JSON report key, or None for any other object."""
+    name = key.rsplit("/", 1)[-1]
+    for suffix in _JSON_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return None
+
+
+class ReportStore:
+    """
+    Report JSON and PDF objects addressed by report ID.
+
+    :param backend: Storage backend (LocalBackend or ObjectStoreBackend)
+    :param gzip_json: Write new JSON reports gzip-compressed
+    """
+
+    def __init__(self, backend: LocalBackend, gzip_json: bool = False):
+        self.backend = backend
+        self.gzip_json = gzip_json
+
+    @staticmethod
+    def shard(report_id: str) -> str:
+        """Key prefix for a report ID ("" for legacy flat reports)."""
+        match = _SHARDED_ID.search(report_id)
+        if match is None:
+            return ""
+        year, month, suffix = match.groups()
+        return f"{year}/{month}/{suffix[:2]}/"
+
+    def json_key(self, report_id: str) -> str:
+        """Key of the stored JSON report (gzip or plain), or the key a new one would get."""
+        base = self.shard(report_id) + report_id
+        for suffix in _JSON_SUFFIXES:
+            if self.backend.exists(base + suffix):
+                return base + suffix
+        return base + (".json.gz" if self.gzip_json else ".json")
+
+    def pdf_key(self, report_id: str) -> str:
+        return self.shard(report_id) + report_id + ".pdf"
+
+    def save(self, report_id: str, json_bytes: bytes, pdf_bytes: Optional[bytes] = None) -> Tuple[str, str]:
+        """
+        Write a report's objects, JSON first, so the PDF is never older than
+        the JSON it was rendered from (see report_generator.is_pdf_current).
+        Readers treat a JSON report whose PDF is not there yet as missing
+        its PDF, the same as for a failed render.
+
+        :return: Tuple of (json_key, pdf_key)
+        """
+        base = self.shard(report_id) + report_id
+        json_key = base + (".json.gz" if self.gzip_json else ".json")
+        self.backend.put(json_key, gzip.compress(json_bytes, mtime=0) if self.gzip_json else json_bytes)
+        if pdf_bytes is not None:
+            self.backend.put(base + ".pdf", pdf_bytes)
+        return json_key, base + ".pdf"
+
+    def read_json_bytes(self, json_key: str) -> bytes:
+        data = self.backend.get(json_key)
+        return gzip.decompress(data) if json_key.endswith(".gz") else data
+
+    def iter_json_keys(self, since: Optional[datetime] = None,
+                       until: Optional[datetime] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Yield (report_id, json_key) for every stored JSON report.
+
+        :param since: Skip year/month shards that end at or before this (naive) time
+        :param until: Skip year/month shards that start at or after this (naive) time
+
+        Shards are pruned on the report ID's timestamp, so callers still
+        filter on generated_at; legacy flat reports are always yielded.
+        """
+        skip = None
+        if since is not None or until is not None:
+            skip = lambda prefix: _shard_outside(prefix, since, until)
+        for key in self.backend.keys(skip):
+            report_id = report_id_from_key(key)
+            if report_id is not None:
+                yield report_id, key
+
+    def location(self, key: str) -> str:
+        """Human-readable location of an object (file path or object URI)."""
+        return self.backend.location(key)
+
+
+def _shard_outside(prefix: str, since: Optional[datetime], until: Optional[datetime]) -> bool:
+    """Whether a "YYYY/" or "YYYY/MM/" prefix holds only reports outside [since, until)."""
+    parts = prefix.strip("/").split("/")
+    if len(parts) > 2 or not all(part.isdigit() for part in parts) or not 1 <= int(parts[0]) < 9999:
+        return False
+    year = int(parts[0])
+    if len(parts) == 1:
+        start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+    else:
+        month = int(parts[1])
+        if not 1 <= month <= 12:
+            return False
+        start = datetime(year, month, 1)
+        end = datetime(year + month // 12, month % 12 + 1, 1)
+    return (since is not None and end <= since) or (until is not None and start >= until)
+
+
+@lru_cache(maxsize=8)
+def open_report_store(root: str, backend: str = "local", gzip_json: bool = False) -> ReportStore:
+    """Report store over root with the named backend (see BACKENDS)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown report store backend: {backend!r} (expected one of {sorted(BACKENDS)})")
+    return ReportStore(BACKENDS[backend](root), gzip_json)
+
+
+def get_report_store(root: Optional[str] = None) -> ReportStore:
+    """
+    Report store configured by AppConfig.
+
+    :param root: Override AppConfig.REPORTS_FOLDER (e.g. a CLI --reports-dir)
+    """
+    config = AppConfig()
+    return open_report_store(root or config.REPORTS_FOLDER, config.REPORT_STORE_BACKEND,
+                             config.REPORT_STORE_GZIP_JSON)
@@ -0,0 +1,156 @@
+# ============================================================================
+# File: response_cache.py
+"""Exact-match SQLite cache for deterministic LLM responses.
+
+At temperature 0, resume extraction and candidate analysis return the same
+text for the same prompt and model, so retries, re-screens and batch
+replays can reuse the stored reply instead of calling Groq again. Entries
+are keyed on model name, temperature and a hash of the prompt messages.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from config import AppConfig
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with TTL and an entry limit.
+
+    Safe to share between threads; WAL mode lets the Streamlit app, the
+    server and batch jobs use the same file concurrently.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, stage TEXT, model TEXT, content TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str, stage: str = "unknown") -> Optional[str]:
+        """Return the cached reply, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT content, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+
+            if row is None:
+                self._misses[stage] = self._misses.get(stage, 0) + 1
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._hits[stage] = self._hits.get(stage, 0) + 1
+            return row[0]
+
+    def put(self, key: str, content: str, stage: str = "unknown", model: Optional[str] = None):
+        """Store a reply, evicting least recently used entries over the limit."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, stage, model, content, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, stage, model, content, now, now)
+            )
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process, per stage and in total."""
+        with self._lock:
+            hits, misses = sum(self._hits.values()), sum(self._misses.values())
+            entries = self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "entries": entries,
+                "by_stage": {
+                    stage: {"hits": self._hits.get(stage, 0), "misses": self._misses.get(stage, 0)}
+                    for stage in sorted(set(self._hits) | set(self._misses))
+                }
+            }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+_bypass = False
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = AppConfig()
+            _cache = ResponseCache(
+                config.LLM_RESPONSE_CACHE_PATH,
+                config.LLM_RESPONSE_CACHE_TTL_SECONDS,
+                config.LLM_RESPONSE_CACHE_MAX_ENTRIES
+            )
+        return _cache
+
+
+def set_bypass(bypass: bool):
+    """Skip the cache for this process (reads and writes)."""
+    global _bypass
+    _bypass = bypass
+
+
+def response_key(llm, messages: List[Dict[str, str]], stage: str) -> Optional[str]:
+    """
+    Cache key for a call, or None if the call must not be cached.
+
+    Only stages listed in AppConfig.LLM_RESPONSE_CACHE_STAGES on a
+    temperature-0 model are cached.
+    """
+    config = AppConfig()
+    if _bypass or not config.LLM_RESPONSE_CACHE_ENABLED or stage not in config.LLM_RESPONSE_CACHE_STAGES:
+        return None
+
+    temperature = getattr(llm, "temperature", 0)
+    if temperature:
+        return None
+
+    payload = json.dumps({
+        "model": getattr(llm, "model_name", None) or type(llm).__name__,
+        "temperature": temperature,
+        "messages": messages
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,131 @@
+# ============================================================================
+# File: resume_cache.py
+"""Content-addressed disk cache for resume text and LLM extraction."""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import AppConfig
+
+
+_lock = threading.Lock()
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the SHA-256 hex digest of data."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_key(pdf_hash: str) -> str:
+    """Cache key for cleaned text; covers the extraction backend and token budget."""
+    config = AppConfig()
+    return hash_bytes(f"{pdf_hash}:{config.PDF_BACKEND}:{config.RESUME_TOKEN_BUDGET}".encode("utf-8"))
+
+
+def llm_model_name(llm) -> str:
+    """Name of the model behind an LLM client (fake and real models never share a name)."""
+    return getattr(llm, "model_name", None) or type(llm).__name__
+
+
+def extraction_key(pdf_hash: str, model_name: str) -> str:
+    """
+    Cache key for extracted info.
+
+    Covers the resume text key, the model and the extraction prompt
+    template, so editing the prompt or switching models invalidates old
+    entries.
+    """
+    from prompts import get_extraction_prompt
+
+    prompt_hash = hash_bytes(get_extraction_prompt("").encode("utf-8"))
+    return hash_bytes(f"{text_key(pdf_hash)}:{model_name}:{prompt_hash}".encode("utf-8"))
+
+
+def _entry_path(kind: str, key: str) -> str:
+    config = AppConfig()
+    return os.path.join(config.RESUME_CACHE_FOLDER, f"{kind}-{key}.json")
+
+
+def cache_get(kind: str, key: str) -> Optional[Any]:
+    """Return the cached value or None; a hit refreshes the entry's LRU position."""
+    path = _entry_path(kind, key)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            value = json.load(f)
+        os.utime(path, None)
+        return value
+    except (OSError, ValueError):
+        return None
+
+
+def cache_put(kind: str, key: str, value: Any):
+    """Atomically write an entry, then evict least recently used entries over the size limit."""
+    config = AppConfig()
+    os.makedirs(config.RESUME_CACHE_FOLDER, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=config.RESUME_CACHE_FOLDER, suffix=".tmp")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(value, f, ensure_ascii=False)
+    os.replace(tmp_path, _entry_path(kind, key))
+
+    _evict(config.RESUME_CACHE_FOLDER, config.RESUME_CACHE_MAX_BYTES)
+
+
+def _evict(folder: str, max_bytes: int):
+    with _lock:
+        entries = []
+        for entry in os.scandir(folder):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+def process_resume(pdf_bytes: bytes, llm,
+                   on_field: Optional[Callable[[str, Any], None]] = None,
+                   callbacks: Optional[list] = None) -> Tuple[str, Dict, bool]:
+    """
+    Extract cleaned text and candidate info from a resume, using the cache.
+
+    :param pdf_bytes: Raw PDF file contents
+    :param llm: Chat model used on a cache miss
+    :param on_field: Streaming callback passed to extract_info_from_resume
+    :param callbacks: LangChain callback handlers (e.g. LLMTelemetry)
+    :return: Tuple of (resume_text, extracted_info, cache_hit)
+    """
+    from llm_handler import extract_info_from_resume
+    from utils import extract_clean_resume_text
+
+    pdf_hash = hash_bytes(pdf_bytes)
+    # Key on the model that actually extracts, not the configured one, so a
+    # fake-model run can never answer for the real model
+    info_key = extraction_key(pdf_hash, llm_model_name(llm))
+
+    resume_text = cache_get("text", text_key(pdf_hash))
+    extracted_info = cache_get("info", info_key)
+    if resume_text is not None and extracted_info:
+        return resume_text, extracted_info, True
+
+    if resume_text is None:
+        resume_text = extract_clean_resume_text(io.BytesIO(pdf_bytes))
+        cache_put("text", text_key(pdf_hash), resume_text)
+
+    extracted_info = extract_info_from_resume(resume_text, llm, on_field, callbacks)
+    if extracted_info:
+        cache_put("info", info_key, extracted_info)
+
+    return resume_text, extracted_info, False
@@ -0,0 +1,131 @@
+# ============================================================================
+# File: scoring.py
+"""Structured scoring fields for candidate analyses.
+
+The analysis prompt asks the model to end its assessment with a small JSON
+block (score, depth level, recommendation, strengths, weaknesses).
+split_analysis separates that block from the prose shown to recruiters, so
+the fields come out of the same LLM call. If the block is missing or
+malformed, the fields are read from the numbered markdown sections
+instead. Reports from before this change are handled the same way.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEPTH_LEVELS = ["beginner", "intermediate", "advanced", "expert"]
+RECOMMENDATIONS = ["Strong Hire", "Hire", "Maybe", "No Hire"]
+
+_SCORING_BLOCK = re.compile(r"```(?:json)?\s*(\{[^`]*?\"score\"[^`]*\})\s*```\s*$", re.IGNORECASE)
+_SCORE = re.compile(r"competency[^\n]*?(\d+(?:\.\d+)?)\s*/\s*10", re.IGNORECASE)
+_DEPTH = re.compile(r"depth[^\n]*?\b(" + "|".join(DEPTH_LEVELS) + r")\b", re.IGNORECASE)
+_RECOMMENDATION = re.compile(r"recommendation[^\n]*?\b(strong hire|no hire|hire|maybe)\b", re.IGNORECASE)
+_SECTION = re.compile(r"^\W*\d+\.\s*([^\n:*]+)", re.MULTILINE)
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.+?)\s*$", re.MULTILINE)
+# List fields and the JSON keys (including aliases) they are read from
+_LIST_FIELDS = {"strengths": ("strengths",), "weaknesses": ("weaknesses", "areas_for_improvement")}
+
+
+def empty_scoring() -> Dict[str, Any]:
+    return {"score": None, "depth_level": None, "recommendation": None, "strengths": [], "weaknesses": []}
+
+
+def _score(value: Any) -> Optional[float]:
+    try:
+        score = float(str(value).split("/")[0])
+    except (TypeError, ValueError):
+        return None
+    return score if 0 <= score <= 10 else None
+
+
+def _choice(value: Any, choices: List[str]) -> Optional[str]:
+    text = " ".join(str(value or "").replace("-", " ").split()).lower()
+    # Longest first, so "no hire" and "strong hire" win over "hire"
+    for choice in sorted(choices, key=len, reverse=True):
+        if choice.lower() in text:
+            return choice
+    return None
+
+
+def _items(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [" ".join(str(item).split()) for item in value if str(item).strip()]
+
+
+def normalize_scoring(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce model output to the typed scoring fields."""
+    return {
+        "score": _score(raw.get("score")),
+        "depth_level": _choice(raw.get("depth_level") or raw.get("knowledge_depth"), DEPTH_LEVELS),
+        "recommendation": _choice(raw.get("recommendation"), RECOMMENDATIONS),
+        "strengths": _items(raw.get("strengths")),
+        "weaknesses": _items(raw.get("weaknesses") or raw.get("areas_for_improvement"))
+    }
+
+
+def _section_bullets(analysis: str, heading: str) -> List[str]:
+    """Bullet items of the numbered section whose heading starts with heading."""
+    sections = list(_SECTION.finditer(analysis))
+    for i, match in enumerate(sections):
+        if match.group(1).strip().lower().startswith(heading):
+            end = sections[i + 1].start() if i + 1 < len(sections) else len(analysis)
+            body = analysis[match.end():end]
+            return [re.sub(r"\*\*|__", "", item).strip() for item in _BULLET.findall(body)]
+    return []
+
+
+def extract_scoring_from_text(analysis: str) -> Dict[str, Any]:
+    """Best-effort scoring fields from the markdown sections of an analysis."""
+    score = _SCORE.search(analysis)
+    depth = _DEPTH.search(analysis)
+    recommendation = _RECOMMENDATION.search(analysis)
+    return {
+        "score": _score(score.group(1)) if score else None,
+        "depth_level": depth.group(1).lower() if depth else None,
+        "recommendation": _choice(recommendation.group(1), RECOMMENDATIONS) if recommendation else None,
+        "strengths": _section_bullets(analysis, "strength"),
+        "weaknesses": _section_bullets(analysis, "area")
+    }
+
+
+def split_analysis(content: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Split an analysis reply into display text and scoring fields.
+
+    :param content: Raw analysis reply from the model
+    :return: Tuple of (analysis text without the JSON block, scoring dict)
+    """
+    match = _SCORING_BLOCK.search(content.rstrip())
+    if match is not None:
+        try:
+            raw = json.loads(match.group(1))
+        except ValueError:
+            raw = None
+        if isinstance(raw, dict):
+            text = content.rstrip()[:match.start()].rstrip()
+            scoring = normalize_scoring(raw)
+            # Fill anything the block left out from the prose; a score of 0
+            # or an explicitly empty list is an answer, not a gap
+            fallback = extract_scoring_from_text(text)
+            for key, value in scoring.items():
+                if key in _LIST_FIELDS:
+                    missing = not any(name in raw for name in _LIST_FIELDS[key])
+                else:
+                    missing = value is None
+                if missing:
+                    scoring[key] = fallback[key]
+            return text, scoring
+    return content, extract_scoring_from_text(content)
+
+
+def report_scoring(report_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Scoring fields of a JSON report, derived from the analysis text for older reports."""
+    scoring = report_data.get("scoring")
+    if isinstance(scoring, dict):
+        return {**empty_scoring(), **scoring}
+    return extract_scoring_from_text(str(report_data.get("ai_analysis") or ""))
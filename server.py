@@ -0,0 +1,452 @@
+# ============================================================================
+# File: server.py
+"""Async interview server: the screening flow over HTTP and WebSocket.
+
+Usage:
+    python server.py [--host HOST] [--port PORT] [--api-key KEY]
+
+Each interview is an InterviewSession driven through astream/ainvoke, so
+thousands of mostly idle sessions share one event loop instead of holding
+a Streamlit script thread each. The API key defaults to $GROQ_API_KEY;
+set TALENTSCOUT_FAKE_LLM=1 to serve the scripted fake model.
+
+HTTP:
+    POST   /sessions                  {"mode": "chat" | "resume"} -> session state
+    GET    /sessions/{id}             session state
+    DELETE /sessions/{id}
+    POST   /sessions/{id}/resume      PDF body (raw or multipart field "file")
+    POST   /sessions/{id}/verify      review extracted resume fields -> {"reply"}
+    POST   /sessions/{id}/messages    {"text": ...} -> {"reply"}
+    GET    /sessions/{id}/report      202 while generating, then analysis and links
+    GET    /sessions/{id}/report.pdf | report.json
+    GET    /reports                   search the report index (recruiter); query: q, email, name,
+                                      skill, since, until, min_score, recommendation, depth_level,
+                                      order_by (newest|score|relevance), limit, offset
+    GET    /exports?since=&until=&pdfs=0  streamed ZIP of stored reports and summaries (recruiter)
+    GET    /health                    session count, rate limiter and response cache metrics
+
+Recruiter routes hold every candidate's contact details, so they need
+``Authorization: Bearer $TALENTSCOUT_RECRUITER_TOKEN`` and are not served
+at all when that variable is unset.
+
+WebSocket /sessions/{id}/ws, client -> server:
+    {"type": "message", "text": ...} | {"type": "verify"} | {"type": "report"}
+server -> client:
+    {"type": "state", ...}, {"type": "token", "text": ...},
+    {"type": "reply", "text": ..., "phase": ...}, {"type": "report", ...},
+    {"type": "error", "error": ...}
+"""
+
+import argparse
+import asyncio
+import hmac
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from aiohttp import WSMsgType, web
+
+from config import AppConfig
+from interview import (
+    InterviewSession, PHASE_CHAT, PHASE_COMPLETE, PHASE_MODE_SELECT, PHASE_RESUME_UPLOAD, PHASE_RESUME_VERIFY
+)
+from tracing import span, trace_session
+
+
+class SessionStore:
+    """In-memory interview sessions with idle expiry."""
+
+    def __init__(self, ttl_seconds: float, max_sessions: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, llm) -> Optional[Dict[str, Any]]:
+        """Start a new session, or return None if the server is full."""
+        self.evict_expired()
+        if len(self._sessions) >= self.max_sessions:
+            return None
+        interview = InterviewSession(llm)
+        entry = {
+            "interview": interview,
+            # Serializes turns within a session; sessions run concurrently
+            "lock": asyncio.Lock(),
+            "report_task": None,
+            "persist_task": None,
+            "last_seen": time.monotonic()
+        }
+        self._sessions[interview.session_id] = entry
+        return entry
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._sessions.get(session_id)
+        if entry is not None:
+            entry["last_seen"] = time.monotonic()
+        return entry
+
+    def delete(self, session_id: str):
+        entry = self._sessions.pop(session_id, None)
+        if entry and entry["report_task"] and not entry["report_task"].done():
+            entry["report_task"].cancel()
+
+    def evict_expired(self):
+        cutoff = time.monotonic() - self.ttl_seconds
+        for session_id in [sid for sid, e in self._sessions.items() if e["last_seen"] < cutoff]:
+            self.delete(session_id)
+
+
+def session_state(interview: InterviewSession) -> Dict[str, Any]:
+    """JSON view of an interview for clients."""
+    return {
+        "session_id": interview.session_id,
+        "phase": interview.phase,
+        "question_phase": interview.question_phase,
+        "candidate_info": interview.candidate_info,
+        "messages": interview.messages
+    }
+
+
+async def _generate_report(entry: Dict[str, Any]) -> Dict[str, Any]:
+    artifacts = await entry["interview"].agenerate_report_artifacts()
+    if AppConfig().REPORT_AUTO_PERSIST:
+        # Saving to disk is optional and never delays the response
+        entry["persist_task"] = asyncio.create_task(asyncio.to_thread(artifacts["report"].persist, True))
+    return artifacts
+
+
+def report_payload(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Start report generation if needed and describe its progress.
+
+    :return: Dict with ``status`` pending, done or failed
+    """
+    interview = entry["interview"]
+    if interview.report_artifacts is not None:
+        base = f"/sessions/{interview.session_id}"
+        return {
+            "status": "done",
+            "analysis": interview.report_artifacts["analysis"],
+            "scoring": interview.report_artifacts["scoring"],
+            "pdf": f"{base}/report.pdf",
+            "json": f"{base}/report.json"
+        }
+
+    task = entry["report_task"]
+    if task is None:
+        entry["report_task"] = asyncio.create_task(_generate_report(entry))
+        return {"status": "pending"}
+    if not task.done():
+        return {"status": "pending"}
+
+    # Failed: clear the task so the next request retries
+    entry["report_task"] = None
+    error = task.exception() if not task.cancelled() else asyncio.CancelledError()
+    return {"status": "failed", "error": str(error)}
+
+
+@web.middleware
+async def session_tracing(request: web.Request, handler):
+    """Tag spans with the session id from the URL."""
+    session_id = request.match_info.get("session_id", "server")
+    with trace_session(session_id), span("server.request", method=request.method, path=request.path):
+        return await handler(request)
+
+
+def _entry_or_404(request: web.Request) -> Dict[str, Any]:
+    entry = request.app["sessions"].get(request.match_info["session_id"])
+    if entry is None:
+        raise web.HTTPNotFound(reason="Unknown session")
+    return entry
+
+
+def _require_recruiter(request: web.Request):
+    """Reject requests without the recruiter bearer token."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), request.app["recruiter_token"].encode()):
+        raise web.HTTPUnauthorized(reason="Recruiter token required", headers={"WWW-Authenticate": "Bearer"})
+
+
+def _require_phase(interview: InterviewSession, *phases: str):
+    if interview.phase not in phases:
+        raise web.HTTPConflict(reason=f"Not allowed in phase {interview.phase}")
+
+
+async def create_session(request: web.Request) -> web.Response:
+    body = await request.json() if request.can_read_body else {}
+    mode = body.get("mode", "chat")
+    if mode not in ("chat", "resume"):
+        raise web.HTTPBadRequest(reason="mode must be 'chat' or 'resume'")
+
+    entry = request.app["sessions"].create(request.app["llm"])
+    if entry is None:
+        raise web.HTTPServiceUnavailable(reason="Too many active sessions")
+
+    interview = entry["interview"]
+    if mode == "chat":
+        interview.start_chat()
+    else:
+        interview.start_resume()
+    return web.json_response(session_state(interview), status=201)
+
+
+async def get_session(request: web.Request) -> web.Response:
+    return web.json_response(session_state(_entry_or_404(request)["interview"]))
+
+
+async def delete_session(request: web.Request) -> web.Response:
+    _entry_or_404(request)
+    request.app["sessions"].delete(request.match_info["session_id"])
+    return web.Response(status=204)
+
+
+async def upload_resume(request: web.Request) -> web.Response:
+    entry = _entry_or_404(request)
+    interview = entry["interview"]
+
+    if request.content_type.startswith("multipart/"):
+        field = (await request.post()).get("file")
+        if field is None or not hasattr(field, "file"):
+            raise web.HTTPBadRequest(reason="Expected a 'file' field")
+        pdf_bytes = field.file.read()
+    else:
+        pdf_bytes = await request.read()
+    if not pdf_bytes:
+        raise web.HTTPBadRequest(reason="Empty upload")
+
+    async with entry["lock"]:
+        if interview.phase == PHASE_MODE_SELECT:
+            interview.start_resume()
+        _require_phase(interview, PHASE_RESUME_UPLOAD)
+        # PDF parsing is CPU work and the extraction cache is file based;
+        # both stay off the event loop
+        result = await asyncio.to_thread(interview.process_resume, pdf_bytes)
+
+    if not result["ok"]:
+        raise web.HTTPUnprocessableEntity(reason="Could not extract information from resume")
+    return web.json_response({**session_state(interview), "cache_hit": result["cache_hit"]})
+
+
+async def verify_resume(request: web.Request) -> web.Response:
+    entry = _entry_or_404(request)
+    interview = entry["interview"]
+
+    async with entry["lock"]:
+        _require_phase(interview, PHASE_RESUME_VERIFY)
+        reply = "".join([token async for token in interview.astream_resume_verification()])
+    return web.json_response({"reply": reply, "phase": interview.phase})
+
+
+async def post_message(request: web.Request) -> web.Response:
+    entry = _entry_or_404(request)
+    interview = entry["interview"]
+    text = (await request.json()).get("text", "").strip()
+    if not text:
+        raise web.HTTPBadRequest(reason="text is required")
+
+    async with entry["lock"]:
+        _require_phase(interview, PHASE_CHAT)
+        reply = "".join([token async for token in interview.astream_turn(text)])
+    return web.json_response({"reply": reply, "phase": interview.phase})
+
+
+async def get_report(request: web.Request) -> web.Response:
+    entry = _entry_or_404(request)
+    _require_phase(entry["interview"], PHASE_COMPLETE)
+
+    payload = report_payload(entry)
+    status = {"pending": 202, "done": 200, "failed": 500}[payload["status"]]
+    return web.json_response(payload, status=status)
+
+
+async def get_report_file(request: web.Request) -> web.Response:
+    entry = _entry_or_404(request)
+    artifacts = entry["interview"].report_artifacts
+    if artifacts is None:
+        raise web.HTTPNotFound(reason="Report not generated yet")
+
+    report = artifacts["report"]
+    if request.match_info["kind"] == "pdf":
+        # Rendered on first download, on the process pool
+        body = await asyncio.to_thread(report.pdf_bytes, True)
+        filename, content_type = report.pdf_filename, "application/pdf"
+    else:
+        body, filename, content_type = report.json_bytes(), report.json_filename, "application/json"
+    return web.Response(body=body, content_type=content_type, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"'
+    })
+
+
+def _date_range(request: web.Request):
+    try:
+        since = datetime.fromisoformat(request.query["since"]) if request.query.get("since") else None
+        until = datetime.fromisoformat(request.query["until"]) if request.query.get("until") else None
+    except ValueError:
+        raise web.HTTPBadRequest(reason="since/until must be ISO dates")
+    return since, until
+
+
+async def search_reports(request: web.Request) -> web.Response:
+    from report_index import get_report_index
+
+    _require_recruiter(request)
+    since, until = _date_range(request)
+    query = request.query
+    try:
+        limit = min(int(query.get("limit", 50)), 500)
+        offset = int(query.get("offset", 0))
+        min_score = float(query["min_score"]) if query.get("min_score") else None
+    except ValueError:
+        raise web.HTTPBadRequest(reason="limit/offset/min_score must be numbers")
+
+    rows = await asyncio.to_thread(
+        get_report_index().search, query.get("q"), query.get("email"), query.get("name"),
+        query.get("skill"), since, until, limit, offset, min_score,
+        query.get("recommendation"), query.get("depth_level"), query.get("order_by")
+    )
+    return web.json_response({"reports": rows})
+
+
+async def export_reports(request: web.Request) -> web.StreamResponse:
+    from export_reports import stream_export_zip
+    from report_store import get_report_store
+
+    _require_recruiter(request)
+    since, until = _date_range(request)
+    include_pdfs = request.query.get("pdfs", "1") != "0"
+
+    response = web.StreamResponse(headers={
+        "Content-Type": "application/zip",
+        "Content-Disposition": 'attachment; filename="reports_export.zip"'
+    })
+    await response.prepare(request)
+    chunks = stream_export_zip(get_report_store(), since, until, include_pdfs)
+    try:
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            await response.write(chunk)
+    finally:
+        await asyncio.to_thread(chunks.close)
+    await response.write_eof()
+    return response
+
+
+async def session_socket(request: web.Request) -> web.WebSocketResponse:
+    entry = _entry_or_404(request)
+    interview = entry["interview"]
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+    await ws.send_json({"type": "state", **session_state(interview)})
+
+    async def stream(tokens):
+        reply = ""
+        async for token in tokens:
+            reply += token
+            await ws.send_json({"type": "token", "text": token})
+        await ws.send_json({"type": "reply", "text": reply, "phase": interview.phase})
+
+    async def send_report():
+        payload = report_payload(entry)
+        if payload["status"] == "pending":
+            await asyncio.wait([entry["report_task"]])
+            payload = report_payload(entry)
+        await ws.send_json({"type": "report", **payload})
+
+    async for msg in ws:
+        if msg.type != WSMsgType.TEXT:
+            continue
+        try:
+            data = msg.json()
+            kind = data.get("type")
+            async with entry["lock"]:
+                if kind == "message" and interview.phase == PHASE_CHAT and data.get("text", "").strip():
+                    await stream(interview.astream_turn(data["text"].strip()))
+                elif kind == "verify" and interview.phase == PHASE_RESUME_VERIFY:
+                    await stream(interview.astream_resume_verification())
+                elif kind == "report" and interview.phase == PHASE_COMPLETE:
+                    pass
+                else:
+                    await ws.send_json({"type": "error", "error": f"Cannot handle {kind!r} in phase {interview.phase}"})
+                    continue
+            if interview.phase == PHASE_COMPLETE:
+                await send_report()
+        except Exception as e:
+            await ws.send_json({"type": "error", "error": str(e)})
+
+    return ws
+
+
+async def health(request: web.Request) -> web.Response:
+    from llm_handler import get_rate_limit_stats, get_response_cache_stats
+
+    return web.json_response({
+        "status": "ok",
+        "sessions": len(request.app["sessions"]),
+        "llm_rate_limit": get_rate_limit_stats(),
+        "llm_response_cache": await asyncio.to_thread(get_response_cache_stats)
+    })
+
+
+async def _expire_sessions(app: web.Application):
+    async def sweep():
+        while True:
+            await asyncio.sleep(60)
+            app["sessions"].evict_expired()
+
+    task = asyncio.create_task(sweep())
+    yield
+    task.cancel()
+
+
+def create_app(llm) -> web.Application:
+    """
+    Build the aiohttp application.
+
+    :param llm: Chat model shared by all sessions (from initialize_llm)
+    """
+    config = AppConfig()
+    app = web.Application(middlewares=[session_tracing], client_max_size=config.SERVER_MAX_UPLOAD_BYTES)
+    app["llm"] = llm
+    app["recruiter_token"] = config.RECRUITER_TOKEN
+    app["sessions"] = SessionStore(config.SERVER_SESSION_TTL_SECONDS, config.SERVER_MAX_SESSIONS)
+    app.cleanup_ctx.append(_expire_sessions)
+
+    app.router.add_get("/health", health)
+    app.router.add_post("/sessions", create_session)
+    app.router.add_get("/sessions/{session_id}", get_session)
+    app.router.add_delete("/sessions/{session_id}", delete_session)
+    app.router.add_post("/sessions/{session_id}/resume", upload_resume)
+    app.router.add_post("/sessions/{session_id}/verify", verify_resume)
+    app.router.add_post("/sessions/{session_id}/messages", post_message)
+    app.router.add_get("/sessions/{session_id}/report", get_report)
+    app.router.add_get(r"/sessions/{session_id}/report.{kind:pdf|json}", get_report_file)
+    app.router.add_get("/sessions/{session_id}/ws", session_socket)
+    if config.RECRUITER_TOKEN:
+        app.router.add_get("/reports", search_reports)
+        app.router.add_get("/exports", export_reports)
+    return app
+
+
+def main():
+    from llm_handler import initialize_llm
+
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="Serve TalentScout interviews over HTTP and WebSocket.")
+    parser.add_argument("--host", default=config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT)
+    parser.add_argument("--api-key", default=os.environ.get("GROQ_API_KEY", ""))
+    args = parser.parse_args()
+
+    if not args.api_key and not config.FAKE_LLM:
+        parser.error("a Groq API key is required (--api-key or GROQ_API_KEY)")
+
+    web.run_app(create_app(initialize_llm(args.api_key)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
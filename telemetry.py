@@ -0,0 +1,164 @@
+# ============================================================================
+# File: telemetry.py
+"""Per-call LLM telemetry rolled up per interview session."""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+
+# Call record of the LLM request in flight on this thread/task; the HTTP
+# client hook uses it to count retried requests.
+_active_call: ContextVar[Optional[Dict[str, Any]]] = ContextVar("talentscout_active_llm_call", default=None)
+
+
+def count_http_request(request=None):
+    """httpx request hook: every request after the first for a call is a retry."""
+    record = _active_call.get()
+    if record is not None:
+        record["http_requests"] += 1
+
+
+async def acount_http_request(request=None):
+    """Async variant of count_http_request for httpx.AsyncClient."""
+    count_http_request(request)
+
+
+class LLMTelemetry(BaseCallbackHandler):
+    """
+    LangChain callback handler recording model, tokens, latency,
+    time-to-first-token and retries for every LLM call in a session.
+
+    Pass it via ``config={"callbacks": [telemetry]}``; tag the call with its
+    stage (``tags=["chat"]``) to get a per-stage breakdown.
+    """
+
+    # Run in the caller's context so _active_call is visible to the HTTP hook
+    run_inline = True
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+        self._pending: Dict[UUID, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *,
+                            run_id: UUID, tags: Optional[List[str]] = None,
+                            metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        from utils import estimate_tokens
+
+        invocation = kwargs.get("invocation_params") or {}
+        record = {
+            "stage": (tags or ["unknown"])[0],
+            "model": invocation.get("model") or invocation.get("model_name") or (metadata or {}).get("ls_model_name"),
+            "started_at": time.time(),
+            "input_estimate": sum(estimate_tokens(str(m.content)) for batch in messages for m in batch),
+            "http_requests": 0,
+            "_start": time.perf_counter(),
+            "_first_token": None,
+        }
+        with self._lock:
+            self._pending[run_id] = record
+        _active_call.set(record)
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        record = self._pending.get(run_id)
+        if record is not None and record["_first_token"] is None and token:
+            record["_first_token"] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, response=response)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, error=error)
+
+    def on_retry(self, retry_state: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        record = self._pending.get(run_id)
+        if record is not None:
+            record["http_requests"] += 1
+
+    def _finish(self, run_id: UUID, response: Optional[LLMResult] = None,
+                error: Optional[BaseException] = None):
+        from utils import estimate_tokens
+
+        with self._lock:
+            record = self._pending.pop(run_id, None)
+        if record is None:
+            return
+        if _active_call.get() is record:
+            _active_call.set(None)
+
+        end = time.perf_counter()
+        input_tokens, output_tokens, estimated = _token_usage(response)
+        if input_tokens is None:
+            input_tokens = record["input_estimate"]
+            output_tokens = estimate_tokens(_response_text(response))
+
+        self.calls.append({
+            "stage": record["stage"],
+            "model": record["model"],
+            "started_at": record["started_at"],
+            "latency_seconds": round(end - record["_start"], 4),
+            "ttft_seconds": round(record["_first_token"] - record["_start"], 4) if record["_first_token"] else None,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "tokens_estimated": estimated,
+            "retries": max(record["http_requests"] - 1, 0),
+            "error": repr(error) if error else None,
+        })
+
+    def summary(self) -> Dict[str, Any]:
+        """Roll up all calls: totals plus a per-stage breakdown."""
+        calls = list(self.calls)
+        by_stage: Dict[str, Dict[str, Any]] = {}
+        for call in calls:
+            stage = by_stage.setdefault(call["stage"], {
+                "calls": 0, "input_tokens": 0, "output_tokens": 0,
+                "latency_seconds": 0.0, "retries": 0, "errors": 0
+            })
+            stage["calls"] += 1
+            stage["input_tokens"] += call["input_tokens"] or 0
+            stage["output_tokens"] += call["output_tokens"] or 0
+            stage["latency_seconds"] = round(stage["latency_seconds"] + call["latency_seconds"], 4)
+            stage["retries"] += call["retries"]
+            stage["errors"] += int(call["error"] is not None)
+
+        ttfts = [call["ttft_seconds"] for call in calls if call["ttft_seconds"] is not None]
+        return {
+            "total_calls": len(calls),
+            "models": sorted({call["model"] for call in calls if call["model"]}),
+            "input_tokens": sum(s["input_tokens"] for s in by_stage.values()),
+            "output_tokens": sum(s["output_tokens"] for s in by_stage.values()),
+            "llm_latency_seconds": round(sum(s["latency_seconds"] for s in by_stage.values()), 4),
+            "mean_ttft_seconds": round(sum(ttfts) / len(ttfts), 4) if ttfts else None,
+            "retries": sum(s["retries"] for s in by_stage.values()),
+            "by_stage": by_stage,
+            "calls": calls,
+        }
+
+
+def _token_usage(response: Optional[LLMResult]):
+    """Return (input_tokens, output_tokens, estimated) from the provider response."""
+    if response is None:
+        return None, None, True
+
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return usage.get("input_tokens", 0), usage.get("output_tokens", 0), False
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    if token_usage:
+        return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0), False
+    return None, None, True
+
+
+def _response_text(response: Optional[LLMResult]) -> str:
+    if response is None:
+        return ""
+    return "".join(g.text for generations in response.generations for g in generations)
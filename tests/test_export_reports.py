@@ -0,0 +1,56 @@
+# ============================================================================
+# File: tests/test_export_reports.py
+"""Tests for date filtering and single-pass export archives."""
+
+import io
+import json
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from export_reports import iter_reports, write_export_zip
+from report_store import LocalBackend, ReportStore, new_report_id
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ReportStore(LocalBackend(str(tmp_path)))
+
+
+def save_report(store: ReportStore, generated_at: datetime) -> str:
+    report_id = new_report_id("Jane Doe", generated_at)
+    data = {"report_metadata": {"generated_at": generated_at.isoformat()}, "candidate_information": {}}
+    store.save(report_id, json.dumps(data).encode("utf-8"), b"%PDF-1.4")
+    return report_id
+
+
+def test_aware_bounds_filter_naive_stored_times(store):
+    generated_at = datetime.now().replace(microsecond=0)
+    report_id = save_report(store, generated_at)
+    local = generated_at.astimezone()
+
+    matched = iter_reports(store, since=local - timedelta(minutes=1), until=local + timedelta(minutes=1))
+    assert [report["report_id"] for report in matched] == [report_id]
+    assert list(iter_reports(store, since=(local + timedelta(minutes=1)).astimezone(timezone.utc))) == []
+
+
+def test_export_reads_each_report_once_and_skips_other_months(store, monkeypatch):
+    november = save_report(store, datetime(2025, 11, 14, 9, 30))
+    save_report(store, datetime(2025, 10, 2, 12, 0))
+    reads, listed = [], []
+    read_json_bytes = store.read_json_bytes
+    monkeypatch.setattr(store, "read_json_bytes", lambda key: reads.append(key) or read_json_bytes(key))
+    keys = store.backend.keys
+    monkeypatch.setattr(store.backend, "keys", lambda skip=None: (listed.append(key) or key for key in keys(skip)))
+
+    buffer = io.BytesIO()
+    stats = write_export_zip(buffer, store, datetime(2025, 11, 1), datetime(2025, 12, 1))
+
+    assert stats == {"reports": 1, "pdfs": 1, "missing_pdfs": 0}
+    assert len(reads) == 1 and all(key.startswith("2025/11/") for key in listed)
+    with zipfile.ZipFile(buffer) as archive:
+        rows = [json.loads(line) for line in archive.read("summary.jsonl").decode("utf-8").splitlines()]
+        assert [row["report_id"] for row in rows] == [november]
+        assert november in archive.read("summary.csv").decode("utf-8")
+        assert archive.namelist()[-1] == f"reports/{november}.pdf"
@@ -0,0 +1,40 @@
+# ============================================================================
+# File: tests/test_fake_llm.py
+"""Tests for the scripted fake chat model."""
+
+from functools import reduce
+from operator import add
+
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+
+from fake_llm import CHAT_SCRIPT, FakeChatModel, scripted_reply
+
+
+def test_script_advances_past_streamed_turns():
+    history = [SystemMessage(content="system")]
+    for expected in CHAT_SCRIPT:
+        history.append(HumanMessage(content="answer"))
+        reply = scripted_reply(history)
+        assert reply == expected
+        history.append(AIMessageChunk(content=reply))
+
+
+def test_script_advances_past_plain_turns():
+    history = [HumanMessage(content="hi"), AIMessage(content=CHAT_SCRIPT[2]), HumanMessage(content="answer")]
+    assert scripted_reply(history) == CHAT_SCRIPT[3]
+
+
+def test_script_stays_on_last_reply():
+    history = [AIMessage(content=CHAT_SCRIPT[-1]), HumanMessage(content="thanks")]
+    assert scripted_reply(history) == CHAT_SCRIPT[-1]
+
+
+def test_streamed_conversation_completes():
+    llm = FakeChatModel(latency=0, tokens_per_second=1e9)
+    history = []
+    for _ in CHAT_SCRIPT:
+        history.append(HumanMessage(content="answer"))
+        history.append(reduce(add, llm.stream(history)))
+    assert isinstance(history[-1], AIMessageChunk)
+    assert history[-1].content == CHAT_SCRIPT[-1]
+    assert [m.content for m in history[1::2]] == CHAT_SCRIPT
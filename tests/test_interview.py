@@ -0,0 +1,28 @@
+# ============================================================================
+# File: tests/test_interview.py
+"""Tests for chat-mode field capture in the interview engine."""
+
+from fake_llm import CANDIDATE_RECORD, FakeChatModel
+from interview import InterviewSession
+
+
+ANSWERS = {
+    "full_name": CANDIDATE_RECORD["full_name"],
+    "email": CANDIDATE_RECORD["email"],
+    "phone_number": CANDIDATE_RECORD["phone_number"],
+    "years_of_experience": str(CANDIDATE_RECORD["years_of_experience"]),
+    "desired_positions": ", ".join(CANDIDATE_RECORD["desired_positions"]),
+    "current_location": CANDIDATE_RECORD["current_location"],
+    "tech_stack": CANDIDATE_RECORD["tech_stack"],
+}
+
+
+def test_phase1_answers_are_pinned_in_chat_mode():
+    interview = InterviewSession(FakeChatModel(latency=0, tokens_per_second=1e9))
+    interview.start_chat()
+    for answer in ANSWERS.values():
+        interview.send(answer)
+
+    assert interview.profile_answers == ANSWERS
+    assert interview.chat_history.pinned_info == ANSWERS
+    assert interview.question_phase
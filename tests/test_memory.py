@@ -0,0 +1,71 @@
+# ============================================================================
+# File: tests/test_memory.py
+"""Tests for the rolling-summary chat history."""
+
+import threading
+
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+
+from memory import RollingSummaryHistory
+
+
+TURN = "word " * 100  # ~125 tokens
+
+
+class GatedSummarizer:
+    """Stands in for the LLM; blocks until released so tests can see in-flight state."""
+
+    model_name = "gated"
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def invoke(self, messages, config=None, **kwargs):
+        self.release.wait(5)
+        self.calls += 1
+        return AIMessage(content=f"summary {self.calls}")
+
+
+def add_turns(history: RollingSummaryHistory, count: int):
+    for _ in range(count):
+        history.add_messages([HumanMessage(content=TURN), AIMessageChunk(content=TURN)])
+
+
+def test_nothing_pinned_or_summarized_under_budget():
+    history = RollingSummaryHistory(recent_turns=2, token_budget=1000)
+    history.pinned_info = {"full_name": "Jane Doe"}
+    add_turns(history, 3)
+    assert len(history.messages) == 6
+    assert not any(isinstance(m, SystemMessage) for m in history.messages)
+
+
+def test_eviction_is_batched():
+    history = RollingSummaryHistory(recent_turns=2, token_budget=1000)
+    history.pinned_info = {"full_name": "Jane Doe"}
+    add_turns(history, 4)
+    assert not history.summary
+    add_turns(history, 1)
+    # One batch down to the last two turns, folded once (extractive fallback)
+    assert len(history.recent) == 4 and not history.pending
+    assert history.summary.startswith("Candidate: word")
+    context = history.messages[0].content
+    assert "Name: Jane Doe" in context and "Assistant: word" in context
+    add_turns(history, 1)
+    assert len(history.recent) == 6
+
+
+def test_summary_runs_off_the_reply_path():
+    summarizer = GatedSummarizer()
+    history = RollingSummaryHistory(summarizer=summarizer, recent_turns=2, token_budget=1000)
+    add_turns(history, 5)
+
+    # add_messages returned while the summarizer is still blocked; the
+    # evicted turns stay in the prompt verbatim until it finishes
+    assert summarizer.calls == 0 and len(history.pending) == 6
+    assert "Earlier turns" in history.messages[0].content
+
+    summarizer.release.set()
+    history.wait_for_summary(5)
+    assert summarizer.calls == 1 and history.summary_calls == 1
+    assert history.summary == "summary 1" and not history.pending
@@ -0,0 +1,25 @@
+# ============================================================================
+# File: tests/test_report_index.py
+"""Tests for report index rebuilds."""
+
+from report_index import ReportIndex
+
+
+def report(report_id: str, name: str) -> dict:
+    data = {"candidate_information": {"full_name": name, "tech_stack": "Python"}}
+    return {"report_id": report_id, "data": data, "json_path": None, "pdf_path": None}
+
+
+def test_searches_during_a_rebuild_see_the_previous_index(tmp_path):
+    index = ReportIndex(str(tmp_path / "index.sqlite3"))
+    index.upsert("old", report("old", "Old Candidate")["data"])
+    seen = []
+
+    def reports():
+        for i in range(3):
+            yield report(f"new-{i}", f"New Candidate {i}")
+            seen.append(sorted(row["report_id"] for row in index.search(skill="python")))
+
+    assert index.rebuild(reports()) == 3
+    assert seen == [["old"]] * 3
+    assert sorted(row["report_id"] for row in index.search(skill="python")) == ["new-0", "new-1", "new-2"]
@@ -0,0 +1,77 @@
+# ============================================================================
+# File: tests/test_report_store.py
+"""Tests for report store write order and PDF currency checks."""
+
+import os
+
+import pytest
+
+from report_generator import PDF_LAYOUT_MARKER, is_pdf_current, render_pdf_report
+from report_store import LocalBackend, ReportStore, new_report_id
+
+
+PDF = b"%PDF-1.4 " + PDF_LAYOUT_MARKER.encode("ascii")
+
+
+class RecordingBackend(LocalBackend):
+    def __init__(self, root: str):
+        super().__init__(root)
+        self.writes = []
+
+    def put(self, key: str, data: bytes):
+        self.writes.append(key)
+        super().put(key, data)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ReportStore(RecordingBackend(str(tmp_path)))
+
+
+def set_mtime(store: ReportStore, key: str, mtime: float):
+    os.utime(store.backend.location(key), (mtime, mtime))
+
+
+def test_save_writes_json_before_pdf(store):
+    report_id = new_report_id("Jane Doe")
+    json_key, pdf_key = store.save(report_id, b"{}", PDF)
+    assert store.backend.writes == [json_key, pdf_key]
+    assert store.shard(report_id) and json_key.startswith(store.shard(report_id))
+
+
+def test_freshly_saved_pdf_is_current(store):
+    report_id = new_report_id("Jane Doe")
+    store.save(report_id, b"{}", PDF)
+    assert is_pdf_current(store, report_id)
+
+
+def test_pdf_older_than_json_is_stale(store):
+    report_id = new_report_id("Jane Doe")
+    json_key, pdf_key = store.save(report_id, b"{}", PDF)
+    set_mtime(store, pdf_key, 1_000_000)
+    set_mtime(store, json_key, 1_000_010)
+    assert not is_pdf_current(store, report_id)
+
+
+def test_pdf_with_old_layout_is_stale(store):
+    report_id = new_report_id("Jane Doe")
+    store.save(report_id, b"{}", b"%PDF-1.4 TalentScout report layout 0")
+    assert not is_pdf_current(store, report_id)
+
+
+def test_missing_pdf_is_stale(store):
+    report_id = new_report_id("Jane Doe")
+    store.save(report_id, b"{}")
+    assert not is_pdf_current(store, report_id)
+
+
+def test_rendered_pdf_marker_is_read_from_the_info_dict_only(store, monkeypatch):
+    report_id = new_report_id("Jane Doe")
+    pdf = render_pdf_report({"full_name": "Jane Doe"}, [{"question": "Q", "answer": "A"}], "Analysis")
+    store.save(report_id, b"{}", pdf)
+    monkeypatch.setattr(store.backend, "get", lambda key: pytest.fail("read the whole PDF"))
+    assert is_pdf_current(store, report_id)
+
+    old = pdf.replace(PDF_LAYOUT_MARKER.encode("ascii"), b"TalentScout report layout 0")
+    store.backend.put(store.pdf_key(report_id), old)
+    assert not is_pdf_current(store, report_id)
@@ -0,0 +1,47 @@
+# ============================================================================
+# File: tests/test_resume_cache.py
+"""Tests for the resume extraction cache."""
+
+import dataclasses
+
+import pytest
+
+import resume_cache
+import response_cache
+from config import AppConfig
+from fake_llm import CANDIDATE_RECORD, FakeChatModel
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    config = dataclasses.replace(AppConfig(), RESUME_CACHE_FOLDER=str(tmp_path))
+    monkeypatch.setattr(resume_cache, "AppConfig", lambda: config)
+    monkeypatch.setattr(response_cache, "_bypass", True)
+
+
+def test_fake_extraction_is_not_cached_for_the_real_model():
+    pdf_bytes = b"%PDF-1.4 resume"
+    pdf_hash = resume_cache.hash_bytes(pdf_bytes)
+    resume_cache.cache_put("text", resume_cache.text_key(pdf_hash), "Jane Doe, Python developer")
+
+    fake = FakeChatModel(model_name="fake-llm", latency=0, tokens_per_second=1e9)
+    _, info, cache_hit = resume_cache.process_resume(pdf_bytes, fake)
+    assert info["full_name"] == CANDIDATE_RECORD["full_name"] and not cache_hit
+
+    real_key = resume_cache.extraction_key(pdf_hash, AppConfig().MODEL_NAME)
+    assert resume_cache.cache_get("info", real_key) is None
+    _, _, cache_hit = resume_cache.process_resume(pdf_bytes, fake)
+    assert cache_hit
+
+
+def test_batch_fake_extraction_is_not_cached_for_the_real_model():
+    from batch_ingest import extract_candidate
+
+    pdf_hash = resume_cache.hash_bytes(b"%PDF-1.4 batch resume")
+    fake = FakeChatModel(model_name="fake-llm", latency=0, tokens_per_second=1e9)
+    record = extract_candidate("resume.pdf", pdf_hash, "Jane Doe, Python developer", fake)
+    assert record["llm_called"] and record["candidate_information"]
+
+    real_key = resume_cache.extraction_key(pdf_hash, AppConfig().MODEL_NAME)
+    assert resume_cache.cache_get("info", real_key) is None
+    assert not extract_candidate("resume.pdf", pdf_hash, "Jane Doe, Python developer", fake)["llm_called"]
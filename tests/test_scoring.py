@@ -0,0 +1,63 @@
+# ============================================================================
+# File: tests/test_scoring.py
+"""Tests for splitting the JSON scoring block from analysis replies."""
+
+from fake_llm import ANALYSIS
+from scoring import split_analysis
+
+
+PROSE = """**1. Overall Technical Competency: 6/10**
+Solid fundamentals.
+
+**2. Strengths**
+- Clear reasoning
+- Measures before optimizing
+
+**3. Areas for Improvement**
+- Limited AWS depth
+
+**4. Knowledge Depth:** Advanced
+
+**5. Recommendation:** Maybe
+"""
+
+
+def with_block(block: str) -> str:
+    return PROSE + "\n```json\n" + block + "\n```"
+
+
+def test_block_fields_are_used_and_stripped_from_text():
+    text, scoring = split_analysis(ANALYSIS)
+    assert "```" not in text
+    assert scoring["score"] == 7
+    assert scoring["depth_level"] == "intermediate"
+    assert scoring["recommendation"] == "Hire"
+    assert scoring["strengths"] and scoring["weaknesses"]
+
+
+def test_zero_score_is_kept():
+    _, scoring = split_analysis(with_block('{"score": 0, "recommendation": "No Hire"}'))
+    assert scoring["score"] == 0
+    assert scoring["recommendation"] == "No Hire"
+
+
+def test_explicitly_empty_lists_are_kept():
+    _, scoring = split_analysis(with_block('{"score": 5, "strengths": [], "areas_for_improvement": []}'))
+    assert scoring["strengths"] == []
+    assert scoring["weaknesses"] == []
+
+
+def test_missing_fields_fall_back_to_prose():
+    _, scoring = split_analysis(with_block('{"score": 8}'))
+    assert scoring["score"] == 8
+    assert scoring["depth_level"] == "advanced"
+    assert scoring["recommendation"] == "Maybe"
+    assert scoring["strengths"] == ["Clear reasoning", "Measures before optimizing"]
+    assert scoring["weaknesses"] == ["Limited AWS depth"]
+
+
+def test_no_block_reads_prose():
+    text, scoring = split_analysis(PROSE)
+    assert text == PROSE
+    assert scoring["score"] == 6
+    assert scoring["recommendation"] == "Maybe"
@@ -0,0 +1,46 @@
+# ============================================================================
+# File: tests/test_server.py
+"""Tests for recruiter-only routes on the interview server."""
+
+import asyncio
+import dataclasses
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+import server
+from config import AppConfig
+from fake_llm import FakeChatModel
+
+
+def request_status(token: str, path: str, headers=None) -> int:
+    """Status of one GET against a fresh app with the given recruiter token."""
+    async def run():
+        config = dataclasses.replace(AppConfig(), RECRUITER_TOKEN=token)
+        original, server.AppConfig = server.AppConfig, lambda: config
+        try:
+            app = server.create_app(FakeChatModel(latency=0))
+        finally:
+            server.AppConfig = original
+        async with TestClient(TestServer(app)) as client:
+            response = await client.get(path, headers=headers or {})
+            return response.status
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("path", ["/reports", "/exports"])
+def test_recruiter_routes_are_off_without_a_token(path):
+    assert request_status("", path, {"Authorization": "Bearer "}) == 404
+
+
+@pytest.mark.parametrize("path", ["/reports", "/exports"])
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}, {"Authorization": "secret"}])
+def test_recruiter_routes_need_the_token(path, headers):
+    assert request_status("secret", path, headers) == 401
+
+
+def test_export_with_the_token(tmp_path, monkeypatch):
+    import report_store
+
+    monkeypatch.setattr(report_store, "get_report_store", lambda: report_store.open_report_store(str(tmp_path)))
+    assert request_status("secret", "/exports", {"Authorization": "Bearer secret"}) == 200
@@ -0,0 +1,168 @@
+# ============================================================================
+# File: tracing.py
+"""Lightweight span tracing for the screening pipeline.
+
+Spans are appended to a JSONL file, one Chrome trace event per line.
+Convert the file for chrome://tracing, Perfetto or speedscope with:
+
+    python tracing.py traces/spans.jsonl > trace.json
+
+When tracing is disabled, span() returns a shared no-op context manager.
+"""
+
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from config import AppConfig
+
+
+_config = AppConfig()
+_enabled = _config.TRACING_ENABLED
+
+# (session_id, parent span id) for the current thread/task
+_context: ContextVar[Dict[str, Any]] = ContextVar("talentscout_trace_context", default={})
+_span_ids = itertools.count(1)
+_fd: Optional[int] = None
+_fd_lock = threading.Lock()
+
+
+class _NoopSpan:
+    """Shared span used when tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        parent = _context.get()
+        self.span_id = f"{os.getpid()}-{next(_span_ids)}"
+        self.parent_id = parent.get("span_id")
+        self.session_id = parent.get("session_id")
+        self._token = _context.set({**parent, "span_id": self.span_id})
+        self._start = time.perf_counter_ns()
+        self._wall_start = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ns = time.perf_counter_ns() - self._start
+        _context.reset(self._token)
+
+        args = dict(self.attrs)
+        args.update(span_id=self.span_id, parent_id=self.parent_id, session_id=self.session_id)
+        if exc_type is not None:
+            args["error"] = exc_type.__name__
+
+        _write({
+            "name": self.name,
+            "ph": "X",
+            "ts": self._wall_start // 1000,
+            "dur": duration_ns // 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+        return False
+
+    def set(self, **attrs):
+        """Attach attributes discovered while the span is open."""
+        self.attrs.update(attrs)
+
+
+def _write(event: Dict[str, Any]):
+    global _fd
+    line = (json.dumps(event, default=str) + "\n").encode("utf-8")
+    with _fd_lock:
+        if _fd is None:
+            folder = os.path.dirname(_config.TRACE_FILE)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            _fd = os.open(_config.TRACE_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        # One write() per event keeps lines intact across processes
+        os.write(_fd, line)
+
+
+def is_enabled() -> bool:
+    """Return True if spans are being recorded."""
+    return _enabled
+
+
+def set_enabled(enabled: bool):
+    """Turn tracing on or off for this process."""
+    global _enabled
+    _enabled = enabled
+
+
+def span(name: str, **attrs):
+    """
+    Context manager timing a named span, nested under the current span.
+
+    :param name: Span name, e.g. "pdf.build"
+    :param attrs: Extra attributes stored in the event args
+    """
+    if not _enabled:
+        return _NOOP
+    return _Span(name, attrs)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator recording each call of the wrapped function as a span."""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(span_name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def trace_session(session_id: str):
+    """Tag every span opened inside the block with session_id."""
+    token = _context.set({"session_id": session_id})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def to_chrome_trace(jsonl_path: str) -> Dict[str, Any]:
+    """Load a span JSONL file as a Chrome trace ({"traceEvents": [...]})."""
+    events = []
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else _config.TRACE_FILE
+    json.dump(to_chrome_trace(path), sys.stdout)
@@ -1,31 +1,141 @@
 # ============================================================================
 # File: utils.py
 """Utility functions for file processing and data formatting."""
-from typing import Dict, Any
-
 import pdfplumber
+import io
 import re
 import json
-from typing import Dict, Any
-from datetime import datetime
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, List, Optional
+from config import AppConfig
+from tracing import span
 
 
-def extract_clean_resume_text(pdf_file) -> str:
-    """
-    Extracts and cleans text from an uploaded PDF resume.
+def _read_pdf_bytes(pdf_file) -> bytes:
+    """Return raw bytes from a path, bytes object or file-like upload."""
+    if isinstance(pdf_file, bytes):
+        return pdf_file
+    if isinstance(pdf_file, str):
+        with open(pdf_file, 'rb') as f:
+            return f.read()
+    if hasattr(pdf_file, "getvalue"):
+        return pdf_file.getvalue()
+    pdf_file.seek(0)
+    return pdf_file.read()
+
+
+def count_pdf_pages(pdf_bytes: bytes) -> int:
+    """Return the number of pages in a PDF."""
+    import pypdfium2 as pdfium
     
-    :param pdf_file: Streamlit UploadedFile object
-    :return: Cleaned resume text as a string
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _extract_pages_pypdfium2(pdf_bytes: bytes, start: int, stop: int,
+                             max_chars: Optional[int] = None) -> List[str]:
+    """Extract raw text of pages [start, stop) with pdfium (no layout analysis)."""
+    import pypdfium2 as pdfium
+    
+    pages = []
+    collected = 0
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    try:
+        for index in range(start, min(stop, len(pdf))):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            pages.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+            collected += len(pages[-1])
+            if max_chars and collected >= max_chars:
+                break
+    finally:
+        pdf.close()
+    return pages
+
+
+def _extract_pages_pdfplumber(pdf_bytes: bytes, start: int, stop: int,
+                              max_chars: Optional[int] = None) -> List[str]:
+    """Extract text of pages [start, stop) with pdfplumber layout analysis."""
+    pages = []
+    collected = 0
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for page in pdf.pages[start:stop]:
+            pages.append(page.extract_text() or "")
+            collected += len(pages[-1])
+            if max_chars and collected >= max_chars:
+                break
+    return pages
+
+
+PDF_BACKENDS: Dict[str, Callable[..., List[str]]] = {
+    "pypdfium2": _extract_pages_pypdfium2,
+    "pdfplumber": _extract_pages_pdfplumber,
+}
+
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """
+    Process pool shared by all page-range parses, created on first use.
+
+    Workers are spawned rather than forked: callers run in Streamlit and
+    aiohttp worker threads, and forking a threaded process is unsafe.
     """
-    raw_text = ""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(max_workers=AppConfig().PDF_PARSE_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _pdf_pool
+
+
+def extract_pdf_pages(pdf_bytes: bytes, backend: str, parallel: bool = True,
+                      max_chars: Optional[int] = None) -> List[str]:
+    """
+    Extract per-page text with the named backend.
+
+    When max_chars is given, pages are read in order and reading stops once
+    that much text has been collected; the remaining pages are never
+    opened. Otherwise long documents are split into page ranges parsed on
+    the shared process pool (when there is more than one CPU to use).
+    """
+    config = AppConfig()
+    extract = PDF_BACKENDS[backend]
+    page_count = count_pdf_pages(pdf_bytes)
+    workers = min(config.PDF_PARSE_WORKERS, page_count, os.cpu_count() or 1)
     
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            txt = page.extract_text()
-            if txt:
-                raw_text += "\n" + txt
+    if max_chars or not parallel or workers < 2 or page_count < config.PDF_PARALLEL_PAGE_THRESHOLD:
+        return extract(pdf_bytes, 0, page_count, max_chars)
     
-    # Cleaning
+    chunk = -(-page_count // workers)
+    pool = _get_pdf_pool()
+    futures = [pool.submit(extract, pdf_bytes, start, start + chunk) for start in range(0, page_count, chunk)]
+    return [text for future in futures for text in future.result()]
+
+
+def is_poor_text(pages: List[str]) -> bool:
+    """Heuristic for failed fast extraction (scanned pages, broken encodings)."""
+    config = AppConfig()
+    text = "".join(pages)
+    if not pages or len(text.strip()) < config.PDF_MIN_CHARS_PER_PAGE * len(pages):
+        return True
+    readable = sum(1 for ch in text if ch.isalnum() or ch.isspace() or ch in ".,;:!?()-@+/&'\"")
+    return readable / len(text) < 0.85
+
+
+def clean_resume_text(raw_text: str) -> str:
+    """Normalize whitespace, bullets and punctuation spacing."""
     cleaned = raw_text
     cleaned = re.sub(r'\s+', ' ', cleaned)
     cleaned = cleaned.replace("•", ", ").replace("●", ", ").replace("▪", ", ")
@@ -35,6 +145,129 @@ def extract_clean_resume_text(pdf_file) -> str:
     return cleaned
 
 
+# Resume sections by priority (lower is kept first); None means the section
+# is dropped and replaced by a one-line summary.
+RESUME_SECTION_PRIORITIES = {
+    "skills": 1, "technical skills": 1, "technologies": 1, "tech stack": 1,
+    "experience": 2, "work experience": 2, "professional experience": 2,
+    "employment history": 2, "work history": 2,
+    "summary": 3, "profile": 3, "objective": 3, "about me": 3,
+    "projects": 4, "education": 4,
+    "certifications": 5, "achievements": 5, "awards": 5, "languages": 5,
+    "publications": None, "references": None, "hobbies": None,
+    "interests": None, "volunteering": None, "conferences": None,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (no tokenizer dependency)."""
+    return -(-len(text) // AppConfig().CHARS_PER_TOKEN)
+
+
+def split_resume_sections(raw_text: str) -> List[Dict[str, Any]]:
+    """
+    Split raw (un-cleaned) resume text into sections on known heading lines.
+    
+    Text before the first heading is the contact/header section.
+    """
+    sections = [{"heading": "contact", "priority": 0, "lines": []}]
+    
+    for line in raw_text.splitlines():
+        heading = line.strip().strip(':').lower()
+        if len(heading) < 40 and heading in RESUME_SECTION_PRIORITIES:
+            sections.append({
+                "heading": line.strip().strip(':'),
+                "priority": RESUME_SECTION_PRIORITIES[heading],
+                "lines": []
+            })
+        else:
+            sections[-1]["lines"].append(line)
+    
+    return sections
+
+
+def budget_resume_text(raw_text: str, token_budget: int) -> str:
+    """
+    Fit resume text into token_budget, section by section.
+    
+    Contact, skills and experience are kept first; low-value sections such
+    as publications and references are summarized as a single line. The
+    kept sections are returned in their original order.
+    """
+    sections = split_resume_sections(raw_text)
+    remaining = token_budget
+    kept = {}
+    
+    ranked = sorted(
+        range(len(sections)),
+        key=lambda i: (sections[i]["priority"] is None, sections[i]["priority"] or 0, i)
+    )
+    for index in ranked:
+        section = sections[index]
+        body = "\n".join(section["lines"]).strip()
+        if not body:
+            continue
+        
+        if section["priority"] is None:
+            text = f"[{section['heading']}: {len(section['lines'])} lines omitted]"
+        else:
+            text = body if index == 0 else f"{section['heading']}:\n{body}"
+        
+        cost = estimate_tokens(text)
+        if cost > remaining:
+            if section["priority"] is None or remaining <= 0:
+                continue
+            text = text[:remaining * AppConfig().CHARS_PER_TOKEN].rsplit(' ', 1)[0]
+            cost = remaining
+        
+        kept[index] = text
+        remaining -= cost
+    
+    return "\n".join(kept[i] for i in sorted(kept))
+
+
+def extract_clean_resume_text(pdf_file, backend: Optional[str] = None, parallel: bool = True,
+                              token_budget: Optional[int] = None) -> str:
+    """
+    Extracts and cleans text from an uploaded PDF resume.
+    
+    With the default "auto" backend, pypdfium2 is tried first and pdfplumber
+    is used only when the fast path yields poor text. The result is fitted
+    into a token budget, and pages stop being read once enough text has
+    been collected to fill it.
+    
+    :param pdf_file: Streamlit UploadedFile object, file path or bytes
+    :param backend: "auto", "pypdfium2" or "pdfplumber" (default: AppConfig.PDF_BACKEND)
+    :param parallel: Allow parsing long documents in a process pool
+    :param token_budget: Max tokens of resume text, 0 for no limit (default: AppConfig.RESUME_TOKEN_BUDGET)
+    :return: Cleaned resume text as a string
+    """
+    config = AppConfig()
+    backend = backend or config.PDF_BACKEND
+    token_budget = config.RESUME_TOKEN_BUDGET if token_budget is None else token_budget
+    pdf_bytes = _read_pdf_bytes(pdf_file)
+    
+    # Read extra text beyond the budget so dropped sections can be replaced
+    max_chars = token_budget * config.CHARS_PER_TOKEN * config.RESUME_READ_AHEAD_FACTOR if token_budget else None
+    
+    with span("pdf.extract", backend=backend, bytes=len(pdf_bytes)) as extract_span:
+        if backend == "auto":
+            pages = extract_pdf_pages(pdf_bytes, "pypdfium2", parallel, max_chars)
+            if is_poor_text(pages):
+                extract_span.set(fallback="pdfplumber")
+                pages = extract_pdf_pages(pdf_bytes, "pdfplumber", parallel, max_chars)
+        else:
+            pages = extract_pdf_pages(pdf_bytes, backend, parallel, max_chars)
+        extract_span.set(pages=len(pages))
+    
+    raw_text = "".join("\n" + txt for txt in pages if txt)
+    if token_budget:
+        with span("resume.budget", token_budget=token_budget):
+            raw_text = budget_resume_text(raw_text, token_budget)
+    with span("resume.clean", chars=len(raw_text)):
+        return clean_resume_text(raw_text)
+
+
 def format_candidate_info_natural(info: Dict) -> str:
     """Convert candidate info dict to natural language."""
     parts = []
@@ -55,29 +288,109 @@ def format_candidate_info_natural(info: Dict) -> str:
     if info.get('current_location'):
         parts.append(f"Location: {info['current_location']}")
     if info.get('tech_stack'):
-        tech = info['tech_stack']
-        if isinstance(tech, dict):
-            all_tech = []
-            for category, items in tech.items():
-                if isinstance(items, list):
-                    all_tech.extend(items)
-                else:
-                    all_tech.append(str(items))
-            tech = ', '.join(all_tech)
-        parts.append(f"Tech Stack: {tech}")
+        parts.append(f"Tech Stack: {', '.join(tech_stack_items(info['tech_stack']))}")
     
     return '\n'.join(parts)
 
 
-def generate_filename(candidate_name: str, extension: str) -> str:
-    """Generate filename with timestamp."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_name = re.sub(r'[^\w\s-]', '', candidate_name).strip().replace(' ', '_')
-    return f"{safe_name}_{timestamp}.{extension}"
+def tech_stack_items(tech_stack: Any) -> List[str]:
+    """
+    Individual technologies from a tech_stack field.
+
+    :param tech_stack: Comma-separated string, list, or dict of category lists (nested freely)
+    :return: Stripped, non-empty items in their original order
+    """
+    if isinstance(tech_stack, dict):
+        return [item for v in tech_stack.values() for item in tech_stack_items(v)]
+    if isinstance(tech_stack, (list, tuple)):
+        return [item for v in tech_stack for item in tech_stack_items(v)]
+    return [item.strip() for item in str(tech_stack or "").split(",") if item.strip()]
+
+
+class StreamingJSONExtractor:
+    """
+    Incrementally extract top-level fields of the first JSON object in a
+    token stream.
+
+    Text before the opening brace (prose, code fences) is skipped and
+    anything after the matching closing brace is ignored. Each field is
+    returned from feed() as soon as its value is complete.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member: List[str] = []
+
+    @property
+    def done(self) -> bool:
+        """True once the top-level object has been closed."""
+        return self._done
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        """Consume a chunk and return the fields completed by it."""
+        completed = {}
+        
+        for ch in chunk:
+            if self._done:
+                break
+            if not self._started:
+                if ch == '{':
+                    self._started = True
+                    self._depth = 1
+                continue
+            
+            if self._in_string:
+                self._member.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            
+            if ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+            
+            if self._depth == 0:
+                self._emit_member(completed)
+                self._done = True
+            elif self._depth == 1 and ch == ',':
+                self._emit_member(completed)
+            else:
+                self._member.append(ch)
+        
+        return completed
+
+    def _emit_member(self, completed: Dict[str, Any]):
+        member = ''.join(self._member).strip()
+        self._member = []
+        if not member:
+            return
+        try:
+            parsed = json.loads('{' + member + '}')
+        except ValueError:
+            return
+        self.fields.update(parsed)
+        completed.update(parsed)
 
 
 def parse_json_from_response(content: str) -> Dict:
     """Extract JSON object from LLM response."""
+    extractor = StreamingJSONExtractor()
+    extractor.feed(content)
+    if extractor.fields:
+        return extractor.fields
+    
     try:
         json_match = re.search(r'\{.*\}', content, re.DOTALL)
         if json_match: